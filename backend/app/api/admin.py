@@ -7,7 +7,13 @@ from starlette import status
 from app.api.common import (SG_REQUEST_PREFIX, AuthorizedRequest,
                             generate_common_redis_key,
                             get_id_from_common_redis_key, get_token_data)
+from app.api.responses import list_response
 from app.business_logic.auth import resolve_role_access
+from app.business_logic.catalog_cache import bump_catalog_version
+from app.business_logic.image_store import release_image
+from app.business_logic.identity_cache import invalidate_user_snapshot
+from app.business_logic.images import image_key_from_url
+from app.business_logic.search_index import apply_game_change
 from app.db import AsyncSession, get_session
 from app.db.managers.exceptions import (ChangeRequestNotFound,
                                         ChangeRequestNotPending, GameNotFound,
@@ -25,9 +31,8 @@ from app.dto_schemas.steam_guard import (SetSteamGuardCodeRequest,
                                          SteamGuardRequestStatus,
                                          SteamGuardSetModel, SteamGuardStatus)
 from app.dto_schemas.user import UserRolePatch, UserRoleResponseModel
+from app.metrics import snapshot
 from app.redis_cache import get_redis_client
-from app.s3 import get_s3_client, S3Client
-from app.settings import settings
 from app.utils import async_islice
 
 admins_router = APIRouter(prefix="/admins")
@@ -42,6 +47,7 @@ async def patch_user_role(
     user_role_patch: UserRolePatch,
     session: AsyncSession = Depends(get_session),
     token_data: TokenData = Depends(get_token_data),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     try:
         user = await get_user_by_email(session, user_role_patch.email)
@@ -58,6 +64,7 @@ async def patch_user_role(
     user = await update_role_by_email(
         session, user_role_patch.email, user_role_patch.role
     )
+    await invalidate_user_snapshot(redis_client, user.ukey)
 
     return UserRoleResponseModel.from_orm(user)
 
@@ -69,12 +76,15 @@ async def patch_user_role(
 async def confirm_game_change_request(
     request_id: int,
     session: AsyncSession = Depends(get_session),
-    s3_client: S3Client = Depends(get_s3_client)
+    redis_client: Redis = Depends(get_redis_client),
 ):
     try:
         game, old_game = await approve_game_change_request(session, request_id)
-        blob_s3_key = old_game.game_img_url.split('/')[2]
-        await s3_client.delete_object(Bucket=settings.aws.bucket_name, Key=blob_s3_key)
+        catalog_version = await bump_catalog_version(redis_client)
+        apply_game_change(game, catalog_version)
+        # the old image is deleted later unless something still uses it,
+        # which includes the game itself when the key did not change
+        await release_image(redis_client, image_key_from_url(old_game.game_img_url))
     except ChangeRequestNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -100,12 +110,14 @@ async def confirm_game_change_request(
 async def reject_game_change_request(
     request_id: int,
     session: AsyncSession = Depends(get_session),
-    s3_client: S3Client = Depends(get_s3_client)
+    redis_client: Redis = Depends(get_redis_client),
 ):
     try:
         game_change_request = await disapprove_game_change_request(session, request_id)
-        blob_s3_key = game_change_request.changes['game_img_url'].split('/')[2]
-        await s3_client.delete_object(Bucket=settings.aws.bucket_name, Key=blob_s3_key)
+        await release_image(
+            redis_client,
+            image_key_from_url(game_change_request.changes['game_img_url']),
+        )
     except ChangeRequestNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -126,7 +138,9 @@ async def reject_game_change_request(
     response_model=List[GameChangeRequestResponseModel],
 )
 async def get_recent_game_change_requests(session: AsyncSession = Depends(get_session)):
-    return await get_game_change_requests(session)
+    return list_response(
+        GameChangeRequestResponseModel, await get_game_change_requests(session)
+    )
 
 
 @admins_router.get(
@@ -162,7 +176,7 @@ async def fetch_pending_requests(
 
         pending_requests.append(pending_request)
 
-    return pending_requests
+    return list_response(SteamGuardPendingRequestResponse, pending_requests)
 
 
 @admins_router.post(
@@ -188,3 +202,11 @@ async def set_code(
     )
 
     await redis_client.set(key, complete_request.model_dump_json(), ex=10800)  # 3 hours
+
+
+@admins_router.get(
+    "/me/metrics",
+    dependencies=[Depends(AuthorizedRequest(role=Roles.ADMIN))],
+)
+async def get_worker_metrics():
+    return snapshot()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from redis.asyncio import Redis
 from starlette import status
 from starlette.responses import JSONResponse
@@ -7,8 +7,15 @@ from app.api.common import (TEMP_USER_CODE_REQUEST_PREFIX, AuthorizedRequest,
                             generate_common_redis_key, get_logger,
                             get_token_data)
 from app.business_logic.auth import (create_access_token,
-                                     create_mfa_only_access_token,
-                                     hash_password, verify_password)
+                                     create_mfa_only_access_token)
+from app.business_logic.exceptions import (VerificationCodeMismatch,
+                                           VerificationCodeNotFound)
+from app.business_logic.identity_cache import invalidate_user_snapshot
+from app.business_logic.login_limiter import admit_login
+from app.business_logic.password_hasher import (hash_password,
+                                                upgrade_password_hash,
+                                                verify_password)
+from app.business_logic.verification_codes import issue_code, verify_code
 from app.db import AsyncSession, get_session
 from app.db.managers.user_manager import (add_temp_user, add_user,
                                           get_user_by_email, update_user, get_user_by_ukey)
@@ -29,10 +36,17 @@ DEFAULT_AUTH_2FA_CODE_EXP = 300  # 5 minutes
 
 @login_router.post("")
 async def login(
+    request: Request,
     user_login_model: UserLogin,
     session: AsyncSession = Depends(get_session),
     redis_client: Redis = Depends(get_redis_client),
 ):
+    # Throttled before the lookup, so unknown emails are counted too and a 429
+    # never tells whether an account exists. request.client is None when the
+    # server does not know the peer address.
+    client_ip = request.client.host if request.client else "unknown"
+    await admit_login(redis_client, client_ip, user_login_model.email)
+
     user = await get_user_by_email(session, user_login_model.email)
     if not user:
         raise HTTPException(
@@ -40,17 +54,24 @@ async def login(
             detail="User email or password is invalid",
         )
 
-    if not verify_password(user_login_model.password, user.hashed_password):
+    if not await verify_password(user_login_model.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User email or password is invalid",
         )
 
+    new_hashed_password = await upgrade_password_hash(
+        user_login_model.password, user.hashed_password
+    )
+    if new_hashed_password:
+        user.hashed_password = new_hashed_password
+        await update_user(session, user)
+
     if user.mfa_enabled:
         access_token = create_mfa_only_access_token(user.ukey, user_login_model.email)
         mfa_code = generate_random_mfa_code()
         key = f"{AUTH_2FA_REQUEST_PREFIX}:{user.ukey}"
-        await redis_client.setex(key, DEFAULT_AUTH_2FA_CODE_EXP, mfa_code)
+        await issue_code(redis_client, key, mfa_code, DEFAULT_AUTH_2FA_CODE_EXP)
         print(mfa_code)  # print it here for temp debug purposes
     else:
         access_token = create_access_token(user.ukey, user_login_model.email, user.role)
@@ -85,10 +106,9 @@ async def authenticate(
         )
 
     key = f"{AUTH_2FA_REQUEST_PREFIX}:{token_data.ukey}"
-    saved_code_bytes: bytes = await redis_client.get(key)
-    saved_code = saved_code_bytes.decode("utf-8")
-
-    if mfa_code.code != saved_code:
+    try:
+        await verify_code(redis_client, key, mfa_code.code)
+    except (VerificationCodeNotFound, VerificationCodeMismatch):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Invalid authorization code."
         )
@@ -109,7 +129,7 @@ async def register(
             detail="User with such email address already exist",
         )
 
-    user_creation_model.password = hash_password(user_creation_model.password)
+    user_creation_model.password = await hash_password(user_creation_model.password)
     user = await add_user(session, user_create_model=user_creation_model)
     return UserResponseModel.from_orm(user)
 
@@ -150,14 +170,14 @@ async def convert_temp(
         )
 
     key = generate_common_redis_key(TEMP_USER_CODE_REQUEST_PREFIX, user.ukey)
-    code_bytes: bytes = await redis_client.get(key)
-    if not code_bytes:
+    try:
+        await verify_code(redis_client, key, code)
+    except VerificationCodeNotFound:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Code not found or expired",
         )
-
-    if code != code_bytes.decode("utf-8"):
+    except VerificationCodeMismatch:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect code",
@@ -166,8 +186,9 @@ async def convert_temp(
     user.first_name = user_creation_model.first_name or None
     user.last_name = user_creation_model.last_name or None
     user.username = user_creation_model.username
-    user.hashed_password = hash_password(user_creation_model.password)
+    user.hashed_password = await hash_password(user_creation_model.password)
     user.temporary = False
 
     updated_user = await update_user(session, user)
+    await invalidate_user_snapshot(redis_client, updated_user.ukey)
     return UserResponseModel.from_orm(updated_user)
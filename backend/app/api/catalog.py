@@ -0,0 +1,67 @@
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from redis.asyncio import Redis
+from starlette import status
+from starlette.responses import Response
+
+from app.api.http_cache import (conditional_body_response,
+                                conditional_response, make_etag)
+from app.business_logic.catalog_snapshot import catalog_snapshot
+from app.business_logic.search_index import (DEFAULT_SUGGESTION_COUNT,
+                                             MAX_SUGGESTION_COUNT,
+                                             ensure_fresh_game_search_index,
+                                             game_suggester)
+from app.db import AsyncSession, get_session
+from app.db.managers.pagination import MAX_PAGE_SIZE
+from app.dto_schemas.game_suggestion import GameSuggestion
+from app.redis_cache import get_redis_client
+
+# Mounted before games_router so that /games/suggest is not captured by /games/{id}
+catalog_router = APIRouter(prefix="/games")
+
+__all__ = ["catalog_router", "catalog_page_response", "catalog_count_response"]
+
+
+@catalog_router.get("/suggest", response_model=List[GameSuggestion])
+async def suggest_games(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=128),
+    k: int = Query(DEFAULT_SUGGESTION_COUNT, ge=1, le=MAX_SUGGESTION_COUNT),
+    redis_client: Redis = Depends(get_redis_client),
+    session: AsyncSession = Depends(get_session),
+):
+    await ensure_fresh_game_search_index(redis_client, session)
+
+    # suggestions are already plain {id, title} dicts, no per-item validation needed
+    body = json.dumps(game_suggester.suggest(q, k), separators=(",", ":")).encode()
+    return conditional_body_response(request, body)
+
+
+async def catalog_page_response(
+    request: Request, page: int, page_size: int
+) -> Response:
+    # pages are memoized per (page, page_size), so both are bounded here for
+    # every route that serves the snapshot
+    if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"page must be at least 1 and page_size between 1 and "
+            f"{MAX_PAGE_SIZE}",
+        )
+    etag = make_etag("catalog", catalog_snapshot.digest, page, page_size)
+
+    async def render() -> bytes:
+        return catalog_snapshot.page(page, page_size)
+
+    return await conditional_response(request, etag, render)
+
+
+async def catalog_count_response(request: Request) -> Response:
+    etag = make_etag("catalog-count", catalog_snapshot.digest)
+
+    async def render() -> bytes:
+        return catalog_snapshot.count()
+
+    return await conditional_response(request, etag, render)
@@ -2,12 +2,15 @@ from fastapi import HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from starlette import status
 
-from app.business_logic.auth import verify_token_access
+from app.business_logic.auth import (resolve_exact_role_access,
+                                     resolve_role_access, verify_token_access)
+from app.business_logic.token_cache import verified_token_cache
 from app.dto_schemas.auth import Roles, TokenData
 from app.logger import logger
 
 SG_REQUEST_PREFIX = "steam_guard_request"
 TEMP_USER_CODE_REQUEST_PREFIX = "temp_user_code_request"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 class AuthorizedRequest(HTTPBearer):
@@ -26,9 +29,16 @@ class AuthorizedRequest(HTTPBearer):
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid authentication scheme.",
                 )
-            token_data = verify_token_access(
-                credentials.credentials, role=self.role, exact_role=self.exact_role
-            )
+            token_data = verified_token_cache.get(credentials.credentials)
+            if token_data is None:
+                token_data = verify_token_access(
+                    credentials.credentials, role=self.role, exact_role=self.exact_role
+                )
+                verified_token_cache.put(credentials.credentials, token_data)
+            elif self.exact_role:
+                resolve_exact_role_access(token_data.role, self.role)
+            else:
+                resolve_role_access(token_data.role, self.role)
             request.token_data = token_data  # type: ignore
             return credentials.credentials
         else:
@@ -0,0 +1,54 @@
+import hashlib
+from typing import Awaitable, Callable
+
+from fastapi import Request
+from starlette import status
+from starlette.responses import Response
+
+PUBLIC_CACHE_CONTROL = "public, max-age=60"
+
+
+def make_etag(*parts: object) -> str:
+    return '"{}"'.format("-".join(str(part) for part in parts))
+
+
+def body_etag(body: bytes) -> str:
+    return make_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+async def conditional_response(
+    request: Request,
+    etag: str,
+    render: Callable[[], Awaitable[bytes]],
+    cache_control: str = PUBLIC_CACHE_CONTROL,
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if is_not_modified(request, etag):
+        # nothing is loaded or serialized for a revalidation hit
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=await render(), media_type="application/json", headers=headers
+    )
+
+
+def conditional_body_response(
+    request: Request, body: bytes, cache_control: str = PUBLIC_CACHE_CONTROL
+) -> Response:
+    # the ETag is derived from the body itself, so it changes with every write
+    # that changes the representation and survives any cache being flushed
+    etag = body_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
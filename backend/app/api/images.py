@@ -0,0 +1,136 @@
+from botocore.exceptions import ClientError
+from fastapi import APIRouter, Depends, HTTPException, Request
+from redis.asyncio import Redis
+from starlette import status
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+from app.api.common import AuthorizedRequest
+from app.api.http_cache import is_not_modified, make_etag
+from app.business_logic.exceptions import ImageTooLarge, InvalidImage
+from app.business_logic.image_cache import (image_cache, image_media_type,
+                                            is_valid_image_key)
+from app.business_logic.image_store import store_image
+from app.business_logic.images import (IMAGE_CONTENT_TYPES,
+                                       IMMUTABLE_CACHE_CONTROL,
+                                       create_presigned_image_upload)
+from app.dto_schemas.auth import Roles
+from app.dto_schemas.game_image import (ImageUploadRequest,
+                                        PresignedImageUpload, StoredImage)
+from app.redis_cache import get_redis_client
+from app.s3 import S3Client, get_s3_client
+from app.settings import settings
+
+images_router = APIRouter(prefix="/images")
+
+__all__ = ["images_router"]
+
+
+@images_router.post(
+    "/upload-url",
+    dependencies=[Depends(AuthorizedRequest(role=Roles.SUPPORT_MODERATOR))],
+    response_model=PresignedImageUpload,
+)
+async def create_image_upload_url(
+    upload_request: ImageUploadRequest,
+    s3_client: S3Client = Depends(get_s3_client),
+):
+    if upload_request.size > settings.aws.max_image_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image is too large",
+        )
+
+    presigned_upload = await create_presigned_image_upload(
+        s3_client, upload_request.content_type, upload_request.size
+    )
+    return PresignedImageUpload(**presigned_upload)
+
+
+@images_router.post(
+    "",
+    dependencies=[Depends(AuthorizedRequest(role=Roles.SUPPORT_MODERATOR))],
+    response_model=StoredImage,
+)
+async def upload_image(
+    request: Request,
+    s3_client: S3Client = Depends(get_s3_client),
+    redis_client: Redis = Depends(get_redis_client),
+):
+    content_type = request.headers.get("content-type")
+    if content_type not in IMAGE_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Unsupported image type",
+        )
+    if int(request.headers.get("content-length") or 0) > settings.aws.max_image_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image is too large",
+        )
+
+    try:
+        stored_image = await store_image(
+            s3_client, redis_client, request.stream(), content_type
+        )
+    except ImageTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image is too large",
+        )
+    except InvalidImage:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Image is invalid or does not match its content type",
+        )
+    return StoredImage(**stored_image)
+
+
+async def iter_object_body(s3_object: dict):
+    async with s3_object["Body"] as body:
+        async for chunk in body.iter_chunks(64 * 1024):
+            yield chunk
+
+
+@images_router.get("/{key}")
+async def get_image(
+    key: str,
+    request: Request,
+    s3_client: S3Client = Depends(get_s3_client),
+):
+    if not is_valid_image_key(key):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Image not found"
+        )
+
+    # image keys are never overwritten, so the key alone identifies the content
+    headers = {
+        "ETag": make_etag("image", key),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+    }
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path = image_cache.get(key)
+    if path is None:
+        try:
+            s3_object = await s3_client.get_object(
+                Bucket=settings.aws.bucket_name, Key=key
+            )
+        except ClientError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Image not found"
+            )
+        chunks = image_cache.fill(key, iter_object_body(s3_object))
+        if "range" not in request.headers:
+            headers["Content-Length"] = str(s3_object["ContentLength"])
+            return StreamingResponse(
+                chunks, media_type=image_media_type(key), headers=headers
+            )
+        # a range is served from the file once the whole object is cached
+        async for _ in chunks:
+            pass
+        path = image_cache.path(key)
+
+    # FileResponse answers Range requests with 206 and sends the file
+    # without copying it through Python where the server supports it
+    return FileResponse(path, media_type=image_media_type(key), headers=headers)
@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from starlette.responses import JSONResponse, Response
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Project-wide response class: encodes with pydantic-core in one native call
+    instead of ``json.dumps`` over an already ``jsonable_encoder``-ed tree.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    # building a TypeAdapter compiles a core schema, so do it once per model
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def dump_list(model: Type[BaseModel], items: Iterable[Any]) -> bytes:
+    adapter = get_list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+
+def list_response(
+    model: Type[BaseModel], items: Iterable[Any], headers: dict | None = None
+) -> Response:
+    return Response(
+        content=dump_list(model, items), media_type="application/json", headers=headers
+    )
@@ -1,14 +1,24 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from redis.asyncio import Redis
 from starlette import status
 
-from app.api.common import (TEMP_USER_CODE_REQUEST_PREFIX, AuthorizedRequest,
-                            generate_common_redis_key, get_token_data)
-from app.business_logic.auth import hash_password, verify_password
+from app.api.common import (NEXT_CURSOR_HEADER, TEMP_USER_CODE_REQUEST_PREFIX,
+                            AuthorizedRequest, generate_common_redis_key,
+                            get_token_data)
+from app.api.responses import list_response
+from app.business_logic.exceptions import (VerificationCodeMismatch,
+                                           VerificationCodeNotFound)
+from app.business_logic.identity_cache import (get_user_snapshot,
+                                               invalidate_user_snapshot)
+from app.business_logic.password_hasher import hash_password, verify_password
+from app.business_logic.verification_codes import (consume_token, issue_code,
+                                                   verify_code)
 from app.db import AsyncSession, get_session
+from app.db.managers.exceptions import InvalidCursor
 from app.db.managers.orders import get_orders_by_user_id
+from app.db.managers.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.db.managers.user_manager import (get_user_by_email, get_user_by_ukey,
                                           update_user)
 from app.dto_schemas.auth import MFACode, Roles, TokenData
@@ -40,10 +50,17 @@ def generate_redis_key(prefix: str, ukey: str | None, mfa_code: str) -> str:
 
 @users_router.get("/me", dependencies=[Depends(AuthorizedRequest(role=Roles.USER))])
 async def get_user(
+    request: Request,
     token_data: TokenData = Depends(get_token_data),
     session: AsyncSession = Depends(get_session),
+    redis_client: Redis = Depends(get_redis_client),
 ):
-    user = await get_user_by_ukey(session, token_data.ukey)
+    user = await get_user_snapshot(
+        request,
+        redis_client,
+        token_data.ukey,
+        lambda: get_user_by_ukey(session, token_data.ukey),
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="User is not found"
@@ -56,6 +73,7 @@ async def update_user_personal_info(
     personal_info: UserUpdatePersonalInfo,
     token_data: TokenData = Depends(get_token_data),
     session: AsyncSession = Depends(get_session),
+    redis_client: Redis = Depends(get_redis_client),
 ):
     user = await get_user_by_ukey(session, token_data.ukey)
     if not user:
@@ -65,6 +83,7 @@ async def update_user_personal_info(
     user.first_name = personal_info.first_name
     user.last_name = personal_info.last_name
     await update_user(session, user)
+    await invalidate_user_snapshot(redis_client, user.ukey)
     return UserResponseModel.from_orm(user)
 
 
@@ -90,17 +109,23 @@ async def change_user_password_request(
             status_code=status.HTTP_400_BAD_REQUEST, detail="User is not found"
         )
 
-    if not verify_password(change_pass_request.old_password, user.hashed_password):
+    if not await verify_password(
+        change_pass_request.old_password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Old password is wrong"
         )
 
-    new_hashed_password = hash_password(change_pass_request.new_password)
+    new_hashed_password = await hash_password(change_pass_request.new_password)
 
     mfa_code = generate_random_mfa_code()
-    key = generate_redis_key(PASSWORD_REQUEST_PREFIX, token_data.ukey, mfa_code)
-    await redis_client.setex(
-        key, DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, new_hashed_password
+    key = generate_common_redis_key(PASSWORD_REQUEST_PREFIX, token_data.ukey)
+    await issue_code(
+        redis_client,
+        key,
+        mfa_code,
+        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
+        payload=new_hashed_password,
     )
     print(mfa_code)  # print it here for temp debug purposes
     # send email with link
@@ -116,16 +141,15 @@ async def change_user_password(
     token_data: TokenData = Depends(get_token_data),
     redis_client: Redis = Depends(get_redis_client),
 ):
-    key = generate_redis_key(PASSWORD_REQUEST_PREFIX, token_data.ukey, mfa_code.code)
-    new_hashed_pass_bytes: bytes | None = await redis_client.get(key)
-    if new_hashed_pass_bytes is None:
+    if token_data.ukey is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
 
-    new_hashed_pass = new_hashed_pass_bytes.decode("utf-8")
-
-    if token_data.ukey is None:
+    key = generate_common_redis_key(PASSWORD_REQUEST_PREFIX, token_data.ukey)
+    try:
+        new_hashed_pass = await verify_code(redis_client, key, mfa_code.code)
+    except (VerificationCodeNotFound, VerificationCodeMismatch):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
@@ -153,9 +177,13 @@ async def change_user_email_request(
     redis_client: Redis = Depends(get_redis_client),
 ):
     mfa_code = generate_random_mfa_code()
-    key = generate_redis_key(EMAIL_REQUEST_PREFIX, token_data.ukey, mfa_code)
-    await redis_client.setex(
-        key, DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, change_email_request.email
+    key = generate_common_redis_key(EMAIL_REQUEST_PREFIX, token_data.ukey)
+    await issue_code(
+        redis_client,
+        key,
+        mfa_code,
+        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
+        payload=change_email_request.email,
     )
     print(mfa_code)  # print it here for temp debug purposes
     # send email with link
@@ -176,15 +204,14 @@ async def change_user_email(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
 
-    key = generate_redis_key(EMAIL_REQUEST_PREFIX, token_data.ukey, mfa_code.code)
-    new_email_bytes: bytes | None = await redis_client.get(key)
-    if new_email_bytes is None:
+    key = generate_common_redis_key(EMAIL_REQUEST_PREFIX, token_data.ukey)
+    try:
+        new_email = await verify_code(redis_client, key, mfa_code.code)
+    except (VerificationCodeNotFound, VerificationCodeMismatch):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
 
-    new_email = new_email_bytes.decode("utf-8")
-
     user = await get_user_by_ukey(session, token_data.ukey)
     if not user:
         raise HTTPException(
@@ -194,6 +221,7 @@ async def change_user_email(
     user.email = new_email
 
     await update_user(session, user)
+    await invalidate_user_snapshot(redis_client, user.ukey)
 
     return UserResponseModel.from_orm(user)
 
@@ -224,21 +252,19 @@ async def reset_user_pass(
     redis_client: Redis = Depends(get_redis_client),
 ):
     key = generate_redis_key(PASSWORD_RESET_REQUEST_PREFIX, None, reset_pass_token)
-    email_bytes: bytes | None = await redis_client.get(key)
-    if email_bytes is None:
+    email = await consume_token(redis_client, key)
+    if email is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
 
-    email = email_bytes.decode("utf-8")
-
     user = await get_user_by_email(session, email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="User is not found"
         )
 
-    user.hashed_password = hash_password(new_password_request.password)
+    user.hashed_password = await hash_password(new_password_request.password)
 
     await update_user(session, user)
 
@@ -250,11 +276,17 @@ async def reset_user_pass(
     dependencies=[Depends(AuthorizedRequest(role=Roles.USER))],
 )
 async def request_enable_2fa(
+    request: Request,
     token_data: TokenData = Depends(get_token_data),
     redis_client: Redis = Depends(get_redis_client),
     session: AsyncSession = Depends(get_session),
 ):
-    user = await get_user_by_ukey(session, token_data.ukey)
+    user = await get_user_snapshot(
+        request,
+        redis_client,
+        token_data.ukey,
+        lambda: get_user_by_ukey(session, token_data.ukey),
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="User is not found"
@@ -266,8 +298,14 @@ async def request_enable_2fa(
         )
 
     mfa_code = generate_random_mfa_code()
-    key = generate_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey, mfa_code)
-    await redis_client.setex(key, DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, token_data.email)
+    key = generate_common_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey)
+    await issue_code(
+        redis_client,
+        key,
+        mfa_code,
+        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
+        payload=token_data.email,
+    )
     print(mfa_code)  # print it here for temp debug purposes
     # send email with link
 
@@ -282,14 +320,15 @@ async def enable_2fa(
     token_data: TokenData = Depends(get_token_data),
     redis_client: Redis = Depends(get_redis_client),
 ):
-    key = generate_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey, mfa_code.code)
-    email_bytes: bytes | None = await redis_client.get(key)
-    if email_bytes is None:
+    if token_data.ukey is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
 
-    if token_data.ukey is None:
+    key = generate_common_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey)
+    try:
+        await verify_code(redis_client, key, mfa_code.code)
+    except (VerificationCodeNotFound, VerificationCodeMismatch):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
@@ -303,6 +342,7 @@ async def enable_2fa(
     user.mfa_enabled = True
 
     await update_user(session, user)
+    await invalidate_user_snapshot(redis_client, user.ukey)
 
     return UserResponseModel.from_orm(user)
 
@@ -312,11 +352,17 @@ async def enable_2fa(
     dependencies=[Depends(AuthorizedRequest(role=Roles.USER))],
 )
 async def request_disable_2fa(
+    request: Request,
     token_data: TokenData = Depends(get_token_data),
     redis_client: Redis = Depends(get_redis_client),
     session: AsyncSession = Depends(get_session),
 ):
-    user = await get_user_by_ukey(session, token_data.ukey)
+    user = await get_user_snapshot(
+        request,
+        redis_client,
+        token_data.ukey,
+        lambda: get_user_by_ukey(session, token_data.ukey),
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="User is not found"
@@ -328,8 +374,14 @@ async def request_disable_2fa(
         )
 
     mfa_code = generate_random_mfa_code()
-    key = generate_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey, mfa_code)
-    await redis_client.setex(key, DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, token_data.email)
+    key = generate_common_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey)
+    await issue_code(
+        redis_client,
+        key,
+        mfa_code,
+        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
+        payload=token_data.email,
+    )
     print(mfa_code)  # print it here for temp debug purposes
     # send email with link
 
@@ -344,14 +396,15 @@ async def disable_2fa(
     token_data: TokenData = Depends(get_token_data),
     redis_client: Redis = Depends(get_redis_client),
 ):
-    key = generate_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey, mfa_code.code)
-    email_bytes: bytes | None = await redis_client.get(key)
-    if email_bytes is None:
+    if token_data.ukey is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
 
-    if token_data.ukey is None:
+    key = generate_common_redis_key(SETUP_2FA_REQUEST_PREFIX, token_data.ukey)
+    try:
+        await verify_code(redis_client, key, mfa_code.code)
+    except (VerificationCodeNotFound, VerificationCodeMismatch):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Bad request"
         )
@@ -365,6 +418,7 @@ async def disable_2fa(
     user.mfa_enabled = False
 
     await update_user(session, user)
+    await invalidate_user_snapshot(redis_client, user.ukey)
 
     return UserResponseModel.from_orm(user)
 
@@ -392,7 +446,7 @@ async def send_code_for_temp_conversion(
         TEMP_USER_CODE_REQUEST_PREFIX, user.ukey
     )  # using ukey only conveniently overwrites previous code
     code = generate_random_mfa_code()
-    await redis_client.set(key, code, ex=180)
+    await issue_code(redis_client, key, code, 180)
 
     await email_sender.send_message(
         subject="Your registration verification code",
@@ -407,13 +461,30 @@ async def send_code_for_temp_conversion(
     response_model=List[OrderResponseModel],
 )
 async def get_user_orders(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     token_data: TokenData = Depends(get_token_data),
     session: AsyncSession = Depends(get_session),
+    redis_client: Redis = Depends(get_redis_client),
 ):
-    user = await get_user_by_ukey(session, token_data.ukey)
+    user = await get_user_snapshot(
+        request,
+        redis_client,
+        token_data.ukey,
+        lambda: get_user_by_ukey(session, token_data.ukey),
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="User is not found"
         )
-    orders = await get_orders_by_user_id(session, user.id)
-    return orders
+    try:
+        orders, next_cursor = await get_orders_by_user_id(
+            session, user.id, cursor=cursor, limit=limit
+        )
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return list_response(OrderResponseModel, orders, headers=headers)
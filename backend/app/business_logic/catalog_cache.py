@@ -0,0 +1,57 @@
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+
+CATALOG_VERSION_KEY = "catalog_version"
+CATALOG_PAGE_PREFIX = "catalog_page"
+CATALOG_COUNT_PREFIX = "catalog_count"
+DEFAULT_CATALOG_CACHE_EXPIRE = 3600  # in seconds, stale versions just expire
+
+JsonLoader = Callable[[], Awaitable[bytes]]
+
+
+def generate_catalog_page_key(version: int, page: int, page_size: int) -> str:
+    return f"{CATALOG_PAGE_PREFIX}:{version}:{page}:{page_size}"
+
+
+def generate_catalog_count_key(version: int) -> str:
+    return f"{CATALOG_COUNT_PREFIX}:{version}"
+
+
+async def get_catalog_version(redis_client: Redis) -> int:
+    version: bytes | None = await redis_client.get(CATALOG_VERSION_KEY)
+    return int(version) if version else 0
+
+
+async def bump_catalog_version(redis_client: Redis) -> int:
+    # Keys of the previous version are never touched again and expire on their own
+    return await redis_client.incr(CATALOG_VERSION_KEY)
+
+
+async def read_through(
+    redis_client: Redis,
+    key: str,
+    loader: JsonLoader,
+    expire: int = DEFAULT_CATALOG_CACHE_EXPIRE,
+) -> bytes:
+    cached: bytes | None = await redis_client.get(key)
+    if cached is not None:
+        return cached
+
+    payload = await loader()
+    await redis_client.set(key, payload, ex=expire)
+    return payload
+
+
+async def get_cached_catalog_page(
+    redis_client: Redis, page: int, page_size: int, loader: JsonLoader
+) -> bytes:
+    version = await get_catalog_version(redis_client)
+    key = generate_catalog_page_key(version, page, page_size)
+    return await read_through(redis_client, key, loader)
+
+
+async def get_cached_catalog_count(redis_client: Redis, loader: JsonLoader) -> bytes:
+    version = await get_catalog_version(redis_client)
+    key = generate_catalog_count_key(version)
+    return await read_through(redis_client, key, loader)
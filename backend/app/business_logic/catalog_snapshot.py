@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import json
+from typing import Dict, List, Tuple
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.business_logic.catalog_cache import get_catalog_version
+from app.db.managers.catalog_manager import get_catalog_games
+from app.dto_schemas.game import GameResponseModel
+from app.logger import logger
+
+CATALOG_SNAPSHOT_POLL_INTERVAL = 5  # in seconds
+MAX_MEMOIZED_PAGES = 1024
+
+
+class CatalogSnapshot:
+    """
+    The whole catalog kept as pre-encoded JSON, one byte string per game.
+
+    A page is a join of already encoded items, so serving it does no ORM or
+    pydantic work; joined pages are memoized until the next reload. ``digest``
+    hashes the loaded items, so ETags built from it follow the content rather
+    than the Redis version counter, which restarts from 0 after a flush.
+    """
+
+    def __init__(self):
+        self.version: int | None = None
+        self.digest = hashlib.blake2b(digest_size=16).hexdigest()
+        self._items: List[bytes] = []
+        self._pages: Dict[Tuple[int, int], bytes] = {}
+        self._count_body = b'{"count":0}'
+
+    def load(self, items: List[bytes], version: int | None):
+        # swap in complete objects, so concurrent readers never see a half load
+        self._pages = {}
+        self._items = items
+        self._count_body = json.dumps(
+            {"count": len(items)}, separators=(",", ":")
+        ).encode()
+        digest = hashlib.blake2b(digest_size=16)
+        for item in items:
+            digest.update(item)
+            digest.update(b"\n")
+        self.digest = digest.hexdigest()
+        self.version = version
+
+    def page(self, page: int, page_size: int) -> bytes:
+        key = (page, page_size)
+        body = self._pages.get(key)
+        if body is None:
+            start = (page - 1) * page_size
+            body = b"[" + b",".join(self._items[start : start + page_size]) + b"]"
+            if len(self._pages) < MAX_MEMOIZED_PAGES:
+                self._pages[key] = body
+        return body
+
+    def count(self) -> bytes:
+        return self._count_body
+
+
+catalog_snapshot = CatalogSnapshot()
+
+
+def encode_games(games) -> List[bytes]:
+    return [
+        GameResponseModel.model_validate(game).model_dump_json().encode()
+        for game in games
+    ]
+
+
+async def load_catalog_snapshot(db_session: AsyncSession, version: int | None):
+    catalog_snapshot.load(encode_games(await get_catalog_games(db_session)), version)
+
+
+async def refresh_catalog_snapshot(
+    redis_client: Redis, session_factory: async_sessionmaker
+) -> bool:
+    version = await get_catalog_version(redis_client)
+    if catalog_snapshot.version == version:
+        return False
+
+    async with session_factory() as session:
+        await load_catalog_snapshot(session, version)
+    logger.info("catalog snapshot reloaded", version=version)
+    return True
+
+
+async def poll_catalog_snapshot(
+    redis_client: Redis,
+    session_factory: async_sessionmaker,
+    interval: float = CATALOG_SNAPSHOT_POLL_INTERVAL,
+):
+    while True:
+        try:
+            await refresh_catalog_snapshot(redis_client, session_factory)
+        except Exception as e:
+            # keep serving the previous snapshot until the next successful poll
+            logger.opt(exception=e).warning("catalog snapshot refresh failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+import socket
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Callable, List, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.email_sender import EMAIL_OUTBOX_KEY, EmailSender, create_email_sender
+from app.logger import logger
+from app.metrics import counter
+from app.settings import settings
+
+EMAIL_OUTBOX_GROUP = "email_senders"
+EMAIL_OUTBOX_BATCH = 10
+EMAIL_OUTBOX_BLOCK = 5000  # in milliseconds
+EMAIL_OUTBOX_ERROR_DELAY = 5  # in seconds
+SEND_ATTEMPTS = 3
+SEND_RETRY_DELAY = 1  # in seconds, doubled after every attempt
+# a message left unacknowledged this long belongs to a worker that failed it
+# or went away, it is claimed again until it was delivered MAX_DELIVERIES times
+RECLAIM_IDLE = 60_000  # in milliseconds
+MAX_DELIVERIES = 5
+
+sent_emails = counter("email_outbox_sent")
+failed_emails = counter("email_outbox_failed")
+dropped_emails = counter("email_outbox_dropped")
+
+OutboxEntry = Tuple[bytes, dict]
+
+
+class SmtpConnectionPool:
+    """
+    A few authenticated SMTP connections kept open by the outbox worker.
+
+    A connection that failed is closed and logs in again on its next use,
+    so one broken socket never takes the whole pool down.
+    """
+
+    def __init__(
+        self, size: int, factory: Callable[[], EmailSender] = create_email_sender
+    ):
+        self.size = size
+        self._idle: asyncio.Queue[EmailSender] = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(factory())
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[EmailSender]:
+        sender = await self._idle.get()
+        try:
+            await sender.connect()
+            yield sender
+        except Exception:
+            with suppress(Exception):
+                await sender.close()
+            raise
+        finally:
+            self._idle.put_nowait(sender)
+
+    async def close(self):
+        while not self._idle.empty():
+            with suppress(Exception):
+                await self._idle.get_nowait().close()
+
+
+async def send_email(pool: SmtpConnectionPool, message: dict) -> bool:
+    delay = SEND_RETRY_DELAY
+    for attempt in range(1, SEND_ATTEMPTS + 1):
+        try:
+            async with pool.connection() as sender:
+                await sender.send_message(**message)
+        except Exception as e:
+            logger.opt(exception=e).warning("email sending failed", attempt=attempt)
+        else:
+            sent_emails.inc()
+            return True
+        if attempt < SEND_ATTEMPTS:
+            await asyncio.sleep(delay)
+            delay *= 2
+    failed_emails.inc()
+    return False
+
+
+async def acknowledge(redis_client: Redis, *entry_ids: bytes):
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.xack(EMAIL_OUTBOX_KEY, EMAIL_OUTBOX_GROUP, *entry_ids)
+        pipe.xdel(EMAIL_OUTBOX_KEY, *entry_ids)
+        await pipe.execute()
+
+
+async def deliver_entry(
+    redis_client: Redis, pool: SmtpConnectionPool, entry_id: bytes, fields: dict
+):
+    try:
+        message = json.loads(fields[b"message"])
+    except (KeyError, ValueError) as e:
+        logger.opt(exception=e).error("malformed email outbox entry", id=entry_id)
+        await acknowledge(redis_client, entry_id)
+        return
+
+    # a failed message stays pending and is claimed again after RECLAIM_IDLE
+    if await send_email(pool, message):
+        await acknowledge(redis_client, entry_id)
+
+
+async def create_outbox_group(redis_client: Redis):
+    try:
+        # from the start of the stream, messages queued before the group
+        # existed are sent as well
+        await redis_client.xgroup_create(
+            EMAIL_OUTBOX_KEY, EMAIL_OUTBOX_GROUP, id="0", mkstream=True
+        )
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+async def reclaim_stale_entries(
+    redis_client: Redis, consumer: str
+) -> List[OutboxEntry]:
+    pending = await redis_client.xpending_range(
+        EMAIL_OUTBOX_KEY,
+        EMAIL_OUTBOX_GROUP,
+        min="-",
+        max="+",
+        count=EMAIL_OUTBOX_BATCH,
+        idle=RECLAIM_IDLE,
+    )
+    exhausted = [
+        entry["message_id"]
+        for entry in pending
+        if entry["times_delivered"] >= MAX_DELIVERIES
+    ]
+    if exhausted:
+        dropped_emails.inc(len(exhausted))
+        logger.error("email outbox entries dropped", ids=exhausted)
+        await acknowledge(redis_client, *exhausted)
+
+    retried = [
+        entry["message_id"]
+        for entry in pending
+        if entry["times_delivered"] < MAX_DELIVERIES
+    ]
+    if not retried:
+        return []
+    claimed = await redis_client.xclaim(
+        EMAIL_OUTBOX_KEY, EMAIL_OUTBOX_GROUP, consumer, RECLAIM_IDLE, retried
+    )
+    # entries deleted in the meantime come back without fields
+    return [(entry_id, fields) for entry_id, fields in claimed if fields]
+
+
+async def read_new_entries(redis_client: Redis, consumer: str) -> List[OutboxEntry]:
+    response = await redis_client.xreadgroup(
+        EMAIL_OUTBOX_GROUP,
+        consumer,
+        {EMAIL_OUTBOX_KEY: ">"},
+        count=EMAIL_OUTBOX_BATCH,
+        block=EMAIL_OUTBOX_BLOCK,
+    )
+    return response[0][1] if response else []
+
+
+async def process_email_outbox(
+    redis_client: Redis, pool: SmtpConnectionPool, consumer: str
+) -> int:
+    entries = await reclaim_stale_entries(redis_client, consumer)
+    if not entries:
+        entries = await read_new_entries(redis_client, consumer)
+    await asyncio.gather(
+        *(
+            deliver_entry(redis_client, pool, entry_id, fields)
+            for entry_id, fields in entries
+        )
+    )
+    return len(entries)
+
+
+async def poll_email_outbox(redis_client: Redis, pool_size: int | None = None):
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    pool = SmtpConnectionPool(pool_size or settings.email_sender.pool_size)
+    group_created = False
+    try:
+        while True:
+            try:
+                if not group_created:
+                    await create_outbox_group(redis_client)
+                    group_created = True
+                # blocks in XREADGROUP while the outbox is empty
+                await process_email_outbox(redis_client, pool, consumer)
+            except Exception as e:
+                logger.opt(exception=e).warning("email outbox round failed")
+                await asyncio.sleep(EMAIL_OUTBOX_ERROR_DELAY)
+    finally:
+        await pool.close()
@@ -8,3 +8,24 @@ class StripePaymentError(Exception): ...
 
 
 class PaymentNotSuccessful(Exception): ...
+
+
+class ImageNotUploaded(Exception): ...
+
+
+class ImageTooLarge(Exception): ...
+
+
+class InvalidImage(Exception): ...
+
+
+class PasswordHasherSaturated(Exception): ...
+
+
+class VerificationCodeNotFound(Exception): ...
+
+
+class VerificationCodeMismatch(Exception): ...
+
+
+class LoginRateLimited(Exception): ...
@@ -0,0 +1,70 @@
+from typing import Awaitable, Callable
+
+from fastapi import Request
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.db.models import User
+from app.dto_schemas.user import UserSnapshot
+from app.logger import logger
+
+USER_SNAPSHOT_PREFIX = "user_snapshot"
+DEFAULT_USER_SNAPSHOT_EXPIRE = 300  # in seconds, a missed invalidation heals itself
+
+UserLoader = Callable[[], Awaitable[User | None]]
+
+
+def generate_user_snapshot_key(ukey: str) -> str:
+    return f"{USER_SNAPSHOT_PREFIX}:{ukey}"
+
+
+async def get_user_snapshot(
+    request: Request,
+    redis_client: Redis,
+    ukey: str,
+    loader: UserLoader,
+    expire: int = DEFAULT_USER_SNAPSHOT_EXPIRE,
+) -> UserSnapshot | None:
+    """
+    Read-only view of the user, for handlers that do not modify it.
+
+    Repeated lookups within one request are answered from ``request.state``,
+    the first one from the Redis snapshot and only a miss calls ``loader``.
+    """
+    memo: dict | None = getattr(request.state, "user_snapshots", None)
+    if memo is None:
+        memo = request.state.user_snapshots = {}
+    if ukey in memo:
+        return memo[ukey]
+
+    key = generate_user_snapshot_key(ukey)
+    snapshot = None
+    try:
+        cached: bytes | None = await redis_client.get(key)
+        if cached:
+            snapshot = UserSnapshot.model_validate_json(cached)
+    except (RedisError, ValidationError):
+        # unreadable or written by an older schema, load it again
+        pass
+
+    if snapshot is None:
+        user = await loader()
+        if user is None:
+            return None
+        snapshot = UserSnapshot.model_validate(user)
+        try:
+            await redis_client.set(key, snapshot.model_dump_json(), ex=expire)
+        except RedisError as e:
+            logger.opt(exception=e).warning("user snapshot is not cached", ukey=ukey)
+
+    memo[ukey] = snapshot
+    return snapshot
+
+
+async def invalidate_user_snapshot(redis_client: Redis, ukey: str):
+    """Drop the cached view after the user's identity fields were saved."""
+    try:
+        await redis_client.delete(generate_user_snapshot_key(ukey))
+    except RedisError as e:
+        logger.opt(exception=e).warning("user snapshot is not invalidated", ukey=ukey)
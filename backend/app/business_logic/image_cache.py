@@ -0,0 +1,155 @@
+import fcntl
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Tuple
+
+import aiofiles
+
+from app.business_logic.images import IMAGE_CONTENT_TYPES
+from app.metrics import counter, register_gauge
+from app.settings import settings
+
+IMAGE_MEDIA_TYPES = {
+    ext: content_type for content_type, ext in IMAGE_CONTENT_TYPES.items()
+}
+PARTIAL_SUFFIX = ".part"
+# a download still unfinished after this long was abandoned
+PARTIAL_MAX_AGE = 3600  # in seconds
+LOCK_FILE = ".lock"
+SIZE_FILE = ".size"
+EVICTION_TARGET = 0.9  # share of max_size left after an eviction
+
+# object keys are flat file names, anything else could escape the cache dir;
+# they never start with a dot, so they cannot clash with the lock and size files
+_image_key_re = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+cache_hits = counter("image_cache_hits")
+cache_misses = counter("image_cache_misses")
+
+
+def is_valid_image_key(key: str) -> bool:
+    return bool(_image_key_re.match(key)) and not key.endswith(PARTIAL_SUFFIX)
+
+
+def image_media_type(key: str) -> str:
+    return IMAGE_MEDIA_TYPES.get(key.rsplit(".", 1)[-1], "application/octet-stream")
+
+
+class DiskImageCache:
+    """
+    Bounded cache of bucket objects kept as plain files, shared by all workers.
+
+    Objects are written under a temporary name and renamed into place, so a
+    worker serves whatever any worker cached and never sees half a file. A hit
+    touches the file's mtime, the recency used for eviction. The total size is
+    kept in a small file next to the objects and updated under an flock; once
+    it goes over ``max_size`` the worker holding the lock rescans the directory
+    and removes the least recently served files.
+    """
+
+    def __init__(self, root: str, max_size: int):
+        self.root = Path(root)
+        self.max_size = max_size
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / LOCK_FILE, "a") as lock_file:
+            # released when the file is closed
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    @property
+    def size(self) -> int:
+        try:
+            return int((self.root / SIZE_FILE).read_text())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _scan(self) -> List[Tuple[float, Path, int]]:
+        files = []
+        stale_before = time.time() - PARTIAL_MAX_AGE
+        for path in self.root.iterdir():
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.name.endswith(PARTIAL_SUFFIX):
+                # another worker may still be writing it
+                if stat.st_mtime < stale_before:
+                    path.unlink(missing_ok=True)
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+        return files
+
+    def _evict(self, target_size: int):
+        files = sorted(self._scan())
+        size = sum(file_size for _, _, file_size in files)
+        for _, path, file_size in files[:-1]:
+            if size <= target_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+        (self.root / SIZE_FILE).write_text(str(size))
+
+    def load(self):
+        """Recount the directory and trim it, e.g. after ``max_size`` changed."""
+        with self._locked():
+            self._evict(self.max_size)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def get(self, key: str) -> Path | None:
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            cache_misses.inc()
+            return None
+        cache_hits.inc()
+        return path
+
+    async def fill(
+        self, key: str, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Pass ``chunks`` through while writing them to the cache."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        partial_path = self.root / f"{key}.{uuid.uuid4().hex}{PARTIAL_SUFFIX}"
+        size = 0
+        try:
+            async with aiofiles.open(partial_path, "wb") as file:
+                async for chunk in chunks:
+                    await file.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+            # readers never see a half written file
+            os.replace(partial_path, self.path(key))
+        finally:
+            partial_path.unlink(missing_ok=True)
+        self._add(size)
+
+    def _add(self, size: int):
+        with self._locked():
+            total = self.size + size
+            if total > self.max_size:
+                # free some headroom so the next fills do not rescan again
+                self._evict(int(self.max_size * EVICTION_TARGET))
+            else:
+                (self.root / SIZE_FILE).write_text(str(total))
+
+    def stats(self) -> dict:
+        return {"size": self.size, "max_size": self.max_size}
+
+
+image_cache = DiskImageCache(
+    settings.aws.image_cache_dir, settings.aws.image_cache_size
+)
+
+register_gauge("image_cache", image_cache.stats)
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import List, Set
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from types_aiobotocore_s3.client import S3Client
+
+from app.business_logic.images import (image_key_from_url, image_url,
+                                       source_key, variant_keys)
+from app.db.managers.catalog_manager import get_referenced_image_urls
+from app.logger import logger
+from app.metrics import counter
+from app.redis_cache import ServerScript
+from app.s3 import s3_client_manager
+from app.settings import settings
+
+IMAGE_DELETION_QUEUE_KEY = "image_deletion_queue"
+# Redis sorted set: image key -> time of its last upload. Only consulted for
+# uploads younger than UPLOAD_GRACE_PERIOD, which no game or change request
+# may refer to yet; anything older is judged by the database alone.
+IMAGE_UPLOADS_KEY = "image_uploads"
+UPLOAD_GRACE_PERIOD = timedelta(hours=24)
+# claimed keys with their claim time, until S3 confirmed the deletion
+IMAGE_DELETION_PROCESSING_KEY = "image_deletion_processing"
+# a claim older than this belongs to a worker that died, its keys are queued again
+DELETION_CLAIM_LEASE = 600  # in seconds
+MAX_DELETE_BATCH = 1000  # DeleteObjects limit
+DELETE_ATTEMPTS = 3
+DELETE_RETRY_DELAY = 0.5  # in seconds, doubled after every attempt
+IMAGE_DELETION_POLL_INTERVAL = 5  # in seconds
+
+deleted_keys = counter("image_deletion_deleted_keys")
+failed_keys = counter("image_deletion_failed_keys")
+
+
+async def enqueue_image_deletion(redis_client: Redis, key: str) -> int:
+    return await redis_client.rpush(IMAGE_DELETION_QUEUE_KEY, key, *variant_keys(key))
+
+
+# Moves a batch from the queue into the processing set in one step, after
+# putting back whatever a dead worker left there, so a key is never lost
+# between being claimed and being deleted.
+CLAIM_DELETION_BATCH_SCRIPT = """
+local expired = redis.call(
+    'ZRANGEBYSCORE', KEYS[2], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[2]),
+    'LIMIT', 0, tonumber(ARGV[3])
+)
+for _, key in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], key)
+    redis.call('RPUSH', KEYS[1], key)
+end
+local keys = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[3]) - 1)
+redis.call('LTRIM', KEYS[1], #keys, -1)
+for _, key in ipairs(keys) do
+    redis.call('ZADD', KEYS[2], ARGV[1], key)
+end
+return keys
+"""
+
+claim_deletion_batch_script = ServerScript(CLAIM_DELETION_BATCH_SCRIPT)
+
+
+async def claim_deletion_batch(
+    redis_client: Redis, batch_size: int = MAX_DELETE_BATCH
+) -> List[str]:
+    keys = await claim_deletion_batch_script(
+        redis_client,
+        [IMAGE_DELETION_QUEUE_KEY, IMAGE_DELETION_PROCESSING_KEY],
+        [int(time.time()), DELETION_CLAIM_LEASE, batch_size],
+    )
+    return [key.decode() if isinstance(key, bytes) else key for key in keys]
+
+
+async def finish_deletion_batch(
+    redis_client: Redis, keys: List[str], failed: List[str]
+):
+    async with redis_client.pipeline(transaction=True) as pipe:
+        if failed:
+            # put them back for the next round instead of dropping them
+            pipe.rpush(IMAGE_DELETION_QUEUE_KEY, *failed)
+        pipe.zrem(IMAGE_DELETION_PROCESSING_KEY, *keys)
+        await pipe.execute()
+
+
+async def record_image_upload(redis_client: Redis, key: str):
+    now = time.time()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zadd(IMAGE_UPLOADS_KEY, {key: now})
+        pipe.zremrangebyscore(
+            IMAGE_UPLOADS_KEY, "-inf", now - UPLOAD_GRACE_PERIOD.total_seconds()
+        )
+        await pipe.execute()
+
+
+async def recently_uploaded_keys(
+    redis_client: Redis, keys: List[str], since: float
+) -> Set[str]:
+    if not keys:
+        return set()
+    uploaded_at = await redis_client.zmscore(IMAGE_UPLOADS_KEY, keys)
+    return {
+        key
+        for key, timestamp in zip(keys, uploaded_at)
+        if timestamp is not None and timestamp > since
+    }
+
+
+async def referenced_image_keys(db_session: AsyncSession, keys: List[str]) -> Set[str]:
+    if not keys:
+        return set()
+    urls = await get_referenced_image_urls(db_session, [image_url(key) for key in keys])
+    return {image_key_from_url(url) for url in urls}
+
+
+async def deletable_keys(
+    redis_client: Redis, db_session: AsyncSession, keys: List[str]
+) -> List[str]:
+    """
+    Drop the keys whose image a game or pending change request uses, or which
+    was uploaded again within the grace period. Checked right before deleting,
+    an image may have been taken again since it was queued.
+    """
+    sources = list({source_key(key) for key in keys})
+    since = time.time() - UPLOAD_GRACE_PERIOD.total_seconds()
+    kept = await referenced_image_keys(db_session, sources)
+    kept |= await recently_uploaded_keys(redis_client, sources, since)
+    return [key for key in keys if source_key(key) not in kept]
+
+
+async def delete_batch(s3_client: S3Client, keys: List[str]) -> List[str]:
+    """Delete keys with retries, returns the keys S3 still refused to delete."""
+    delay = DELETE_RETRY_DELAY
+    for attempt in range(1, DELETE_ATTEMPTS + 1):
+        try:
+            response = await s3_client.delete_objects(
+                Bucket=settings.aws.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+        except Exception as e:
+            logger.opt(exception=e).warning(
+                "image deletion batch failed", attempt=attempt, keys=len(keys)
+            )
+        else:
+            errors = response.get("Errors", [])
+            deleted_keys.inc(len(keys) - len(errors))
+            keys = [error["Key"] for error in errors]
+            if not keys:
+                return []
+        if attempt < DELETE_ATTEMPTS:
+            await asyncio.sleep(delay)
+            delay *= 2
+    return keys
+
+
+async def process_image_deletions(
+    redis_client: Redis, s3_client: S3Client, session_factory: async_sessionmaker
+) -> int:
+    claimed = await claim_deletion_batch(redis_client)
+    if not claimed:
+        return 0
+
+    async with session_factory() as session:
+        keys = await deletable_keys(redis_client, session, claimed)
+    failed = await delete_batch(s3_client, keys) if keys else []
+    failed_keys.inc(len(failed))
+    await finish_deletion_batch(redis_client, claimed, failed)
+    return len(claimed)
+
+
+async def poll_image_deletions(
+    redis_client: Redis,
+    session_factory: async_sessionmaker,
+    interval: float = IMAGE_DELETION_POLL_INTERVAL,
+):
+    while True:
+        try:
+            s3_client = s3_client_manager.client or await s3_client_manager.start()
+            # drain full batches back to back, wait only once the queue is short
+            while (
+                await process_image_deletions(
+                    redis_client, s3_client, session_factory
+                )
+                == MAX_DELETE_BATCH
+            ):
+                pass
+        except Exception as e:
+            logger.opt(exception=e).warning("image deletion round failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Set
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from types_aiobotocore_s3.client import S3Client
+
+from app.business_logic.image_deletion import (MAX_DELETE_BATCH,
+                                               UPLOAD_GRACE_PERIOD,
+                                               delete_batch,
+                                               recently_uploaded_keys)
+from app.business_logic.images import image_key_from_url, source_key
+from app.db.managers.catalog_manager import iter_referenced_image_urls
+from app.logger import logger
+from app.settings import settings
+
+DEFAULT_IMAGE_GC_GRACE_PERIOD = UPLOAD_GRACE_PERIOD
+
+
+async def get_live_image_keys(db_session: AsyncSession) -> Set[str]:
+    return {
+        image_key_from_url(url)
+        async for url in iter_referenced_image_urls(db_session)
+    }
+
+
+async def collect_orphaned_images(
+    s3_client: S3Client,
+    redis_client: Redis,
+    live_keys: Set[str],
+    grace_period: timedelta = DEFAULT_IMAGE_GC_GRACE_PERIOD,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Delete bucket objects no game or pending change request refers to.
+
+    The listing is consumed one page at a time and at most one DeleteObjects
+    batch is held in memory. Objects newer than the grace period are kept, so
+    uploads whose change request is not submitted yet survive. A deduplicated
+    upload reuses an old blob without touching its LastModified, so images
+    recorded as uploaded within the grace period are kept as well.
+    """
+    cutoff = datetime.now(timezone.utc) - grace_period
+    report = {"scanned": 0, "deleted": 0, "failed": 0, "reclaimed_bytes": 0}
+    batch: Dict[str, int] = {}  # key -> size
+
+    async def flush():
+        if not batch:
+            return
+        sources = list({source_key(key) for key in batch})
+        recent = await recently_uploaded_keys(
+            redis_client, sources, cutoff.timestamp()
+        )
+        for key in [key for key in batch if source_key(key) in recent]:
+            del batch[key]
+        if not batch:
+            return
+        failed = [] if dry_run else await delete_batch(s3_client, list(batch))
+        for key in failed:
+            # S3 may report a key that was not in the request, ignore it
+            batch.pop(key, None)
+        report["deleted"] += len(batch)
+        report["failed"] += len(failed)
+        report["reclaimed_bytes"] += sum(batch.values())
+        batch.clear()
+
+    paginator = s3_client.get_paginator("list_objects_v2")
+    async for page in paginator.paginate(
+        Bucket=settings.aws.bucket_name,
+        PaginationConfig={"PageSize": MAX_DELETE_BATCH},
+    ):
+        for blob in page.get("Contents", []):
+            report["scanned"] += 1
+            if blob["LastModified"] > cutoff or source_key(blob["Key"]) in live_keys:
+                continue
+            batch[blob["Key"]] = blob["Size"]
+            if len(batch) == MAX_DELETE_BATCH:
+                await flush()
+    await flush()
+
+    logger.info("orphaned images collected", dry_run=dry_run, **report)
+    return report
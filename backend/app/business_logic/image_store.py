@@ -0,0 +1,98 @@
+import hashlib
+from typing import AsyncIterator
+
+from botocore.exceptions import ClientError
+from redis.asyncio import Redis
+from types_aiobotocore_s3.client import S3Client
+
+from app.business_logic.exceptions import ImageTooLarge
+from app.business_logic.image_deletion import (enqueue_image_deletion,
+                                               record_image_upload)
+from app.business_logic.images import (IMAGE_CONTENT_TYPES,
+                                       IMMUTABLE_CACHE_CONTROL,
+                                       ensure_valid_image, image_url,
+                                       upload_image_variants, variant_urls)
+from app.logger import logger
+from app.metrics import counter
+from app.settings import settings
+
+deduplicated_uploads = counter("image_store_deduplicated_uploads")
+
+
+def content_key(digest: str, content_type: str) -> str:
+    return f"{digest}.{IMAGE_CONTENT_TYPES[content_type]}"
+
+
+async def release_image(redis_client: Redis, key: str):
+    # the deletion worker asks the database before deleting, so an image
+    # another game or pending change request still uses is kept
+    await enqueue_image_deletion(redis_client, key)
+
+
+async def blob_exists(s3_client: S3Client, key: str) -> bool:
+    try:
+        await s3_client.head_object(Bucket=settings.aws.bucket_name, Key=key)
+    except ClientError:
+        return False
+    return True
+
+
+async def read_image(chunks: AsyncIterator[bytes]) -> tuple[bytes, str]:
+    # The key is the hash of the whole content and the variants are resized
+    # from the decoded image, so the body is buffered (at most max_image_size)
+    # instead of going through stream_upload. The hash is updated chunk by
+    # chunk, the body is never walked twice.
+    sha256 = hashlib.sha256()
+    data = bytearray()
+    async for chunk in chunks:
+        sha256.update(chunk)
+        data += chunk
+        if len(data) > settings.aws.max_image_size:
+            raise ImageTooLarge()
+    return bytes(data), sha256.hexdigest()
+
+
+async def store_image(
+    s3_client: S3Client,
+    redis_client: Redis,
+    chunks: AsyncIterator[bytes],
+    content_type: str,
+) -> dict:
+    """
+    Store an image under the SHA-256 of its content.
+
+    Identical uploads resolve to the same key, so the blob and its variants
+    are written once; the returned URLs never change content and may be
+    cached forever. The upload is recorded so the image survives the grace
+    period until a change request refers to it, even when an older blob is
+    reused.
+    """
+    data, digest = await read_image(chunks)
+    # nothing reaches the bucket unless Pillow can read it as the declared type
+    await ensure_valid_image(data, content_type)
+    key = content_key(digest, content_type)
+
+    # recorded before the bucket is checked, so a deletion that has not
+    # looked at this key yet keeps the blob about to be reused
+    await record_image_upload(redis_client, key)
+    deduplicated = await blob_exists(s3_client, key)
+    if deduplicated:
+        deduplicated_uploads.inc()
+    else:
+        await s3_client.put_object(
+            Bucket=settings.aws.bucket_name,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+        )
+        await upload_image_variants(s3_client, key, data)
+        logger.info("image stored", key=key, size=len(data))
+
+    game_img_url = image_url(key)
+    return {
+        "key": key,
+        "game_img_url": game_img_url,
+        "variants": variant_urls(game_img_url),
+        "deduplicated": deduplicated,
+    }
@@ -0,0 +1,189 @@
+import asyncio
+import io
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from botocore.exceptions import ClientError
+from PIL import Image, ImageOps
+from types_aiobotocore_s3.client import S3Client
+
+from app.business_logic.exceptions import ImageNotUploaded, InvalidImage
+from app.settings import settings
+from app.utils import cpu_share
+
+# variant name -> longest side in pixels
+IMAGE_VARIANTS = {
+    "thumbnail": 200,
+    "card": 480,
+    "full": 1600,
+}
+VARIANT_CONTENT_TYPE = "image/webp"
+IMAGE_CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+}
+# Pillow format -> the content type such an image is uploaded with
+IMAGE_FORMATS = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+VARIANT_QUALITY = 80
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_image_pool: ProcessPoolExecutor | None = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _image_pool
+
+    if _image_pool is None:
+        _image_pool = ProcessPoolExecutor(
+            max_workers=settings.aws.image_workers
+            or cpu_share(settings.web_concurrency)
+        )
+    return _image_pool
+
+
+def shutdown_image_pool():
+    global _image_pool
+
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=False, cancel_futures=True)
+        _image_pool = None
+
+
+def image_url(key: str) -> str:
+    return f"/{settings.aws.bucket_name}/{key}"
+
+
+def image_key_from_url(url: str) -> str:
+    return url.split("/")[2]
+
+
+def variant_key(key: str, variant: str) -> str:
+    return f"{key}_{variant}.webp"
+
+
+def source_key(key: str) -> str:
+    # maps a variant key back to the key of the image it was generated from
+    for variant in IMAGE_VARIANTS:
+        suffix = f"_{variant}.webp"
+        if key.endswith(suffix):
+            return key.removesuffix(suffix)
+    return key
+
+
+def variant_keys(key: str) -> List[str]:
+    return [variant_key(key, variant) for variant in IMAGE_VARIANTS]
+
+
+def variant_urls(game_img_url: str) -> Dict[str, str]:
+    key = image_key_from_url(game_img_url)
+    return {
+        variant: image_url(variant_key(key, variant)) for variant in IMAGE_VARIANTS
+    }
+
+
+def image_content_type(data: bytes) -> str | None:
+    # Runs in a worker process: checks the data is a well formed image without
+    # decoding the pixels, returns None for anything Pillow refuses
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+            return IMAGE_FORMATS.get(image.format)
+    except Exception:
+        return None
+
+
+async def ensure_valid_image(data: bytes, content_type: str):
+    loop = asyncio.get_running_loop()
+    detected = await loop.run_in_executor(get_image_pool(), image_content_type, data)
+    if detected != content_type:
+        raise InvalidImage()
+
+
+def generate_variants(data: bytes) -> Dict[str, bytes]:
+    # Runs in a worker process: the source is decoded once and every variant
+    # is resized from that single decoded frame
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    variants = {}
+    for variant, size in IMAGE_VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format="WEBP", quality=VARIANT_QUALITY, method=4)
+        variants[variant] = buffer.getvalue()
+    return variants
+
+
+async def upload_image_variants(
+    s3_client: S3Client, key: str, data: bytes
+) -> Dict[str, str]:
+    loop = asyncio.get_running_loop()
+    variants = await loop.run_in_executor(get_image_pool(), generate_variants, data)
+
+    await asyncio.gather(
+        *(
+            s3_client.put_object(
+                Bucket=settings.aws.bucket_name,
+                Key=variant_key(key, variant),
+                Body=body,
+                ContentType=VARIANT_CONTENT_TYPE,
+                CacheControl=IMMUTABLE_CACHE_CONTROL,
+            )
+            for variant, body in variants.items()
+        )
+    )
+    return {variant: image_url(variant_key(key, variant)) for variant in variants}
+
+
+async def delete_image(s3_client: S3Client, key: str):
+    await s3_client.delete_objects(
+        Bucket=settings.aws.bucket_name,
+        Delete={
+            "Objects": [{"Key": blob_key} for blob_key in [key, *variant_keys(key)]],
+            "Quiet": True,
+        },
+    )
+
+
+def generate_image_key(content_type: str) -> str:
+    return f"{uuid.uuid4().hex}.{IMAGE_CONTENT_TYPES[content_type]}"
+
+
+async def create_presigned_image_upload(
+    s3_client: S3Client, content_type: str, size: int
+) -> dict:
+    key = generate_image_key(content_type)
+    # S3 enforces the conditions itself, the upload never touches our workers
+    presigned_post = await s3_client.generate_presigned_post(
+        Bucket=settings.aws.bucket_name,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, min(size, settings.aws.max_image_size)],
+        ],
+        ExpiresIn=settings.aws.presigned_upload_expire,
+    )
+    return {"key": key, "game_img_url": image_url(key), **presigned_post}
+
+
+async def ensure_image_uploaded(s3_client: S3Client, key: str) -> dict:
+    try:
+        head = await s3_client.head_object(Bucket=settings.aws.bucket_name, Key=key)
+    except ClientError as e:
+        raise ImageNotUploaded() from e
+
+    if (
+        head["ContentLength"] > settings.aws.max_image_size
+        or head.get("ContentType") not in IMAGE_CONTENT_TYPES
+    ):
+        raise ImageNotUploaded()
+    return head
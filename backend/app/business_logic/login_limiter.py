@@ -0,0 +1,80 @@
+import math
+import time
+import uuid
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.business_logic.exceptions import LoginRateLimited
+from app.logger import logger
+from app.metrics import counter
+from app.redis_cache import ServerScript
+from app.settings import settings
+
+LOGIN_ATTEMPTS_PREFIX = "login_attempts"
+LOGIN_LIMIT_SCOPES = ("ip", "email", "global")
+
+# One sorted set of attempt timestamps per scope. Every window is trimmed and
+# counted before anything is recorded, so a rejected attempt costs nothing
+# and an attack against one scope cannot use up the others.
+ADMIT_LOGIN_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[3 + i]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        return {i, tonumber(oldest[2]) + window - now}
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[3])
+    redis.call('PEXPIRE', key, window)
+end
+return {0, 0}
+"""
+
+admit_login_script = ServerScript(ADMIT_LOGIN_SCRIPT)
+
+admitted_logins = counter("login_admitted")
+rejected_logins = {
+    scope: counter(f"login_rejected_{scope}") for scope in LOGIN_LIMIT_SCOPES
+}
+
+
+def generate_login_attempts_keys(ip: str, email: str) -> list[str]:
+    return [
+        f"{LOGIN_ATTEMPTS_PREFIX}:ip:{ip}",
+        f"{LOGIN_ATTEMPTS_PREFIX}:email:{email.lower()}",
+        f"{LOGIN_ATTEMPTS_PREFIX}:global",
+    ]
+
+
+async def admit_login(redis_client: Redis, ip: str, email: str):
+    """
+    Record a login attempt in the per IP, per account and global sliding
+    windows, or raise ``LoginRateLimited`` with the seconds until one of the
+    full windows frees a slot. All windows are checked in one round trip.
+    """
+    now = int(time.time() * 1000)
+    window = settings.auth.login_window * 1000
+    limits = [
+        settings.auth.login_ip_limit,
+        settings.auth.login_email_limit,
+        settings.auth.login_global_limit,
+    ]
+    try:
+        scope, retry_after = await admit_login_script(
+            redis_client,
+            generate_login_attempts_keys(ip, email),
+            [now, window, f"{now}:{uuid.uuid4().hex}", *limits],
+        )
+    except RedisError as e:
+        # logins must keep working without the limiter
+        logger.opt(exception=e).warning("login attempt is not rate limited")
+        return
+
+    if scope:
+        rejected_logins[LOGIN_LIMIT_SCOPES[scope - 1]].inc()
+        raise LoginRateLimited(max(1, math.ceil(retry_after / 1000)))
+    admitted_logins.inc()
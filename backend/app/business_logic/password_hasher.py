@@ -0,0 +1,229 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, TypeVar
+
+import bcrypt
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.business_logic import auth
+from app.business_logic.exceptions import PasswordHasherSaturated
+from app.logger import logger
+from app.metrics import Histogram, counter, histogram, register_gauge
+from app.settings import settings
+from app.utils import cpu_share
+
+T = TypeVar("T")
+
+CALIBRATION_PASSWORD = b"calibration-password"
+CALIBRATION_SAMPLES = 3
+# the cost every worker uses, calibrated once by whichever worker starts first
+PASSWORD_HASH_COST_KEY = "password_hash_cost"
+CALIBRATION_LOCK_KEY = "password_hash_calibration"
+CALIBRATION_LOCK_EXPIRE = 60  # in seconds
+CALIBRATION_WAIT = 30  # in seconds
+CALIBRATION_POLL_INTERVAL = 0.5  # in seconds
+
+rejected_calls = counter("password_hasher_rejected")
+rehashed_passwords = counter("password_rehashed")
+hash_latency = histogram("password_hash_seconds")
+verify_latency = histogram("password_verify_seconds")
+
+
+def hash_with_cost(password: str, cost: int) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(cost)).decode()
+
+
+def hash_cost(hashed_password: str) -> int | None:
+    # bcrypt hashes look like $2b$<cost>$<salt and digest>
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or not parts[1].startswith("2") or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def time_bcrypt(cost: int) -> float:
+    salt = bcrypt.gensalt(cost)
+    started = time.perf_counter()
+    bcrypt.hashpw(CALIBRATION_PASSWORD, salt)
+    return time.perf_counter() - started
+
+
+def pick_cost(seconds: float, cost: int, budget: float, max_cost: int) -> int:
+    # every step of the cost doubles the work, so one timing at ``cost`` is
+    # enough to estimate all the higher ones
+    while cost < max_cost and seconds * 2 <= budget:
+        seconds *= 2
+        cost += 1
+    return cost
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a process pool, so a hash never blocks the event loop.
+
+    At most ``max_pending`` calls wait for or occupy the pool; beyond that
+    ``PasswordHasherSaturated`` is raised right away instead of letting the
+    queue, and every login's latency, grow without bound.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_pending: int | None = None,
+        cost: int = 12,
+    ):
+        self.workers = workers or cpu_share(settings.web_concurrency)
+        self.max_pending = max_pending or self.workers * 4
+        self.cost = cost
+        self.pending = 0
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def _run(self, latency: Histogram, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            rejected_calls.inc()
+            raise PasswordHasherSaturated()
+
+        self.pending += 1
+        try:
+            # timed once admitted, rejected calls stay out of the histograms
+            with latency.time():
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_pool(), func, *args)
+        finally:
+            self.pending -= 1
+
+    async def _time_cost(self, cost: int) -> float:
+        loop = asyncio.get_running_loop()
+        samples = [
+            await loop.run_in_executor(self._get_pool(), time_bcrypt, cost)
+            for _ in range(CALIBRATION_SAMPLES)
+        ]
+        return statistics.median(samples)
+
+    async def calibrate(self, budget: float, min_cost: int, max_cost: int) -> int:
+        """
+        Benchmark bcrypt on this host and switch to the highest cost whose
+        hash takes at most ``budget`` seconds (never below ``min_cost``).
+        """
+        seconds = await self._time_cost(min_cost)
+        cost = pick_cost(seconds, min_cost, budget, max_cost)
+        if cost > min_cost:
+            # the estimate is only an extrapolation, check the cost it picked
+            seconds = await self._time_cost(cost)
+            if seconds > budget:
+                cost -= 1
+        logger.info("bcrypt cost calibrated", cost=cost, budget=budget)
+        self.cost = cost
+        return cost
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        cost = hash_cost(hashed_password)
+        # a hash stronger than the current cost is kept, calibrating on a
+        # slower host must not weaken the hashes stored so far
+        return cost is not None and cost < self.cost
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_latency, hash_with_cost, password, self.cost)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(
+            verify_latency, auth.verify_password, password, hashed_password
+        )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "cost": self.cost,
+        }
+
+
+password_hasher = PasswordHasher(
+    settings.auth.password_hash_workers,
+    settings.auth.password_hash_max_pending,
+    settings.auth.password_hash_cost,
+)
+
+register_gauge("password_hasher", password_hasher.stats)
+
+
+async def load_password_hash_cost(
+    redis_client: Redis, budget: float, min_cost: int, max_cost: int
+) -> int:
+    """
+    Switch to the cost shared by all workers through Redis.
+
+    Only when none is stored does one worker, holding a lock, calibrate and
+    store it while the others wait for it. Workers calibrating on their own
+    would pick different costs on a busy host, and logins would be rehashed
+    depending on the worker that served them. Deleting the key (see
+    ``python -m app.commands reset-password-hash-cost``) calibrates again on
+    the next start, e.g. after moving to another instance type.
+    """
+    deadline = time.monotonic() + CALIBRATION_WAIT
+    try:
+        while True:
+            stored = await redis_client.get(PASSWORD_HASH_COST_KEY)
+            if stored is not None:
+                password_hasher.cost = int(stored)
+                return password_hasher.cost
+            if await redis_client.set(
+                CALIBRATION_LOCK_KEY, 1, nx=True, ex=CALIBRATION_LOCK_EXPIRE
+            ):
+                try:
+                    cost = await password_hasher.calibrate(budget, min_cost, max_cost)
+                    await redis_client.set(PASSWORD_HASH_COST_KEY, cost)
+                finally:
+                    await redis_client.delete(CALIBRATION_LOCK_KEY)
+                return cost
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    "no shared bcrypt cost, keeping the configured one",
+                    cost=password_hasher.cost,
+                )
+                return password_hasher.cost
+            await asyncio.sleep(CALIBRATION_POLL_INTERVAL)
+    except RedisError as e:
+        logger.opt(exception=e).warning(
+            "bcrypt cost not loaded, keeping the configured one",
+            cost=password_hasher.cost,
+        )
+        return password_hasher.cost
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(password, hashed_password)
+
+
+async def upgrade_password_hash(password: str, hashed_password: str) -> str | None:
+    """
+    Hash an already verified password again if its stored hash was made with
+    a lower cost than the current one; returns None when it is up to date.
+    """
+    if not password_hasher.needs_rehash(hashed_password):
+        return None
+    try:
+        new_hashed_password = await password_hasher.hash(password)
+    except PasswordHasherSaturated:
+        # the login itself succeeded, the upgrade can wait for the next one
+        return None
+    rehashed_passwords.inc()
+    return new_hashed_password
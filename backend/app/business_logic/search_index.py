@@ -0,0 +1,274 @@
+import asyncio
+import heapq
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.business_logic.catalog_cache import get_catalog_version
+from app.db.managers.catalog_manager import (get_game_popularity,
+                                             get_game_search_rows)
+from app.db.models import Game
+
+DEFAULT_SEARCH_LIMIT = 20
+DEFAULT_SUGGESTION_COUNT = 8
+MAX_SUGGESTION_COUNT = 10
+MAX_COMPLETION_PREFIX_LENGTH = 12
+
+_token_re = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    return " ".join(_token_re.findall(text.casefold()))
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Set[int] = set()
+
+
+class GameSearchIndex:
+    """
+    Per-worker search index over game titles and genres.
+
+    Word prefixes are answered from a trie, arbitrary substrings (the old
+    ``%term%`` semantics) from trigram posting lists verified against the text.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._documents: Dict[int, str] = {}
+        self._titles: Dict[int, str] = {}
+        self.version: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def build(
+        self, games: Iterable[Tuple[int, str, str | None]], version: int | None = None
+    ):
+        self._root = _TrieNode()
+        self._trigrams = {}
+        self._documents = {}
+        self._titles = {}
+        for game_id, title, genre in games:
+            self.add(game_id, title, genre)
+        self.version = version
+
+    def add(self, game_id: int, title: str, genre: str | None = None):
+        if game_id in self._documents:
+            self.remove(game_id)
+
+        document = normalize(f"{title} {genre or ''}")
+        self._documents[game_id] = document
+        self._titles[game_id] = title
+
+        for word in set(document.split()):
+            node = self._root
+            for char in word:
+                node = node.children.setdefault(char, _TrieNode())
+                node.ids.add(game_id)
+
+        for trigram in trigrams(document):
+            self._trigrams.setdefault(trigram, set()).add(game_id)
+
+    def remove(self, game_id: int):
+        document = self._documents.pop(game_id, None)
+        self._titles.pop(game_id, None)
+        if document is None:
+            return
+
+        for word in set(document.split()):
+            node = self._root
+            for char in word:
+                node = node.children[char]
+                node.ids.discard(game_id)
+
+        for trigram in trigrams(document):
+            postings = self._trigrams.get(trigram)
+            if postings is not None:
+                postings.discard(game_id)
+                if not postings:
+                    del self._trigrams[trigram]
+
+    def _prefix_ids(self, word: str) -> Set[int]:
+        node = self._root
+        for char in word:
+            next_node = node.children.get(char)
+            if next_node is None:
+                return set()
+            node = next_node
+        return node.ids
+
+    def prefix_matches(self, term: str) -> Set[int]:
+        """Games with a word starting with each word of the normalized ``term``."""
+        postings = sorted((self._prefix_ids(word) for word in term.split()), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            if not matches:
+                break
+            matches &= posting
+        return matches
+
+    def substring_matches(self, term: str) -> Set[int]:
+        """Games whose document contains the normalized ``term`` anywhere."""
+        term_trigrams = trigrams(term)
+        if not term_trigrams:
+            return set()
+
+        # intersect from the rarest trigram up to keep the working set small
+        postings = sorted(
+            (self._trigrams.get(trigram, set()) for trigram in term_trigrams), key=len
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+        return {
+            game_id for game_id in candidates if term in self._documents[game_id]
+        }
+
+    def search(self, term: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[int]:
+        term = normalize(term)
+        if not term:
+            return []
+
+        prefix_matches = self.prefix_matches(term)
+        result = heapq.nsmallest(limit, prefix_matches, key=self._titles.__getitem__)
+        if len(result) < limit:
+            substring_matches = self.substring_matches(term) - prefix_matches
+            result += heapq.nsmallest(
+                limit - len(result), substring_matches, key=self._titles.__getitem__
+            )
+        return result
+
+
+class GameSuggester:
+    """
+    Precomputed autocomplete over title word prefixes.
+
+    Every prefix up to ``MAX_COMPLETION_PREFIX_LENGTH`` characters maps to the
+    ids of its ``MAX_SUGGESTION_COUNT`` most popular games, so completing a
+    prefix is one dict lookup. Longer or multi-word input falls back to the
+    search index and is ranked by the same popularity.
+    """
+
+    def __init__(self):
+        self._completions: Dict[str, List[int]] = {}
+        self._titles: Dict[int, str] = {}
+        self._popularity: Dict[int, int] = {}
+
+    def _rank(self, game_id: int) -> Tuple[int, str]:
+        return -self._popularity.get(game_id, 0), self._titles[game_id]
+
+    def _top(self, k: int, ids: Iterable[int]) -> List[int]:
+        return heapq.nsmallest(
+            k, (game_id for game_id in ids if game_id in self._titles), key=self._rank
+        )
+
+    @staticmethod
+    def _prefixes(title: str) -> Set[str]:
+        return {
+            word[:length]
+            for word in normalize(title).split()
+            for length in range(1, min(len(word), MAX_COMPLETION_PREFIX_LENGTH) + 1)
+        }
+
+    def build(
+        self,
+        games: Iterable[Tuple[int, str, str | None]],
+        popularity: Dict[int, int],
+    ):
+        self._titles = {game_id: title for game_id, title, _ in games}
+        self._popularity = dict(popularity)
+
+        candidates: Dict[str, List[int]] = {}
+        for game_id, title in self._titles.items():
+            for prefix in self._prefixes(title):
+                candidates.setdefault(prefix, []).append(game_id)
+
+        self._completions = {
+            prefix: heapq.nsmallest(MAX_SUGGESTION_COUNT, ids, key=self._rank)
+            for prefix, ids in candidates.items()
+        }
+
+    def add(self, game_id: int, title: str):
+        self.remove(game_id)
+        self._titles[game_id] = title
+        for prefix in self._prefixes(title):
+            ids = self._completions.setdefault(prefix, [])
+            ids.append(game_id)
+            ids.sort(key=self._rank)
+            del ids[MAX_SUGGESTION_COUNT:]
+
+    def remove(self, game_id: int):
+        # A freed slot is refilled on the next rebuild, not from the games that
+        # were cut off when the list was built
+        title = self._titles.pop(game_id, None)
+        if title is None:
+            return
+        for prefix in self._prefixes(title):
+            ids = self._completions.get(prefix)
+            if ids and game_id in ids:
+                ids.remove(game_id)
+
+    def suggest(self, term: str, k: int = DEFAULT_SUGGESTION_COUNT) -> List[dict]:
+        term = normalize(term)
+        k = min(k, MAX_SUGGESTION_COUNT)
+        if not term:
+            return []
+
+        if " " not in term and len(term) <= MAX_COMPLETION_PREFIX_LENGTH:
+            ids = self._completions.get(term, [])[:k]
+        else:
+            # rank every match, a limited search would cut them alphabetically
+            prefix_matches = game_search_index.prefix_matches(term)
+            ids = self._top(k, prefix_matches)
+            if len(ids) < k:
+                substring_matches = game_search_index.substring_matches(term)
+                ids += self._top(k - len(ids), substring_matches - prefix_matches)
+        return [{"id": game_id, "title": self._titles[game_id]} for game_id in ids]
+
+
+game_search_index = GameSearchIndex()
+game_suggester = GameSuggester()
+# one rebuild per worker at a time, requests that see the same new version
+# wait for it instead of loading the catalog again
+_reload_lock = asyncio.Lock()
+
+
+async def load_game_search_index(db_session: AsyncSession, version: int | None = None):
+    games = await get_game_search_rows(db_session)
+    game_search_index.build(games, version)
+    game_suggester.build(games, await get_game_popularity(db_session))
+
+
+async def ensure_fresh_game_search_index(
+    redis_client: Redis, db_session: AsyncSession
+):
+    # Other workers learn about catalog changes through the shared catalog version
+    version = await get_catalog_version(redis_client)
+    if game_search_index.version == version:
+        return
+    async with _reload_lock:
+        # another request may have rebuilt it while this one was waiting
+        if game_search_index.version != version:
+            await load_game_search_index(db_session, version)
+
+
+def apply_game_change(game: Game, version: int):
+    game_search_index.add(game.id, game.title, game.genre)
+    game_suggester.add(game.id, game.title)
+    if game_search_index.version == version - 1:
+        # nothing else changed in between, so the index is current for `version`
+        game_search_index.version = version
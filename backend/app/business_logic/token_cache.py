@@ -0,0 +1,65 @@
+import hashlib
+import time
+from typing import Callable, Tuple
+
+from cachetools import TLRUCache
+from jose import JWTError, jwt
+
+from app.dto_schemas.auth import TokenData
+from app.metrics import counter, register_gauge
+from app.settings import settings
+
+cache_hits = counter("token_cache_hits")
+cache_misses = counter("token_cache_misses")
+
+
+def _expires_at(_key: bytes, value: Tuple[TokenData, float], _now: float) -> float:
+    return value[1]
+
+
+class VerifiedTokenCache:
+    """
+    Decoded tokens of this worker, kept until their own ``exp``.
+
+    Only tokens that already passed a full signature check are stored, keyed
+    by their SHA-256 so raw bearer tokens never sit in memory. Role checks
+    are not cached, the caller runs them on every request.
+    """
+
+    def __init__(self, maxsize: int, timer: Callable[[], float] = time.time):
+        self._timer = timer
+        self._cache: TLRUCache = TLRUCache(
+            maxsize=maxsize, ttu=_expires_at, timer=timer
+        )
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> TokenData | None:
+        cached = self._cache.get(self._key(token))
+        if cached is None:
+            cache_misses.inc()
+            return None
+        cache_hits.inc()
+        return cached[0]
+
+    def put(self, token: str, token_data: TokenData):
+        try:
+            # the signature was verified by the caller, only exp is read here
+            expires_at = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            return
+        if isinstance(expires_at, (int, float)) and expires_at > self._timer():
+            self._cache[self._key(token)] = (token_data, float(expires_at))
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {"size": self._cache.currsize, "max_size": self._cache.maxsize}
+
+
+verified_token_cache = VerifiedTokenCache(settings.auth.token_cache_size)
+
+register_gauge("token_cache", verified_token_cache.stats)
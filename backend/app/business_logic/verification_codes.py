@@ -0,0 +1,71 @@
+from redis.asyncio import Redis
+
+from app.business_logic.exceptions import (VerificationCodeMismatch,
+                                           VerificationCodeNotFound)
+from app.redis_cache import ServerScript
+
+DEFAULT_MAX_CODE_ATTEMPTS = 5
+
+# A code lives in a hash next to the value it unlocks and a counter of wrong
+# guesses; issuing a new code for the same key replaces the old one.
+ISSUE_CODE_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'code', ARGV[1], 'payload', ARGV[2], 'attempts', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# Fetch, compare and delete in one round trip: a matching code is consumed,
+# a wrong one is counted and the code is dropped after too many of them.
+# Codes issued before they moved into hashes are plain strings under the same
+# keys; HMGET would fail on them with WRONGTYPE, so they count as not found.
+VERIFY_CODE_SCRIPT = """
+if redis.call('TYPE', KEYS[1])['ok'] ~= 'hash' then
+    return {0}
+end
+local stored = redis.call('HMGET', KEYS[1], 'code', 'payload')
+if not stored[1] then
+    return {0}
+end
+if stored[1] == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return {1, stored[2]}
+end
+if redis.call('HINCRBY', KEYS[1], 'attempts', 1) >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+end
+return {-1}
+"""
+
+
+issue_code_script = ServerScript(ISSUE_CODE_SCRIPT)
+verify_code_script = ServerScript(VERIFY_CODE_SCRIPT)
+
+
+async def issue_code(
+    redis_client: Redis, key: str, code: str, expire: int, payload: str = ""
+):
+    await issue_code_script(redis_client, [key], [code, payload, expire])
+
+
+async def verify_code(
+    redis_client: Redis,
+    key: str,
+    code: str,
+    max_attempts: int = DEFAULT_MAX_CODE_ATTEMPTS,
+) -> str:
+    """Consume the code stored at ``key`` and return its payload."""
+    result = await verify_code_script(redis_client, [key], [code, max_attempts])
+    if result[0] == 0:
+        raise VerificationCodeNotFound()
+    if result[0] != 1:
+        raise VerificationCodeMismatch()
+    payload = result[1]
+    return payload.decode("utf-8") if isinstance(payload, bytes) else payload
+
+
+async def consume_token(redis_client: Redis, key: str) -> str | None:
+    # tokens long enough not to be guessed need no attempt counter, GETDEL
+    # alone makes them single-use
+    value: bytes | None = await redis_client.getdel(key)
+    return value.decode("utf-8") if value is not None else None
@@ -0,0 +1,105 @@
+"""
+Maintenance commands, run from the backend directory:
+
+    python -m app.commands rebuild-rating-stats
+    python -m app.commands rebuild-availability
+    python -m app.commands gc-images [--grace-hours 24] [--dry-run]
+    python -m app.commands reset-password-hash-cost
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+
+from app.business_logic.image_gc import (DEFAULT_IMAGE_GC_GRACE_PERIOD,
+                                         collect_orphaned_images,
+                                         get_live_image_keys)
+from app.business_logic.password_hasher import PASSWORD_HASH_COST_KEY
+from app.db import async_session
+from app.db.managers.availability_manager import rebuild_availability
+from app.db.managers.rating_manager import rebuild_rating_stats
+from app.logger import logger
+from app.redis_cache import get_redis
+from app.s3 import s3_client_manager
+
+
+async def rebuild_rating_stats_command(_: argparse.Namespace):
+    async with async_session() as session:
+        games_count = await rebuild_rating_stats(session)
+    logger.info("rating stats rebuilt", games_count=games_count)
+
+
+async def rebuild_availability_command(_: argparse.Namespace):
+    async with async_session() as session:
+        games_count = await rebuild_availability(session)
+    logger.info("game availability rebuilt", games_count=games_count)
+
+
+async def gc_images_command(args: argparse.Namespace):
+    async with async_session() as session:
+        live_keys = await get_live_image_keys(session)
+
+    s3_client = await s3_client_manager.start()
+    try:
+        await collect_orphaned_images(
+            s3_client,
+            get_redis(),
+            live_keys,
+            grace_period=timedelta(hours=args.grace_hours),
+            dry_run=args.dry_run,
+        )
+    finally:
+        await s3_client_manager.close()
+
+
+async def reset_password_hash_cost_command(_: argparse.Namespace):
+    await get_redis().delete(PASSWORD_HASH_COST_KEY)
+    logger.info("bcrypt cost reset, calibrated again on the next start")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.commands")
+    subparsers = parser.add_subparsers(required=True)
+
+    rebuild_rating_stats_parser = subparsers.add_parser(
+        "rebuild-rating-stats",
+        help="Recompute game_rating_stats from the feedback table",
+    )
+    rebuild_rating_stats_parser.set_defaults(handler=rebuild_rating_stats_command)
+
+    rebuild_availability_parser = subparsers.add_parser(
+        "rebuild-availability",
+        help="Recompute game_availability from game_account_games",
+    )
+    rebuild_availability_parser.set_defaults(handler=rebuild_availability_command)
+
+    gc_images_parser = subparsers.add_parser(
+        "gc-images",
+        help="Delete bucket images no game or pending change request refers to",
+    )
+    gc_images_parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=DEFAULT_IMAGE_GC_GRACE_PERIOD.total_seconds() / 3600,
+        help="Keep unreferenced images younger than this",
+    )
+    gc_images_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report what would be deleted",
+    )
+    gc_images_parser.set_defaults(handler=gc_images_command)
+
+    reset_password_hash_cost_parser = subparsers.add_parser(
+        "reset-password-hash-cost",
+        help="Forget the shared bcrypt cost, the next start calibrates it again",
+    )
+    reset_password_hash_cost_parser.set_defaults(
+        handler=reset_password_hash_cost_command
+    )
+
+    args = parser.parse_args()
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
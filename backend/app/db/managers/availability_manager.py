@@ -0,0 +1,91 @@
+from typing import Dict, List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.models import GameAccountGame, GameAvailability
+
+# The counter is always changed in the caller's transaction, next to the
+# game_account_games row it mirrors; none of these helpers commit on their own.
+
+
+async def adjust_availability(db_session: AsyncSession, game_id: int, delta: int):
+    stmt = (
+        insert(GameAvailability)
+        .values(game_id=game_id, available_accounts=max(delta, 0))
+        .on_duplicate_key_update(
+            available_accounts=GameAvailability.available_accounts + delta
+        )
+    )
+    await db_session.execute(stmt)
+
+
+async def link_account_games(
+    db_session: AsyncSession, account_id: int, game_ids: List[int]
+) -> List[GameAccountGame]:
+    account_games = [
+        GameAccountGame(account_id=account_id, game_id=game_id, available_status=True)
+        for game_id in game_ids
+    ]
+    db_session.add_all(account_games)
+    for game_id in game_ids:
+        await adjust_availability(db_session, game_id, 1)
+    return account_games
+
+
+async def set_account_game_availability(
+    db_session: AsyncSession, account_game: GameAccountGame, available: bool
+) -> bool:
+    # allocating an account for a rental/purchase passes False, releasing it True.
+    # The status is flipped by a conditional UPDATE rather than from the loaded
+    # row, so of two concurrent allocations only the one that changed it wins;
+    # False tells the other one the account was already taken (or released).
+    result = await db_session.execute(
+        update(GameAccountGame)
+        .where(
+            GameAccountGame.account_id == account_game.account_id,
+            GameAccountGame.game_id == account_game.game_id,
+            GameAccountGame.available_status != available,
+        )
+        .values(available_status=available)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+
+    delta = 1 if available else -1
+    await adjust_availability(db_session, account_game.game_id, delta)
+    set_committed_value(account_game, "available_status", available)
+    return True
+
+
+async def get_availability(
+    db_session: AsyncSession, game_ids: List[int]
+) -> Dict[int, int]:
+    rows = await db_session.execute(
+        select(GameAvailability.game_id, GameAvailability.available_accounts).where(
+            GameAvailability.game_id.in_(game_ids)
+        )
+    )
+    availability = {game_id: 0 for game_id in game_ids}
+    availability.update({game_id: count for game_id, count in rows})
+    return availability
+
+
+async def rebuild_availability(db_session: AsyncSession) -> int:
+    counts = (
+        select(GameAccountGame.game_id, func.count())
+        .where(GameAccountGame.available_status.is_(True))
+        .group_by(GameAccountGame.game_id)
+    )
+
+    await db_session.execute(delete(GameAvailability))
+    result = await db_session.execute(
+        insert(GameAvailability).from_select(
+            ["game_id", "available_accounts"], counts
+        )
+    )
+    await db_session.commit()
+    return result.rowcount
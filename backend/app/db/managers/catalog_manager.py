@@ -0,0 +1,130 @@
+import re
+from enum import Enum
+from typing import AsyncIterator, Dict, List, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.managers.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.db.models import (Feedback, Game, GameChangeRequest,
+                           GameChangeRequestStatus, Order)
+
+DEFAULT_FULLTEXT_SEARCH_LIMIT = 20
+STREAM_BATCH_SIZE = 1000
+
+_fulltext_word_re = re.compile(r"\w+")
+
+
+class FullTextSearchMode(str, Enum):
+    NATURAL_LANGUAGE = "natural_language"
+    BOOLEAN = "boolean"
+
+
+def to_boolean_query(term: str) -> str:
+    # Every word is required and prefix matched; user input never reaches
+    # the boolean operators (+ - < > ( ) ~ * " @) unescaped
+    return " ".join(f"+{word}*" for word in _fulltext_word_re.findall(term))
+
+
+async def get_game_search_rows(
+    db_session: AsyncSession,
+) -> List[Tuple[int, str, str | None]]:
+    rows = await db_session.execute(select(Game.id, Game.title, Game.genre))
+    return [(game_id, title, genre) for game_id, title, genre in rows]
+
+
+async def get_game_popularity(db_session: AsyncSession) -> Dict[int, int]:
+    rows = await db_session.execute(
+        select(Order.game_id, func.count(Order.id)).group_by(Order.game_id)
+    )
+    return {game_id: orders_count for game_id, orders_count in rows}
+
+
+async def get_catalog_games(db_session: AsyncSession) -> List[Game]:
+    # same order as get_games_page, newest first
+    stmt = select(Game).order_by(Game.date_created.desc(), Game.id.desc())
+    return list((await db_session.scalars(stmt)).all())
+
+
+async def get_games_page(
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Game], str | None]:
+    return await paginate(
+        db_session, select(Game), Game.date_created, Game.id, cursor, limit
+    )
+
+
+async def get_game_feedbacks(
+    db_session: AsyncSession,
+    game_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Feedback], str | None]:
+    return await paginate(
+        db_session,
+        select(Feedback).where(Feedback.game_id == game_id),
+        Feedback.date_created,
+        Feedback.id,
+        cursor,
+        limit,
+    )
+
+
+async def search_games_fulltext(
+    db_session: AsyncSession,
+    term: str,
+    mode: FullTextSearchMode = FullTextSearchMode.NATURAL_LANGUAGE,
+    limit: int = DEFAULT_FULLTEXT_SEARCH_LIMIT,
+) -> List[Game]:
+    if mode == FullTextSearchMode.BOOLEAN:
+        term = to_boolean_query(term)
+        if not term:
+            return []
+        relevance = match(Game.title, Game.description, against=term).in_boolean_mode()
+    else:
+        relevance = match(
+            Game.title, Game.description, against=term
+        ).in_natural_language_mode()
+
+    stmt = select(Game).where(relevance).order_by(relevance.desc()).limit(limit)
+    return list((await db_session.scalars(stmt)).all())
+
+
+async def iter_referenced_image_urls(db_session: AsyncSession) -> AsyncIterator[str]:
+    # server-side cursors, so memory does not grow with the size of the tables
+    game_urls = await db_session.stream_scalars(
+        select(Game.game_img_url).execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async for url in game_urls:
+        if url:
+            yield url
+
+    pending_changes = await db_session.stream_scalars(
+        select(GameChangeRequest.changes)
+        .where(GameChangeRequest.status == GameChangeRequestStatus.PENDING)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async for changes in pending_changes:
+        url = (changes or {}).get("game_img_url")
+        if url:
+            yield url
+
+
+async def get_referenced_image_urls(
+    db_session: AsyncSession, urls: List[str]
+) -> Set[str]:
+    """The subset of ``urls`` a game or a pending change request refers to."""
+    game_urls = await db_session.scalars(
+        select(Game.game_img_url).where(Game.game_img_url.in_(urls))
+    )
+    pending_url = GameChangeRequest.changes["game_img_url"].as_string()
+    pending_urls = await db_session.scalars(
+        select(pending_url).where(
+            GameChangeRequest.status == GameChangeRequestStatus.PENDING,
+            pending_url.in_(urls),
+        )
+    )
+    return set(game_urls.all()) | set(pending_urls.all())
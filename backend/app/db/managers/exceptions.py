@@ -17,3 +17,6 @@ class GameAlreadyExistsForThisAccount(Exception): ...
 
 
 class RatingValueError(Exception): ...
+
+
+class InvalidCursor(Exception): ...
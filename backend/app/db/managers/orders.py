@@ -1,8 +1,9 @@
-from typing import List
+from typing import List, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.managers.pagination import DEFAULT_PAGE_SIZE, paginate
 from app.db.models import Order
 
 
@@ -12,12 +13,17 @@ async def add_order(db_session: AsyncSession, order: Order) -> Order:
     return order
 
 
-async def get_orders_by_user_id(db_session: AsyncSession, user_id: int) -> List[Order]:
-    orders = list(
-        (
-            await db_session.scalars(
-                select(Order).where(Order.user_id == user_id).limit(10)
-            )
-        ).all()
-    )  # add offset later
-    return orders
+async def get_orders_by_user_id(
+    db_session: AsyncSession,
+    user_id: int,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Order], str | None]:
+    return await paginate(
+        db_session,
+        select(Order).where(Order.user_id == user_id),
+        Order.order_date,
+        Order.id,
+        cursor=cursor,
+        limit=limit,
+    )
@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.db.managers.exceptions import InvalidCursor
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+_DATETIME_TAG = "dt"
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        raw = [_DATETIME_TAG, sort_value.isoformat(), row_id]
+    else:
+        raw = [None, sort_value, row_id]
+    return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_type: type | None = None) -> Tuple[Any, int]:
+    try:
+        tag, sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor))
+        if tag == _DATETIME_TAG:
+            sort_value = datetime.fromisoformat(sort_value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor() from e
+
+    if not isinstance(row_id, int):
+        raise InvalidCursor()
+    # a cursor minted for another column must not reach the comparison
+    if sort_type is not None and not isinstance(sort_value, sort_type):
+        raise InvalidCursor()
+    return sort_value, row_id
+
+
+def column_python_type(column: InstrumentedAttribute) -> type | None:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def apply_keyset(
+    stmt: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int,
+    descending: bool = True,
+) -> Select:
+    # (sort_key, id) is unique, so "rows after the cursor" is an index range scan
+    # instead of an OFFSET that has to walk every skipped row
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor, column_python_type(sort_column))
+        if descending:
+            stmt = stmt.where(
+                or_(
+                    sort_column < sort_value,
+                    and_(sort_column == sort_value, id_column < row_id),
+                )
+            )
+        else:
+            stmt = stmt.where(
+                or_(
+                    sort_column > sort_value,
+                    and_(sort_column == sort_value, id_column > row_id),
+                )
+            )
+
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+
+    # one extra row tells whether there is a next page without a COUNT query
+    return stmt.limit(limit + 1)
+
+
+async def paginate(
+    db_session: AsyncSession,
+    stmt: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+) -> Tuple[List[Any], str | None]:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    stmt = apply_keyset(stmt, sort_column, id_column, cursor, limit, descending)
+    items = list((await db_session.scalars(stmt)).all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return items, next_cursor
@@ -0,0 +1,81 @@
+from typing import Dict, List
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.managers.exceptions import RatingValueError
+from app.db.models import Feedback, GameRatingStats
+
+MIN_RATING = 1
+MAX_RATING = 5
+
+
+def _bucket(rating: int) -> str:
+    return f"rating_{rating}"
+
+
+async def apply_rating(db_session: AsyncSession, game_id: int, rating: int):
+    # Single-statement upsert, so concurrent feedback for one game never loses
+    # an increment and the first rating creates the row
+    bucket = getattr(GameRatingStats, _bucket(rating))
+    stmt = (
+        insert(GameRatingStats)
+        .values(
+            game_id=game_id, ratings_count=1, ratings_sum=rating, **{_bucket(rating): 1}
+        )
+        .on_duplicate_key_update(
+            {
+                "ratings_count": GameRatingStats.ratings_count + 1,
+                "ratings_sum": GameRatingStats.ratings_sum + rating,
+                _bucket(rating): bucket + 1,
+            }
+        )
+    )
+    await db_session.execute(stmt)
+
+
+async def add_feedback(db_session: AsyncSession, feedback: Feedback) -> Feedback:
+    if not MIN_RATING <= feedback.rating <= MAX_RATING:
+        raise RatingValueError()
+
+    db_session.add(feedback)
+    await apply_rating(db_session, feedback.game_id, feedback.rating)
+    await db_session.commit()
+    return feedback
+
+
+async def get_rating_stats(
+    db_session: AsyncSession, game_ids: List[int]
+) -> Dict[int, GameRatingStats]:
+    stats = await db_session.scalars(
+        select(GameRatingStats).where(GameRatingStats.game_id.in_(game_ids))
+    )
+    return {game_stats.game_id: game_stats for game_stats in stats}
+
+
+async def rebuild_rating_stats(db_session: AsyncSession) -> int:
+    aggregates = select(
+        Feedback.game_id,
+        func.count(Feedback.id),
+        func.sum(Feedback.rating),
+        *(
+            func.sum(case((Feedback.rating == rating, 1), else_=0))
+            for rating in range(MIN_RATING, MAX_RATING + 1)
+        ),
+    ).group_by(Feedback.game_id)
+
+    await db_session.execute(delete(GameRatingStats))
+    result = await db_session.execute(
+        insert(GameRatingStats).from_select(
+            [
+                "game_id",
+                "ratings_count",
+                "ratings_sum",
+                *(_bucket(rating) for rating in range(MIN_RATING, MAX_RATING + 1)),
+            ],
+            aggregates,
+        )
+    )
+    await db_session.commit()
+    return result.rowcount
@@ -3,7 +3,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import DECIMAL, JSON, VARCHAR, BigInteger, ForeignKey
+from sqlalchemy import DECIMAL, JSON, VARCHAR, BigInteger, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.mysql import TINYINT
 
@@ -63,6 +63,15 @@ class GameChangeRequest(Base):
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        Index("ix_games_date_created_id", "date_created", "id"),
+        Index(
+            "ft_games_title_description",
+            "title",
+            "description",
+            mysql_prefix="FULLTEXT",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(VARCHAR(128))
@@ -90,6 +99,9 @@ class Game(Base):
 
 class Feedback(Base):
     __tablename__ = "feedback"
+    __table_args__ = (
+        Index("ix_feedback_game_id_date_created_id", "game_id", "date_created", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -106,6 +118,22 @@ class Feedback(Base):
     game: Mapped["Game"] = relationship("Game", back_populates="feedbacks")
 
 
+class GameRatingStats(Base):
+    __tablename__ = "game_rating_stats"
+
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), primary_key=True)
+    ratings_count: Mapped[int] = mapped_column(insert_default=0)
+    ratings_sum: Mapped[int] = mapped_column(insert_default=0)
+    # histogram of the five star buckets
+    rating_1: Mapped[int] = mapped_column(insert_default=0)
+    rating_2: Mapped[int] = mapped_column(insert_default=0)
+    rating_3: Mapped[int] = mapped_column(insert_default=0)
+    rating_4: Mapped[int] = mapped_column(insert_default=0)
+    rating_5: Mapped[int] = mapped_column(insert_default=0)
+
+    game: Mapped["Game"] = relationship("Game")
+
+
 class RentalStatus(Enum):  # nado?
     ACTIVE = "active"
     PENDING = "pending"
@@ -148,6 +176,16 @@ class GameAccountGame(Base):
     game: Mapped["Game"] = relationship("Game", back_populates="game_accounts")
 
 
+class GameAvailability(Base):
+    __tablename__ = "game_availability"
+
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), primary_key=True)
+    # number of game_account_games rows with available_status = True
+    available_accounts: Mapped[int] = mapped_column(insert_default=0)
+
+    game: Mapped["Game"] = relationship("Game")
+
+
 class GameAccount(Base):
     __tablename__ = "game_accounts"
 
@@ -165,6 +203,9 @@ class GameAccount(Base):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_id_order_date_id", "user_id", "order_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 
 class FeedbackBase(BaseModel):
@@ -14,3 +14,23 @@ class FeedbackBase(BaseModel):
 class FeedbackResponseModel(FeedbackBase):
     username: str
     date_created: datetime
+
+
+class RatingStatsResponseModel(BaseModel):
+    ratings_count: int
+    ratings_sum: int
+    rating_1: int
+    rating_2: int
+    rating_3: int
+    rating_4: int
+    rating_5: int
+
+    class Config:
+        from_attributes = True
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def average_rating(self) -> float | None:
+        if not self.ratings_count:
+            return None
+        return round(self.ratings_sum / self.ratings_count, 2)
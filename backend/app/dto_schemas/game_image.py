@@ -0,0 +1,30 @@
+from typing import Dict, Literal
+
+from pydantic import BaseModel, Field
+
+ImageContentType = Literal["image/jpeg", "image/png", "image/webp"]
+
+
+class GameImageVariants(BaseModel):
+    thumbnail: str
+    card: str
+    full: str
+
+
+class ImageUploadRequest(BaseModel):
+    content_type: ImageContentType
+    size: int = Field(gt=0)
+
+
+class PresignedImageUpload(BaseModel):
+    key: str
+    game_img_url: str
+    url: str
+    fields: Dict[str, str]
+
+
+class StoredImage(BaseModel):
+    key: str
+    game_img_url: str
+    variants: GameImageVariants
+    deduplicated: bool
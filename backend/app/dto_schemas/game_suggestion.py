@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class GameSuggestion(BaseModel):
+    id: int
+    title: str
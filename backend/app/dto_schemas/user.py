@@ -65,3 +65,19 @@ class UserRoleResponseModel(UserResponseModel):
 
     class Config:
         from_attributes = True
+
+
+class UserSnapshot(BaseModel):
+    # cached identity, deliberately without the password hash
+    id: int
+    ukey: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    username: Optional[str] = None
+    email: EmailStr
+    role: Roles
+    mfa_enabled: bool
+    temporary: bool
+
+    class Config:
+        from_attributes = True
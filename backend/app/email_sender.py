@@ -1,11 +1,16 @@
+import json
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Protocol
+from typing import AsyncGenerator, Protocol
 
 import aiosmtplib
+from redis.asyncio import Redis
 
+from app.redis_cache import get_redis
 from app.settings import settings
 
+EMAIL_OUTBOX_KEY = "email_outbox"
+
 
 class EmailSender(Protocol):
     async def connect(self): ...
@@ -62,7 +67,11 @@ class GmailEmailSender:
 
     async def close(self):
         if self.smtp.is_connected:
-            await self.smtp.quit()
+            try:
+                await self.smtp.quit()
+            except aiosmtplib.SMTPException:
+                # the connection is already broken, drop it without the QUIT
+                self.smtp.close()
 
 
 class MockEmailSender:
@@ -83,23 +92,47 @@ class MockEmailSender:
     async def close(self): ...
 
 
-_email_sender: EmailSender | None = None
+class OutboxEmailSender:
+    """
+    Queues messages in a Redis stream instead of talking SMTP, the outbox
+    worker delivers them over its own long-lived connections.
+    """
+
+    def __init__(self, redis_client: Redis):
+        self.redis_client = redis_client
+
+    async def connect(self): ...
+
+    async def send_message(
+        self,
+        subject: str,
+        text: str,
+        to: list[str],
+        cc: list[str] | None = None,
+        text_type: str = "plain",
+    ):
+        message = {
+            "subject": subject,
+            "text": text,
+            "to": to,
+            "cc": cc,
+            "text_type": text_type,
+        }
+        await self.redis_client.xadd(EMAIL_OUTBOX_KEY, {"message": json.dumps(message)})
+
+    async def close(self): ...
+
 
+def create_email_sender() -> EmailSender:
+    if not settings.email_sender.user:
+        return MockEmailSender()
+    return GmailEmailSender(
+        host=settings.email_sender.host,
+        port=settings.email_sender.port,
+        user=settings.email_sender.user,
+        password=settings.email_sender.password,
+    )
 
-async def get_email_sender() -> EmailSender:
-    global _email_sender
 
-    if _email_sender is None:
-        if not settings.email_sender.user:
-            _email_sender = MockEmailSender()
-        _email_sender = GmailEmailSender(
-            host=settings.email_sender.host,
-            port=settings.email_sender.port,
-            user=settings.email_sender.user,
-            password=settings.email_sender.password,
-        )
-    try:
-        yield _email_sender
-    finally:
-        if _email_sender:
-            await _email_sender.close()
+async def get_email_sender() -> AsyncGenerator[EmailSender, None]:
+    yield OutboxEmailSender(get_redis())
@@ -1,5 +1,7 @@
+import asyncio
 import time
 import uuid
+from contextlib import asynccontextmanager
 from typing import Callable
 
 import uvicorn
@@ -10,19 +12,73 @@ from starlette.responses import JSONResponse
 
 from app.api.admin import admins_router
 from app.api.auth_flow import login_router, register_router
+from app.api.catalog import catalog_router
+from app.api.common import NEXT_CURSOR_HEADER
 from app.api.game import games_router
 from app.api.game_account import game_accounts_router, steam_guard_router
+from app.api.images import images_router
 from app.api.purchases import payment_router, rental_router
+from app.api.responses import FastJSONResponse
 from app.api.user import users_router
+from app.business_logic.catalog_cache import get_catalog_version
+from app.business_logic.catalog_snapshot import (load_catalog_snapshot,
+                                                 poll_catalog_snapshot)
+from app.business_logic.email_outbox import poll_email_outbox
 from app.business_logic.exceptions import (AuthenticationError,
-                                           AuthorizationError)
+                                           AuthorizationError,
+                                           ImageNotUploaded, LoginRateLimited,
+                                           PasswordHasherSaturated)
+from app.business_logic.image_cache import image_cache
+from app.business_logic.image_deletion import poll_image_deletions
+from app.business_logic.images import shutdown_image_pool
+from app.business_logic.password_hasher import (load_password_hash_cost,
+                                                password_hasher)
+from app.business_logic.search_index import load_game_search_index
+from app.db import async_session
 from app.logger import logger
+from app.redis_cache import get_redis
+from app.s3 import s3_client_manager
+from app.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await s3_client_manager.start()
+    image_cache.load()
+    if settings.auth.password_hash_budget:
+        await load_password_hash_cost(
+            get_redis(),
+            settings.auth.password_hash_budget,
+            settings.auth.password_hash_min_cost,
+            settings.auth.password_hash_max_cost,
+        )
+    catalog_version = await get_catalog_version(get_redis())
+    async with async_session() as session:
+        await load_game_search_index(session, catalog_version)
+        # serve the catalog from the first request on, not after the first poll
+        await load_catalog_snapshot(session, catalog_version)
+    catalog_snapshot_poller = asyncio.create_task(
+        poll_catalog_snapshot(get_redis(), async_session)
+    )
+    image_deletion_worker = asyncio.create_task(
+        poll_image_deletions(get_redis(), async_session)
+    )
+    email_outbox_worker = asyncio.create_task(poll_email_outbox(get_redis()))
+    yield
+    catalog_snapshot_poller.cancel()
+    image_deletion_worker.cancel()
+    email_outbox_worker.cancel()
+    shutdown_image_pool()
+    password_hasher.shutdown()
+    await s3_client_manager.close()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 api_v1 = APIRouter(prefix="/api/v1")
 api_v1.include_router(login_router)
 api_v1.include_router(register_router)
+api_v1.include_router(catalog_router)
 api_v1.include_router(games_router)
 api_v1.include_router(users_router)
 api_v1.include_router(admins_router)
@@ -30,6 +86,7 @@ api_v1.include_router(game_accounts_router)
 api_v1.include_router(rental_router)
 api_v1.include_router(payment_router)
 api_v1.include_router(steam_guard_router)
+api_v1.include_router(images_router)
 
 app.include_router(api_v1)
 
@@ -41,7 +98,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-MFA-Required"],
+    expose_headers=["X-MFA-Required", NEXT_CURSOR_HEADER],
 )
 
 
@@ -81,6 +138,35 @@ async def http_exception_handler(request: Request, exc: AuthorizationError):
     )
 
 
+@app.exception_handler(ImageNotUploaded)
+async def http_exception_handler(request: Request, exc: ImageNotUploaded):
+    logger.info("got ImageNotUploaded exception", req_id=getattr(request, "req_id", None))  # type: ignore
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Image is not uploaded or does not meet the upload constraints.",
+    )
+
+
+@app.exception_handler(PasswordHasherSaturated)
+async def http_exception_handler(request: Request, exc: PasswordHasherSaturated):
+    logger.info("got PasswordHasherSaturated exception", req_id=getattr(request, "req_id", None))  # type: ignore
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, try again later.",
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(LoginRateLimited)
+async def http_exception_handler(request: Request, exc: LoginRateLimited):
+    logger.info("got LoginRateLimited exception", req_id=getattr(request, "req_id", None))  # type: ignore
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, try again later.",
+        headers={"Retry-After": str(exc.args[0])},
+    )
+
+
 @app.exception_handler(Exception)
 async def http_exception_handler(request: Request, exc: Exception):
     logger.opt(exception=exc).info("got unexpected exception", req_id=getattr(request, "req_id", None))  # type: ignore
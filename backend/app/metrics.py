@@ -0,0 +1,77 @@
+"""
+In-process metrics registry.
+
+Every gunicorn worker keeps its own numbers; ``snapshot`` is what the admin
+metrics endpoint returns for the worker that served the request.
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Histogram:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def to_dict(self) -> dict:
+        labels = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+_counters: Dict[str, Counter] = {}
+_histograms: Dict[str, Histogram] = {}
+_gauges: Dict[str, Callable[[], dict]] = {}
+
+
+def counter(name: str) -> Counter:
+    return _counters.setdefault(name, Counter())
+
+
+def histogram(name: str) -> Histogram:
+    return _histograms.setdefault(name, Histogram())
+
+
+def register_gauge(name: str, collect: Callable[[], dict]):
+    _gauges[name] = collect
+
+
+def snapshot() -> dict:
+    return {
+        "counters": {name: metric.value for name, metric in _counters.items()},
+        "histograms": {name: metric.to_dict() for name, metric in _histograms.items()},
+        "gauges": {name: collect() for name, collect in _gauges.items()},
+    }
@@ -1,13 +1,15 @@
-from typing import AsyncGenerator
+import hashlib
+from typing import AsyncGenerator, Sequence
 
 from redis import asyncio as aioredis
+from redis.exceptions import NoScriptError
 
 from app.settings import settings
 
 redis: aioredis.Redis | None = None
 
 
-async def get_redis_client() -> AsyncGenerator[aioredis.Redis, None]:
+def get_redis() -> aioredis.Redis:
     global redis
 
     if redis is None:
@@ -16,4 +18,25 @@ async def get_redis_client() -> AsyncGenerator[aioredis.Redis, None]:
             port=settings.redis.port,
             password=settings.redis.password
         )
-    yield redis
+    return redis
+
+
+async def get_redis_client() -> AsyncGenerator[aioredis.Redis, None]:
+    yield get_redis()
+
+
+class ServerScript:
+    """Lua script sent once per Redis server, then invoked by its SHA1."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
+    async def __call__(
+        self, redis_client: aioredis.Redis, keys: Sequence[str], args: Sequence
+    ):
+        try:
+            return await redis_client.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            # first call on this server, or its script cache was flushed
+            return await redis_client.eval(self.source, len(keys), *keys, *args)
@@ -1,13 +1,238 @@
-from typing import AsyncGenerator
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from typing import AsyncGenerator, AsyncIterator
 
 import aioboto3
+from aiobotocore.config import AioConfig
+from botocore import xform_name
+from fastapi import UploadFile
 from types_aiobotocore_s3.client import S3Client
 
+from app.metrics import counter, histogram, register_gauge
 from app.settings import settings
 
 session = aioboto3.Session(aws_access_key_id=settings.aws.access_key_id, aws_secret_access_key=settings.aws.secret_access_key)
 
 
+def call_latency(operation: str):
+    return histogram(f"s3_{xform_name(operation)}_seconds")
+
+
+def call_errors(operation: str):
+    return counter(f"s3_{xform_name(operation)}_errors")
+
+
+class S3ClientManager:
+    """
+    One S3 client per worker, opened at startup and shared by all requests.
+
+    Client construction, endpoint resolution and TLS handshakes are paid once;
+    requests reuse the keep-alive connections of the client's pool. Every call
+    goes through the client's event hooks, which count the calls in flight
+    and record per operation latency and errors.
+    """
+
+    def __init__(self):
+        self._client: S3Client | None = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._lock = asyncio.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def client(self) -> S3Client | None:
+        return self._client
+
+    async def start(self) -> S3Client:
+        async with self._lock:
+            if self._client is None:
+                config = AioConfig(
+                    max_pool_connections=settings.aws.max_pool_connections,
+                    tcp_keepalive=True,
+                )
+                self._exit_stack = AsyncExitStack()
+                self._client = await self._exit_stack.enter_async_context(
+                    session.client(
+                        "s3",
+                        endpoint_url=settings.aws.url,
+                        region_name=settings.aws.region_name,
+                        config=config,
+                    )
+                )
+                self.register_metrics(self._client)
+            return self._client
+
+    def register_metrics(self, client: S3Client):
+        events = client.meta.events
+        events.register("before-call.s3", self._call_started)
+        events.register("after-call.s3", self._call_finished)
+        events.register("after-call-error.s3", self._call_failed)
+
+    def _call_started(self, context: dict, **_):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        context["metrics_started"] = time.perf_counter()
+
+    def _call_ended(self, event_name: str, context: dict) -> str:
+        operation = event_name.rsplit(".", 1)[-1]
+        started = context.pop("metrics_started", None)
+        if started is not None:
+            self.in_flight -= 1
+            call_latency(operation).observe(time.perf_counter() - started)
+        return operation
+
+    def _call_finished(self, event_name: str, http_response, context: dict, **_):
+        operation = self._call_ended(event_name, context)
+        if http_response.status_code >= 300:
+            call_errors(operation).inc()
+
+    def _call_failed(self, event_name: str, context: dict, **_):
+        # connection errors and timeouts, S3 never answered
+        call_errors(self._call_ended(event_name, context)).inc()
+
+    async def close(self):
+        async with self._lock:
+            if self._exit_stack is not None:
+                await self._exit_stack.aclose()
+            self._client = None
+            self._exit_stack = None
+
+    def pool_stats(self) -> dict:
+        # every call in flight holds one pooled connection, aiohttp's own
+        # connector internals are private and change between releases
+        return {
+            "started": self._client is not None,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "max_pool_connections": settings.aws.max_pool_connections,
+        }
+
+
+s3_client_manager = S3ClientManager()
+
+register_gauge("s3_pool", s3_client_manager.pool_stats)
+
+
 async def get_s3_client() -> AsyncGenerator[S3Client, None]:
-    async with session.client("s3", endpoint_url=settings.aws.url, region_name=settings.aws.region_name) as s3:
-        yield s3
+    yield s3_client_manager.client or await s3_client_manager.start()
+
+
+async def iter_upload_file(
+    file: UploadFile, chunk_size: int = 1024 * 1024
+) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def read_part(
+    chunks: AsyncIterator[bytes], buffer: bytearray, part_size: int
+) -> bool:
+    """Fill ``buffer`` up to ``part_size``, returns False once the stream ended."""
+    async for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= part_size:
+            return True
+    return False
+
+
+async def put_object(
+    s3_client: S3Client, key: str, body: bytes, extra_args: dict
+) -> int:
+    await s3_client.put_object(
+        Bucket=settings.aws.bucket_name, Key=key, Body=body, **extra_args
+    )
+    return len(body)
+
+
+async def multipart_upload(
+    s3_client: S3Client,
+    key: str,
+    buffer: bytearray,
+    chunks: AsyncIterator[bytes],
+    extra_args: dict,
+    part_size: int,
+    concurrency: int,
+) -> int:
+    upload = await s3_client.create_multipart_upload(
+        Bucket=settings.aws.bucket_name, Key=key, **extra_args
+    )
+    upload_id = upload["UploadId"]
+    slots = asyncio.Semaphore(concurrency)
+    tasks: list[asyncio.Task] = []
+    total_size = 0
+
+    async def upload_part(part_number: int, body: bytes) -> dict:
+        try:
+            part = await s3_client.upload_part(
+                Bucket=settings.aws.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            return {"PartNumber": part_number, "ETag": part["ETag"]}
+        finally:
+            slots.release()
+
+    async def submit(body: bytes):
+        nonlocal total_size
+        # waits here while `concurrency` parts are in flight, which stops
+        # reading from the request stream until a slot frees up
+        await slots.acquire()
+        total_size += len(body)
+        tasks.append(asyncio.create_task(upload_part(len(tasks) + 1, body)))
+
+    try:
+        more = True
+        while more:
+            while len(buffer) >= part_size:
+                await submit(bytes(buffer[:part_size]))
+                del buffer[:part_size]
+            more = await read_part(chunks, buffer, part_size)
+        if buffer:
+            await submit(bytes(buffer))
+
+        parts = await asyncio.gather(*tasks)
+        await s3_client.complete_multipart_upload(
+            Bucket=settings.aws.bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": list(parts)},
+        )
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await s3_client.abort_multipart_upload(
+            Bucket=settings.aws.bucket_name, Key=key, UploadId=upload_id
+        )
+        raise
+    return total_size
+
+
+async def stream_upload(
+    s3_client: S3Client,
+    key: str,
+    chunks: AsyncIterator[bytes],
+    content_type: str | None = None,
+    part_size: int | None = None,
+    concurrency: int | None = None,
+) -> int:
+    """
+    Upload an async byte stream to S3 in fixed-size multipart parts.
+
+    At most ``concurrency`` parts are in flight plus the one being filled, so
+    peak memory is bounded by ``(concurrency + 1) * part_size`` whatever the
+    object size. Returns the number of bytes uploaded.
+    """
+    part_size = part_size or settings.aws.upload_part_size
+    concurrency = concurrency or settings.aws.upload_concurrency
+    extra_args = {"ContentType": content_type} if content_type else {}
+
+    buffer = bytearray()
+    if not await read_part(chunks, buffer, part_size):
+        # small object: one PUT is cheaper than a three-call multipart upload
+        return await put_object(s3_client, key, bytes(buffer), extra_args)
+    return await multipart_upload(
+        s3_client, key, buffer, chunks, extra_args, part_size, concurrency
+    )
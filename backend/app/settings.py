@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic.utils import deep_update
 from yaml import safe_load
 
@@ -38,6 +38,16 @@ class AwsSettings(BaseModel):
     secret_access_key: str
     bucket_name: str
     region_name: str
+    # S3 rejects multipart parts below 5 MiB (except the last one)
+    upload_part_size: int = Field(default=8 * 1024 * 1024, ge=5 * 1024 * 1024)
+    upload_concurrency: int = Field(default=4, ge=1)
+    max_image_size: int = 10 * 1024 * 1024
+    presigned_upload_expire: int = 300  # in seconds
+    max_pool_connections: int = 50
+    image_cache_dir: str = "/tmp/gameshop-image-cache"
+    image_cache_size: int = 512 * 1024 * 1024  # shared by the workers of a host
+    # Pillow process pool, defaults to this worker's share of the host CPUs
+    image_workers: int | None = Field(default=None, ge=1)
 
 
 class RedisSettings(BaseModel):
@@ -51,6 +61,8 @@ class EmailSenderSettings(BaseModel):
     port: int
     user: str
     password: str
+    # authenticated SMTP connections kept open by the outbox worker
+    pool_size: int = Field(default=2, ge=1)
 
 
 class StripeSettings(BaseModel):
@@ -59,6 +71,22 @@ class StripeSettings(BaseModel):
 
 class AuthSettings(BaseModel):
     secret: str
+    # bcrypt process pool, defaults to this worker's share of the host CPUs
+    # (cpu_count // web_concurrency) and 4 calls per process
+    password_hash_workers: int | None = None
+    password_hash_max_pending: int | None = None
+    # bcrypt cost used until startup calibration picks the highest one hashing
+    # within password_hash_budget seconds, no budget keeps it fixed
+    password_hash_cost: int = Field(default=12, ge=4, le=31)
+    password_hash_budget: float | None = 0.25
+    password_hash_min_cost: int = Field(default=12, ge=4, le=31)
+    password_hash_max_cost: int = Field(default=16, ge=4, le=31)
+    token_cache_size: int = 10000
+    # login attempts admitted per sliding window of login_window seconds
+    login_window: int = Field(default=60, ge=1)
+    login_ip_limit: int = Field(default=20, ge=1)
+    login_email_limit: int = Field(default=10, ge=1)
+    login_global_limit: int = Field(default=1000, ge=1)
 
 
 class FrontendSettings(BaseModel):
@@ -73,6 +101,11 @@ class Settings(BaseModel):
     stripe: StripeSettings
     auth: AuthSettings
     aws: AwsSettings
+    # worker processes gunicorn runs on this host (it reads the same variable
+    # for its default), CPU bound process pools split the host's CPUs by it
+    web_concurrency: int = Field(
+        default_factory=lambda: int(os.environ.get("WEB_CONCURRENCY", 1)), ge=1
+    )
 
 
 def config_file_settings() -> dict[str, Any]:
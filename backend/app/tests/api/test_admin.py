@@ -1,6 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.main import app  # Import FastAPI app instance
 from app.dto_schemas.game_change_request import GameChangeRequestResponseModel
 from app.dto_schemas.user import UserRolePatch
@@ -21,11 +21,14 @@ async def test_patch_user_role():
         return_value={"id": 1, "role": Roles.USER})
     mock_update_role_by_email = MagicMock(
         return_value={"id": 1, "role": Roles.ADMIN})
+    mock_invalidate_user_snapshot = AsyncMock()
 
     # Patch the dependencies
     with patch("app.api.admin.get_user_by_email", mock_get_user_by_email), \
             patch("app.api.admin.update_role_by_email",
-                  mock_update_role_by_email):
+                  mock_update_role_by_email), \
+            patch("app.api.admin.invalidate_user_snapshot",
+                  mock_invalidate_user_snapshot):
         # Create a valid UserRolePatch request body
         user_role_patch = UserRolePatch(email="testuser@example.com",
                                         role=Roles.ADMIN)
@@ -39,6 +42,7 @@ async def test_patch_user_role():
         # Ensure the response is as expected
         assert response.status_code == 200
         assert response.json()["role"] == "admin"
+        mock_invalidate_user_snapshot.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -46,13 +50,15 @@ async def test_confirm_game_change_request():
     # Mock dependencies
     mock_approve_game_change_request = MagicMock(
         return_value=("game", "old_game"))
-    mock_delete_s3_object = MagicMock()
+    mock_release_image = AsyncMock()
+    mock_bump_catalog_version = AsyncMock()
 
     # Patch the dependencies
     with patch("app.api.admin.approve_game_change_request",
                mock_approve_game_change_request), \
-            patch("app.api.admin.S3Client.delete_object",
-                  mock_delete_s3_object):
+            patch("app.api.admin.release_image", mock_release_image), \
+            patch("app.api.admin.bump_catalog_version",
+                  mock_bump_catalog_version):
         # Send the POST request to approve a game change request
         response = client.post(
             "/admins/me/moderator-requests/1/approve",
@@ -69,13 +75,12 @@ async def test_reject_game_change_request():
     # Mock dependencies
     mock_disapprove_game_change_request = MagicMock(
         return_value={"id": 1, "changes": {"game_img_url": "image_url"}})
-    mock_delete_s3_object = MagicMock()
+    mock_release_image = AsyncMock()
 
     # Patch the dependencies
     with patch("app.api.admin.disapprove_game_change_request",
                mock_disapprove_game_change_request), \
-            patch("app.api.admin.S3Client.delete_object",
-                  mock_delete_s3_object):
+            patch("app.api.admin.release_image", mock_release_image):
         # Send the POST request to reject a game change request
         response = client.post(
             "/admins/me/moderator-requests/1/disapprove",
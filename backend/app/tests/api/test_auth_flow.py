@@ -1,11 +1,13 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.main import app  # FastAPI app instance
 from app.dto_schemas.auth import Token, TokenType, Roles
 from app.dto_schemas.user import UserCreate, UserLogin, EmailOnlyUser
 from app.db.models import User
 from app.business_logic.auth import verify_password
+from app.business_logic.exceptions import LoginRateLimited, \
+    PasswordHasherSaturated
 from app.db.managers.exceptions import UserNotFound
 from app.business_logic.auth import create_access_token
 
@@ -19,17 +21,18 @@ async def test_login_success():
     mock_get_user_by_email = MagicMock(
         return_value=User(id=1, email="test@example.com",
                           hashed_password="hashed_password", mfa_enabled=True))
-    mock_verify_password = MagicMock(return_value=True)
+    mock_verify_password = AsyncMock(return_value=True)
     mock_generate_random_mfa_code = MagicMock(return_value="123456")
-    mock_redis_set = MagicMock()
+    mock_redis_evalsha = AsyncMock(return_value=1)
 
     # Patch the dependencies
     with patch("app.api.auth_flow.get_user_by_email", mock_get_user_by_email), \
             patch("app.api.auth_flow.verify_password", mock_verify_password), \
+            patch("app.api.auth_flow.admit_login", AsyncMock()), \
             patch("app.api.auth_flow.generate_random_mfa_code",
                   mock_generate_random_mfa_code), \
             patch("app.api.auth_flow.get_redis_client",
-                  MagicMock(setex=mock_redis_set)):
+                  MagicMock(evalsha=mock_redis_evalsha)):
         # Create a valid UserLogin request body
         user_login = UserLogin(email="test@example.com", password="password")
 
@@ -42,16 +45,47 @@ async def test_login_success():
         assert "access_token" in response.json()
 
 
+@pytest.mark.asyncio
+async def test_login_upgrades_password_hash():
+    # Mock the dependencies
+    user = User(id=1, email="test@example.com",
+                hashed_password="$2b$10$stale", mfa_enabled=False)
+    mock_get_user_by_email = MagicMock(return_value=user)
+    mock_verify_password = AsyncMock(return_value=True)
+    mock_upgrade_password_hash = AsyncMock(return_value="$2b$12$fresh")
+    mock_update_user = AsyncMock()
+
+    # Patch the dependencies
+    with patch("app.api.auth_flow.get_user_by_email", mock_get_user_by_email), \
+            patch("app.api.auth_flow.verify_password", mock_verify_password), \
+            patch("app.api.auth_flow.admit_login", AsyncMock()), \
+            patch("app.api.auth_flow.upgrade_password_hash",
+                  mock_upgrade_password_hash), \
+            patch("app.api.auth_flow.update_user", mock_update_user):
+        user_login = UserLogin(email="test@example.com", password="Password1!")
+
+        response = client.post("/login", json=user_login.dict())
+
+        # Ensure the stored hash was replaced with one at the current cost
+        assert response.status_code == 200
+        mock_upgrade_password_hash.assert_awaited_once_with(
+            "Password1!", "$2b$10$stale")
+        assert user.hashed_password == "$2b$12$fresh"
+        mock_update_user.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_login_invalid_credentials():
     # Mock the dependencies to simulate invalid credentials
     mock_get_user_by_email = MagicMock(return_value=None)
+    mock_admit_login = AsyncMock()
 
     # Patch the dependencies
-    with patch("app.api.auth_flow.get_user_by_email", mock_get_user_by_email):
+    with patch("app.api.auth_flow.get_user_by_email", mock_get_user_by_email), \
+            patch("app.api.auth_flow.admit_login", mock_admit_login):
         # Create a valid UserLogin request body
         user_login = UserLogin(email="invalid@example.com",
-                               password="wrongpassword")
+                               password="WrongPassword1!")
 
         # Send the POST request to login
         response = client.post("/login", json=user_login.dict())
@@ -59,6 +93,8 @@ async def test_login_invalid_credentials():
         # Ensure the response is a 400 error due to invalid credentials
         assert response.status_code == 400
         assert response.json()["detail"] == "User email or password is invalid"
+        # attempts against unknown emails count towards the limits as well
+        mock_admit_login.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -67,13 +103,13 @@ async def test_authenticate_mfa_success():
     mock_get_user_by_ukey = MagicMock(
         return_value=User(id=1, ukey="user_ukey", email="test@example.com",
                           mfa_enabled=True))
-    mock_redis_get = MagicMock(return_value="123456")
+    mock_redis_evalsha = AsyncMock(return_value=[1, b""])
     mock_create_access_token = MagicMock(return_value="new_access_token")
 
     # Patch the dependencies
     with patch("app.api.auth_flow.get_user_by_ukey", mock_get_user_by_ukey), \
             patch("app.api.auth_flow.get_redis_client",
-                  MagicMock(get=mock_redis_get)), \
+                  MagicMock(evalsha=mock_redis_evalsha)), \
             patch("app.api.auth_flow.create_access_token",
                   mock_create_access_token):
         # Create a valid MFACode request body
@@ -95,12 +131,12 @@ async def test_authenticate_mfa_invalid_code():
     mock_get_user_by_ukey = MagicMock(
         return_value=User(id=1, ukey="user_ukey", email="test@example.com",
                           mfa_enabled=True))
-    mock_redis_get = MagicMock(return_value="123456")
+    mock_redis_evalsha = AsyncMock(return_value=[-1])
 
     # Patch the dependencies
     with patch("app.api.auth_flow.get_user_by_ukey", mock_get_user_by_ukey), \
             patch("app.api.auth_flow.get_redis_client",
-                  MagicMock(get=mock_redis_get)):
+                  MagicMock(evalsha=mock_redis_evalsha)):
         # Create an invalid MFACode request body
         mfa_code = {"code": "654321"}
 
@@ -201,3 +237,54 @@ async def test_register_temp_user_exists():
         assert response.status_code == 400
         assert response.json()[
                    "detail"] == "User with such email address already exist"
+
+
+# Test for login answering 503 while the password hasher is saturated
+def test_login_password_hasher_saturated():
+    mock_get_user_by_email = MagicMock(
+        return_value=User(id=1, email="test@example.com",
+                          hashed_password="hashed_password", mfa_enabled=False))
+
+    with patch("app.api.auth_flow.get_user_by_email", mock_get_user_by_email), \
+            patch("app.api.auth_flow.admit_login", AsyncMock()), \
+            patch("app.api.auth_flow.verify_password",
+                  AsyncMock(side_effect=PasswordHasherSaturated())):
+        user_login = UserLogin(email="test@example.com", password="Password1!")
+        response = client.post("/login", json=user_login.dict())
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+# Test for login answering 429 without verifying the password when throttled
+def test_login_rate_limited():
+    mock_get_user_by_email = MagicMock(
+        return_value=User(id=1, email="test@example.com",
+                          hashed_password="hashed_password", mfa_enabled=False))
+    mock_verify_password = AsyncMock(return_value=True)
+
+    with patch("app.api.auth_flow.get_user_by_email", mock_get_user_by_email), \
+            patch("app.api.auth_flow.admit_login",
+                  AsyncMock(side_effect=LoginRateLimited(30))), \
+            patch("app.api.auth_flow.verify_password", mock_verify_password):
+        user_login = UserLogin(email="test@example.com", password="Password1!")
+        response = client.post("/login", json=user_login.dict())
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+    mock_get_user_by_email.assert_not_called()
+    mock_verify_password.assert_not_called()
+
+
+# Test for unknown emails being throttled like existing ones
+def test_login_rate_limited_unknown_email():
+    mock_get_user_by_email = MagicMock(return_value=None)
+
+    with patch("app.api.auth_flow.get_user_by_email", mock_get_user_by_email), \
+            patch("app.api.auth_flow.admit_login",
+                  AsyncMock(side_effect=LoginRateLimited(30))):
+        user_login = UserLogin(email="nobody@example.com", password="Password1!")
+        response = client.post("/login", json=user_login.dict())
+
+    assert response.status_code == 429
+    mock_get_user_by_email.assert_not_called()
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.catalog import catalog_page_response
+from app.db import get_session
+from app.main import app
+from app.redis_cache import get_redis_client
+
+client = TestClient(app)
+
+app.dependency_overrides[get_redis_client] = lambda: (yield AsyncMock())
+app.dependency_overrides[get_session] = lambda: (yield MagicMock())
+
+
+# Test for /games/suggest returning a compact, cacheable payload
+def test_suggest_games():
+    suggestions = [{"id": 2, "title": "Witchfire"}]
+
+    with patch("app.api.catalog.ensure_fresh_game_search_index", AsyncMock()), \
+            patch("app.api.catalog.game_suggester.suggest",
+                  MagicMock(return_value=suggestions)) as mock_suggest:
+        response = client.get("/api/v1/games/suggest?q=wit&k=3")
+
+    assert response.status_code == 200
+    assert response.json() == suggestions
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    assert response.headers["ETag"]
+    mock_suggest.assert_called_once_with("wit", 3)
+
+
+# Test for /games/suggest revalidation with If-None-Match
+def test_suggest_games_not_modified():
+    suggestions = [{"id": 2, "title": "Witchfire"}]
+
+    with patch("app.api.catalog.ensure_fresh_game_search_index", AsyncMock()), \
+            patch("app.api.catalog.game_suggester.suggest",
+                  MagicMock(return_value=suggestions)):
+        etag = client.get("/api/v1/games/suggest?q=wit").headers["ETag"]
+        response = client.get(
+            "/api/v1/games/suggest?q=wit", headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+# Test for /games/suggest query validation
+def test_suggest_games_invalid_k():
+    response = client.get("/api/v1/games/suggest?q=wit&k=100")
+
+    assert response.status_code == 422
+
+
+# Test for catalog pages rejecting out of range page numbers and sizes
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page, page_size", [(0, 10), (-1, 10), (1, 0), (1, 1000)])
+async def test_catalog_page_response_invalid(page, page_size):
+    with pytest.raises(HTTPException) as exc:
+        await catalog_page_response(MagicMock(), page, page_size)
+
+    assert exc.value.status_code == 422
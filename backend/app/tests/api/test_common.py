@@ -6,7 +6,9 @@ from app.main import app
 from app.api.common import AuthorizedRequest, get_token_data, get_logger, \
     generate_common_redis_key, get_id_from_common_redis_key
 from app.dto_schemas.auth import Roles, TokenData
-from app.business_logic.auth import verify_token_access
+from app.business_logic.auth import create_access_token, verify_token_access
+from app.business_logic.exceptions import AuthorizationError
+from app.business_logic.token_cache import verified_token_cache
 from app.logger import logger
 
 client = TestClient(app)
@@ -65,6 +67,34 @@ async def test_authorized_request_invalid_token():
             await authorized_request(request)
 
 
+# Test for AuthorizedRequest - verified token served from the cache
+@pytest.mark.asyncio
+async def test_authorized_request_cached_token():
+    token_data = TokenData(ukey="test_ukey", email="test@example.com",
+                           role=Roles.USER)
+    mock_verify_token_access = MagicMock(return_value=token_data)
+    token = create_access_token(token_data.ukey, token_data.email, token_data.role)
+
+    class MockRequest:
+        def __init__(self, token):
+            self.headers = {"Authorization": f"Bearer {token}"}
+
+    verified_token_cache.clear()
+    with patch("app.api.common.verify_token_access", mock_verify_token_access):
+        await AuthorizedRequest(role=Roles.USER)(MockRequest(token))
+        request = MockRequest(token)
+        await AuthorizedRequest(role=Roles.USER)(request)
+
+        # the role is still checked for a cached token
+        with pytest.raises(AuthorizationError):
+            await AuthorizedRequest(role=Roles.ADMIN)(MockRequest(token))
+
+    mock_verify_token_access.assert_called_once_with(token, role=Roles.USER,
+                                                     exact_role=False)
+    assert request.token_data == token_data
+    verified_token_cache.clear()
+
+
 # Test for get_token_data
 @pytest.mark.asyncio
 async def test_get_token_data():
@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.api.http_cache import (body_etag, conditional_body_response,
+                                conditional_response, is_not_modified,
+                                make_etag)
+
+
+def mock_request(if_none_match: str | None = None):
+    request = MagicMock()
+    request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return request
+
+
+# Test for make_etag and body_etag
+def test_make_etag():
+    assert make_etag("game", 1, 3) == '"game-1-3"'
+    assert body_etag(b"[]") == body_etag(b"[]")
+    assert body_etag(b"[]") != body_etag(b"[1]")
+
+
+# Test for is_not_modified
+def test_is_not_modified():
+    assert not is_not_modified(mock_request(), '"a"')
+    assert is_not_modified(mock_request('"a"'), '"a"')
+    assert is_not_modified(mock_request('"b", W/"a"'), '"a"')
+    assert is_not_modified(mock_request("*"), '"a"')
+    assert not is_not_modified(mock_request('"b"'), '"a"')
+
+
+# Test for conditional_response skipping the render on a match
+@pytest.mark.asyncio
+async def test_conditional_response_not_modified():
+    render = AsyncMock(return_value=b"{}")
+
+    response = await conditional_response(
+        mock_request('"game-7-2"'), '"game-7-2"', render
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"game-7-2"'
+    render.assert_not_called()
+
+
+# Test for conditional_response rendering on a miss
+@pytest.mark.asyncio
+async def test_conditional_response_modified():
+    render = AsyncMock(return_value=b"{}")
+
+    response = await conditional_response(
+        mock_request('"game-7-1"'), '"game-7-2"', render
+    )
+
+    assert response.status_code == 200
+    assert response.body == b"{}"
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+
+
+# Test for body ETags following the content of the response
+def test_conditional_body_response():
+    etag = body_etag(b'{"id":7,"title":"Old"}')
+
+    assert conditional_body_response(
+        mock_request(etag), b'{"id":7,"title":"Old"}'
+    ).status_code == 304
+    response = conditional_body_response(mock_request(etag), b'{"id":7,"title":"New"}')
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,166 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.api.http_cache import make_etag
+from app.business_logic.exceptions import InvalidImage
+from app.business_logic.image_cache import DiskImageCache
+from app.dto_schemas.auth import Roles, TokenData
+from app.main import app
+from app.s3 import get_s3_client
+
+client = TestClient(app)
+
+s3_mock = AsyncMock()
+
+
+@pytest.fixture(autouse=True)
+def override_s3_client():
+    # other api test modules override the same dependency at import time, so
+    # install ours per test and put theirs back afterwards
+    previous = app.dependency_overrides.get(get_s3_client)
+    s3_mock.reset_mock()
+    app.dependency_overrides[get_s3_client] = lambda: (yield s3_mock)
+    yield s3_mock
+    if previous is None:
+        app.dependency_overrides.pop(get_s3_client, None)
+    else:
+        app.dependency_overrides[get_s3_client] = previous
+
+
+def moderator_token():
+    return TokenData(ukey="ASDVASD12", email="mod@example.com",
+                     role=Roles.SUPPORT_MODERATOR)
+
+
+# Test for POST /images/upload-url
+def test_create_image_upload_url():
+    presigned_upload = {
+        "key": "abc.png",
+        "game_img_url": "/games/abc.png",
+        "url": "http://localstack:4566/games",
+        "fields": {"key": "abc.png", "Content-Type": "image/png"},
+    }
+
+    with patch("app.api.common.verify_token_access",
+               MagicMock(return_value=moderator_token())), \
+            patch("app.api.images.create_presigned_image_upload",
+                  AsyncMock(return_value=presigned_upload)) as mock_presign:
+        response = client.post(
+            "/api/v1/images/upload-url",
+            json={"content_type": "image/png", "size": 1024},
+            headers={"Authorization": "Bearer test_token"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == presigned_upload
+    mock_presign.assert_awaited_once_with(s3_mock, "image/png", 1024)
+
+
+# Test for POST /images/upload-url with an unsupported content type
+def test_create_image_upload_url_bad_content_type():
+    with patch("app.api.common.verify_token_access",
+               MagicMock(return_value=moderator_token())):
+        response = client.post(
+            "/api/v1/images/upload-url",
+            json={"content_type": "image/gif", "size": 1024},
+            headers={"Authorization": "Bearer test_token"},
+        )
+
+    assert response.status_code == 422
+
+
+# Test for POST /images storing the request body
+def test_upload_image():
+    stored_image = {
+        "key": "abc.png",
+        "game_img_url": "/games/abc.png",
+        "variants": {
+            "thumbnail": "/games/abc.png_thumbnail.webp",
+            "card": "/games/abc.png_card.webp",
+            "full": "/games/abc.png_full.webp",
+        },
+        "deduplicated": False,
+    }
+
+    with patch("app.api.common.verify_token_access",
+               MagicMock(return_value=moderator_token())), \
+            patch("app.api.images.store_image",
+                  AsyncMock(return_value=stored_image)) as mock_store:
+        response = client.post(
+            "/api/v1/images",
+            content=b"image",
+            headers={"Authorization": "Bearer test_token",
+                     "Content-Type": "image/png"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == stored_image
+    assert mock_store.call_args.args[3] == "image/png"
+
+
+# Test for POST /images with an unsupported content type
+def test_upload_image_bad_content_type():
+    with patch("app.api.common.verify_token_access",
+               MagicMock(return_value=moderator_token())):
+        response = client.post(
+            "/api/v1/images",
+            content=b"image",
+            headers={"Authorization": "Bearer test_token",
+                     "Content-Type": "image/gif"},
+        )
+
+    assert response.status_code == 415
+
+
+# Test for POST /images with a body that is not the declared image type
+def test_upload_image_invalid():
+    with patch("app.api.common.verify_token_access",
+               MagicMock(return_value=moderator_token())), \
+            patch("app.api.images.store_image",
+                  AsyncMock(side_effect=InvalidImage())):
+        response = client.post(
+            "/api/v1/images",
+            content=b"image",
+            headers={"Authorization": "Bearer test_token",
+                     "Content-Type": "image/png"},
+        )
+
+    assert response.status_code == 400
+
+
+# Test for GET /images/{key} served from the disk cache
+def test_get_image_cached(tmp_path):
+    cache = DiskImageCache(str(tmp_path), max_size=100)
+    (tmp_path / "abc.png").write_bytes(b"0123456789")
+    cache.load()
+
+    with patch("app.api.images.image_cache", cache):
+        response = client.get("/api/v1/images/abc.png")
+        range_response = client.get(
+            "/api/v1/images/abc.png", headers={"Range": "bytes=2-4"}
+        )
+
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert response.headers["content-type"] == "image/png"
+    assert range_response.status_code == 206
+    assert range_response.content == b"234"
+    s3_mock.get_object.assert_not_called()
+
+
+# Test for GET /images/{key} revalidation
+def test_get_image_not_modified():
+    response = client.get("/api/v1/images/abc.png",
+                          headers={"If-None-Match": make_etag("image", "abc.png")})
+
+    assert response.status_code == 304
+    s3_mock.get_object.assert_not_called()
+
+
+# Test for GET /images/{key} with a key outside the cache directory
+def test_get_image_bad_key():
+    response = client.get("/api/v1/images/.env")
+
+    assert response.status_code == 404
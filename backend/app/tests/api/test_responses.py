@@ -0,0 +1,55 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from app.api.responses import (FastJSONResponse, dump_list, get_list_adapter,
+                               list_response)
+
+
+class Item(BaseModel):
+    id: int
+    price: Decimal
+    created: datetime
+
+    class Config:
+        from_attributes = True
+
+
+def orm_like(item_id: int):
+    return SimpleNamespace(
+        id=item_id, price=Decimal("9.99"), created=datetime(2024, 11, 27, 12, 0)
+    )
+
+
+# Test for dump_list validating attribute objects in one call
+def test_dump_list():
+    body = dump_list(Item, [orm_like(1), orm_like(2)])
+
+    assert json.loads(body) == [
+        {"id": 1, "price": "9.99", "created": "2024-11-27T12:00:00"},
+        {"id": 2, "price": "9.99", "created": "2024-11-27T12:00:00"},
+    ]
+
+
+# Test for the list adapter being built once per model
+def test_get_list_adapter_is_cached():
+    assert get_list_adapter(Item) is get_list_adapter(Item)
+
+
+# Test for list_response headers and media type
+def test_list_response():
+    response = list_response(Item, [], headers={"X-Next-Cursor": "abc"})
+
+    assert response.body == b"[]"
+    assert response.media_type == "application/json"
+    assert response.headers["X-Next-Cursor"] == "abc"
+
+
+# Test for FastJSONResponse rendering pydantic models directly
+def test_fast_json_response():
+    response = FastJSONResponse(content={"item": Item.model_validate(orm_like(1))})
+
+    assert json.loads(response.body)["item"]["id"] == 1
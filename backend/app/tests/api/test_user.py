@@ -7,8 +7,11 @@ from unittest.mock import MagicMock, patch, ANY, AsyncMock
 from redis.asyncio import Redis
 
 from app.api.user import DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, \
-    EMAIL_REQUEST_PREFIX, PASSWORD_RESET_REQUEST_PREFIX, \
-    TEMPORARY_PASSWORD_RESET_TOKEN_LENGTH, SETUP_2FA_REQUEST_PREFIX
+    EMAIL_REQUEST_PREFIX, PASSWORD_REQUEST_PREFIX, \
+    PASSWORD_RESET_REQUEST_PREFIX, TEMPORARY_PASSWORD_RESET_TOKEN_LENGTH, \
+    SETUP_2FA_REQUEST_PREFIX
+from app.business_logic.identity_cache import generate_user_snapshot_key
+from app.business_logic.verification_codes import DEFAULT_MAX_CODE_ATTEMPTS
 from app.business_logic.auth import hash_password, verify_password
 from app.main import app
 from app.db.models import User, Order
@@ -73,15 +76,22 @@ def mock_get_orders_by_user_id():
         yield mock_get_orders
 
 
-mock_user = User(
-    first_name="first_name",
-    last_name="last_name",
-    username="username",
-    email="email@example.com",
-    ukey="ASDVASD12",
-    role=Roles.USER,
-    mfa_enabled=False
-)
+def make_user() -> User:
+    # a complete row, handlers that only read the user go through UserSnapshot
+    return User(
+        id=1,
+        first_name="first_name",
+        last_name="last_name",
+        username="username",
+        email="email@example.com",
+        ukey="ASDVASD12",
+        role=Roles.USER,
+        mfa_enabled=False,
+        temporary=False,
+    )
+
+
+mock_user = make_user()
 
 
 # Test Get User
@@ -133,6 +143,9 @@ def test_update_user_personal_info(user_update_mock, mock_get_user_by_ukey,
     assert response.json()["first_name"] == user_info["first_name"]
     assert response.json()["last_name"] == user_info["last_name"]
     user_update_mock.assert_called_once_with(ANY, mock_user)
+    redis_mock.delete.assert_awaited_with(
+        generate_user_snapshot_key(mock_user.ukey)
+    )
 
 
 @patch("app.api.user.update_user")
@@ -158,11 +171,9 @@ def test_update_user_personal_info_not_found(user_update_mock,
 
 @patch("app.api.user.verify_password")
 @patch("app.api.user.generate_random_mfa_code")
-@patch("app.api.user.generate_redis_key")
 @patch("app.api.user.hash_password")
 def test_password_change_request_success(
         mock_hash_password,
-        mock_generate_redis_key,
         mock_generate_random_mfa_code,
         mock_verify_password,
         mock_get_user_by_ukey,
@@ -174,7 +185,6 @@ def test_password_change_request_success(
     mock_get_user_by_ukey.return_value = mock_user
     mock_verify_password.return_value = True
     mock_generate_random_mfa_code.return_value = "123456"
-    mock_generate_redis_key.return_value = "redis-key"
     mock_hash_password.return_value = "hashed-new-password"
 
     payload = {"old_password": "SuperOld214", "new_password": "SuperNew214"}
@@ -185,8 +195,13 @@ def test_password_change_request_success(
     )
 
     assert response.status_code == 200
-    redis_mock.setex.assert_called_once_with(
-        "redis-key", DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, "hashed-new-password"
+    redis_mock.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{PASSWORD_REQUEST_PREFIX}:{mock_user.ukey}",
+        "123456",
+        "hashed-new-password",
+        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
     )
 
 
@@ -283,7 +298,7 @@ def test_change_password_redis_key_not_found(
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = mock_user.ukey
     mock_token_data.return_value = token_data
-    redis_mock.get.return_value = None  # Simulate Redis key not found
+    redis_mock.evalsha.return_value = [0]  # Simulate Redis key not found
 
     payload = {"code": "mfa_code"}
     response = client.patch(
@@ -307,7 +322,7 @@ def test_change_password_no_token_ukey(
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = None  # Simulate missing ukey
     mock_token_data.return_value = token_data
-    redis_mock.get.return_value = b"hashed-new-password"  # Simulate Redis key found
+    redis_mock.evalsha.return_value = [1, b"hashed-new-password"]  # Simulate Redis key found
 
     payload = {"code": "mfa_code"}
     response = client.patch(
@@ -331,7 +346,7 @@ def test_change_password_user_not_found(
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = mock_user.ukey
     mock_token_data.return_value = token_data
-    redis_mock.get.return_value = b"hashed-new-password"  # Simulate Redis key found
+    redis_mock.evalsha.return_value = [1, b"hashed-new-password"]  # Simulate Redis key found
     mock_get_user_by_ukey.return_value = None  # Simulate user not found
 
     payload = {"code": "mfa_code"}
@@ -355,7 +370,7 @@ def test_change_password_success(
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = mock_user.ukey
     mock_token_data.return_value = token_data
-    redis_mock.get.return_value = b"hashed-new-password"  # Simulate Redis key found
+    redis_mock.evalsha.return_value = [1, b"hashed-new-password"]  # Simulate Redis key found
     mock_get_user_by_ukey.return_value = mock_user  # Simulate user found
     mock_update_user.return_value = mock_user
 
@@ -380,7 +395,7 @@ def test_change_password_unexpected_error(
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = mock_user.ukey
     mock_token_data.return_value = token_data
-    redis_mock.get.return_value = b"hashed-new-password"  # Simulate Redis key found
+    redis_mock.evalsha.return_value = [1, b"hashed-new-password"]  # Simulate Redis key found
     mock_get_user_by_ukey.side_effect = Exception(
         "Unexpected error")  # Simulate database failure
 
@@ -402,7 +417,7 @@ def test_change_email_request_success(mock_token_data):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"  # Simulate valid ukey
     mock_token_data.return_value = token_data
-    redis_mock.setex.return_value = None  # Simulate Redis success
+    redis_mock.evalsha.return_value = None  # Simulate Redis success
 
     payload = {"email": "newemail@example.com"}
     response = client.post(
@@ -412,8 +427,8 @@ def test_change_email_request_success(mock_token_data):
     )
 
     assert response.status_code == 200
-    redis_mock.setex.assert_called_once_with(
-        ANY, DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, payload["email"]
+    redis_mock.evalsha.assert_called_once_with(
+        ANY, 1, ANY, ANY, payload["email"], DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE
     )
 
 
@@ -422,7 +437,7 @@ def test_change_email_request_redis_error(mock_token_data):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"  # Simulate valid ukey
     mock_token_data.return_value = token_data
-    redis_mock.setex.side_effect = Exception(
+    redis_mock.evalsha.side_effect = Exception(
         "Redis error")  # Simulate Redis failure
 
     payload = {"email": "newemail@example.com"}
@@ -435,8 +450,8 @@ def test_change_email_request_redis_error(mock_token_data):
 
     assert exc.value.status_code == 500
     assert "Error has occurred on a server side" in exc.value.detail
-    redis_mock.setex.assert_called_once_with(
-        ANY, DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE, payload["email"]
+    redis_mock.evalsha.assert_called_once_with(
+        ANY, 1, ANY, ANY, payload["email"], DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE
     )
 
 
@@ -446,7 +461,7 @@ def test_change_email_invalid_mfa_code(mock_token_data):
     token_data.ukey = "test_ukey"
     mock_token_data.return_value = token_data
 
-    redis_mock.get.return_value = None  # Simulate invalid MFA code
+    redis_mock.evalsha.return_value = [0]  # Simulate invalid MFA code
 
     payload = {"code": "invalid_code"}
     response = client.patch(
@@ -457,8 +472,12 @@ def test_change_email_invalid_mfa_code(mock_token_data):
 
     assert response.status_code == 400
     assert response.json()["detail"] == "Bad request"
-    redis_mock.get.assert_called_once_with(
-        f"{EMAIL_REQUEST_PREFIX}:{token_data.ukey}:{payload['code']}"
+    redis_mock.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{EMAIL_REQUEST_PREFIX}:{token_data.ukey}",
+        payload['code'],
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
 
 
@@ -477,7 +496,7 @@ def test_change_email_no_token_ukey(mock_token_data):
 
     assert response.status_code == 400
     assert response.json()["detail"] == "Bad request"
-    redis_mock.get.assert_not_called()
+    redis_mock.evalsha.assert_not_called()
 
 
 # Test Case: User not found
@@ -488,7 +507,7 @@ def test_change_email_user_not_found(mock_get_user_by_ukey,
     token_data.ukey = "test_ukey"
     mock_token_data.return_value = token_data
 
-    redis_mock.get.return_value = b"newemail@example.com"  # Simulate valid Redis key
+    redis_mock.evalsha.return_value = [1, b"newemail@example.com"]  # Simulate valid Redis key
     mock_get_user_by_ukey.return_value = None  # Simulate user not found
 
     payload = {"code": "valid_code"}
@@ -500,8 +519,12 @@ def test_change_email_user_not_found(mock_get_user_by_ukey,
 
     assert response.status_code == 400
     assert response.json()["detail"] == "User is not found"
-    redis_mock.get.assert_called_once_with(
-        f"{EMAIL_REQUEST_PREFIX}:{token_data.ukey}:{payload['code']}"
+    redis_mock.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{EMAIL_REQUEST_PREFIX}:{token_data.ukey}",
+        payload['code'],
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
 
@@ -515,7 +538,7 @@ def test_change_email_success(mock_get_user_by_ukey, mock_update_user,
     token_data.ukey = "test_ukey"
     mock_token_data.return_value = token_data
 
-    redis_mock.get.return_value = b"newemail@example.com"  # Simulate valid Redis key
+    redis_mock.evalsha.return_value = [1, b"newemail@example.com"]  # Simulate valid Redis key
     mock_get_user_by_ukey.return_value = mock_user
 
     payload = {"code": "valid_code"}
@@ -527,8 +550,12 @@ def test_change_email_success(mock_get_user_by_ukey, mock_update_user,
 
     assert response.status_code == 200
     assert response.json()["email"] == "newemail@example.com"
-    redis_mock.get.assert_called_once_with(
-        f"{EMAIL_REQUEST_PREFIX}:{token_data.ukey}:{payload['code']}"
+    redis_mock.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{EMAIL_REQUEST_PREFIX}:{token_data.ukey}",
+        payload['code'],
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
     mock_update_user.assert_called_once_with(ANY, mock_user)
@@ -639,7 +666,7 @@ def test_reset_user_password_request_debug_token(mock_generate_string,
 
 # Test Case: Token not found in Redis
 def test_reset_user_pass_token_not_found():
-    redis_mock.get.return_value = None  # Simulate Redis key not found
+    redis_mock.getdel.return_value = None  # Simulate Redis key not found
 
     reset_pass_token = "invalid_token"
     payload = {"password": "OldPass123"}
@@ -650,14 +677,14 @@ def test_reset_user_pass_token_not_found():
 
     assert response.status_code == 400
     assert response.json()["detail"] == "Bad request"
-    redis_mock.get.assert_called_once_with(
+    redis_mock.getdel.assert_called_once_with(
         f"{PASSWORD_RESET_REQUEST_PREFIX}:{None}:{reset_pass_token}"
     )
 
 
 # Test Case: User not found
 def test_reset_user_pass_user_not_found(mock_get_user_by_email):
-    redis_mock.get.return_value = b"user@example.com"  # Valid Redis key
+    redis_mock.getdel.return_value = b"user@example.com"  # Valid Redis key
     mock_get_user_by_email.return_value = None  # Simulate user not found in DB
 
     reset_pass_token = "valid_token"
@@ -669,7 +696,7 @@ def test_reset_user_pass_user_not_found(mock_get_user_by_email):
 
     assert response.status_code == 400
     assert response.json()["detail"] == "User is not found"
-    redis_mock.get.assert_called_once_with(
+    redis_mock.getdel.assert_called_once_with(
         f"{PASSWORD_RESET_REQUEST_PREFIX}:{None}:{reset_pass_token}"
     )
     mock_get_user_by_email.assert_called_once_with(ANY, "user@example.com")
@@ -680,7 +707,7 @@ def test_reset_user_pass_user_not_found(mock_get_user_by_email):
 def test_reset_user_pass_success(mock_update_user,
                                  mock_get_user_by_email):
     mock_get_user_by_email.return_value = mock_user
-    redis_mock.get.return_value = b"user@example.com"  # Valid Redis key
+    redis_mock.getdel.return_value = b"user@example.com"  # Valid Redis key
 
     reset_pass_token = "valid_token"
     payload = {"password": "Kdmsaasd132"}
@@ -691,7 +718,7 @@ def test_reset_user_pass_success(mock_update_user,
 
     assert response.status_code == 200
     assert response.json()["email"] == mock_user.email
-    redis_mock.get.assert_called_once_with(
+    redis_mock.getdel.assert_called_once_with(
         f"{PASSWORD_RESET_REQUEST_PREFIX}:{None}:{reset_pass_token}"
     )
     mock_get_user_by_email.assert_called_once_with(ANY, "user@example.com")
@@ -701,7 +728,7 @@ def test_reset_user_pass_success(mock_update_user,
 
 # Test Case: Redis error during `get`
 def test_reset_user_pass_redis_error():
-    redis_mock.get.side_effect = Exception(
+    redis_mock.getdel.side_effect = Exception(
         "Redis error")  # Simulate Redis failure
 
     reset_pass_token = "valid_token"
@@ -754,7 +781,7 @@ def test_request_enable_2fa_mfa_already_enabled(mock_get_user_by_ukey, mock_toke
     token_data.ukey = "test_ukey"
     mock_token_data.return_value = token_data
 
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_user.mfa_enabled = True  # Simulate MFA already enabled
     mock_get_user_by_ukey.return_value = mock_user
 
@@ -787,16 +814,19 @@ def test_request_enable_2fa_success(
     )
 
     assert response.status_code == 200
-    redis_mock.setex.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:123456",
-        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
+    redis_mock.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        "123456",
         token_data.email,
+        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
     )
     mock_generate_random_mfa_code.assert_called_once()
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
 
 
-# Test Case: Redis error during `setex`
+# Test Case: Redis error during the code script
 @patch("app.db.managers.user_manager.get_user_by_ukey")
 @patch("app.redis_cache.get_redis_client")
 @patch("app.api.user.generate_random_mfa_code", return_value="123456")
@@ -807,11 +837,11 @@ def test_request_enable_2fa_redis_error(
     token_data.ukey = "test_ukey"
     token_data.email = "user@example.com"
 
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_user.mfa_enabled = False  # Simulate MFA not enabled
     mock_get_user_by_ukey.return_value = mock_user
 
-    mock_redis_client.return_value.setex.side_effect = Exception("Redis error")
+    mock_redis_client.return_value.evalsha.side_effect = Exception("Redis error")
 
     response = client.post(
         "/api/v1/users/me/request_enable_2fa",
@@ -820,10 +850,13 @@ def test_request_enable_2fa_redis_error(
 
     assert response.status_code == 500
     assert "Internal Server Error" in response.text
-    mock_redis_client.return_value.setex.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:123456",
-        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        "123456",
         token_data.email,
+        DEFAULT_CHANGE_PASSWORD_LINK_EXPIRE,
     )
     mock_generate_random_mfa_code.assert_called_once()
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
@@ -845,7 +878,7 @@ def test_request_enable_2fa_invalid_token_data(mock_get_user_by_ukey,
     assert response.status_code == 400
     assert response.json()["detail"] == "Bad request"
     mock_get_user_by_ukey.assert_not_called()
-    mock_redis_client.return_value.setex.assert_not_called()
+    mock_redis_client.return_value.evalsha.assert_not_called()
 
 
 # Test Case: Redis key does not exist for the MFA code
@@ -855,7 +888,7 @@ def test_enable_2fa_key_not_found(mock_get_user_by_ukey, mock_redis_client):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
 
-    mock_redis_client.return_value.get.return_value = None  # Key not found
+    mock_redis_client.return_value.evalsha.return_value = [0]  # Key not found
 
     response = client.patch(
         "/api/v1/users/me/enable_2fa",
@@ -866,8 +899,12 @@ def test_enable_2fa_key_not_found(mock_get_user_by_ukey, mock_redis_client):
     assert response.status_code == 400
     assert response.json()["detail"] == "Bad request"
     mock_get_user_by_ukey.assert_not_called()
-    mock_redis_client.return_value.get.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:123456"
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        "123456",
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
 
 
@@ -888,7 +925,7 @@ def test_enable_2fa_invalid_token_data(mock_get_user_by_ukey,
     assert response.status_code == 400
     assert response.json()["detail"] == "Bad request"
     mock_get_user_by_ukey.assert_not_called()
-    mock_redis_client.return_value.get.assert_not_called()
+    mock_redis_client.return_value.evalsha.assert_not_called()
 
 
 # Test Case: User is not found
@@ -898,7 +935,7 @@ def test_enable_2fa_user_not_found(mock_get_user_by_ukey, mock_redis_client):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
 
-    mock_redis_client.return_value.get.return_value = b"user@example.com"  # Simulate key found
+    mock_redis_client.return_value.evalsha.return_value = [1, b"user@example.com"]  # Simulate key found
     mock_get_user_by_ukey.return_value = None  # User not found
 
     response = client.patch(
@@ -925,7 +962,7 @@ def test_enable_2fa_success(mock_get_user_by_ukey, mock_redis_client,
     mock_user.mfa_enabled = False
     mock_get_user_by_ukey.return_value = mock_user  # Simulate valid user
 
-    mock_redis_client.return_value.get.return_value = b"user@example.com"  # Key found
+    mock_redis_client.return_value.evalsha.return_value = [1, b"user@example.com"]  # Key found
 
     response = client.patch(
         "/api/v1/users/me/enable_2fa",
@@ -935,8 +972,12 @@ def test_enable_2fa_success(mock_get_user_by_ukey, mock_redis_client,
 
     assert response.status_code == 200
     assert response.json()["mfa_enabled"] is True
-    mock_redis_client.return_value.get.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:123456"
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        "123456",
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
     mock_update_user.assert_called_once_with(ANY, mock_user)
@@ -949,7 +990,7 @@ def test_enable_2fa_redis_error(mock_get_user_by_ukey, mock_redis_client):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
 
-    mock_redis_client.return_value.get.side_effect = Exception("Redis error")
+    mock_redis_client.return_value.evalsha.side_effect = Exception("Redis error")
 
     response = client.patch(
         "/api/v1/users/me/enable_2fa",
@@ -959,8 +1000,12 @@ def test_enable_2fa_redis_error(mock_get_user_by_ukey, mock_redis_client):
 
     assert response.status_code == 500
     assert "Internal Server Error" in response.text
-    mock_redis_client.return_value.get.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:123456"
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        "123456",
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
     mock_get_user_by_ukey.assert_not_called()
 
@@ -994,7 +1039,7 @@ def test_request_disable_2fa_mfa_already_disabled(mock_get_user_by_ukey,
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
 
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_user.mfa_enabled = False  # MFA already disabled
     mock_get_user_by_ukey.return_value = mock_user
 
@@ -1007,7 +1052,7 @@ def test_request_disable_2fa_mfa_already_disabled(mock_get_user_by_ukey,
     assert response.status_code == 400
     assert response.json()["detail"] == "MFA is already disabled"
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
-    mock_redis_client.setex.assert_not_called()
+    mock_redis_client.return_value.evalsha.assert_not_called()
 
 
 # Test Case: Successfully request to disable MFA
@@ -1017,11 +1062,11 @@ def test_request_disable_2fa_success(mock_get_user_by_ukey, mock_redis_client):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
 
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_user.mfa_enabled = True  # MFA enabled
     mock_get_user_by_ukey.return_value = mock_user
 
-    mock_redis_client.return_value.setex.return_value = None  # Simulate Redis success
+    mock_redis_client.return_value.evalsha.return_value = None  # Simulate Redis success
 
     response = client.post(
         "/api/v1/users/me/request_disable_2fa",
@@ -1031,10 +1076,13 @@ def test_request_disable_2fa_success(mock_get_user_by_ukey, mock_redis_client):
 
     assert response.status_code == 200
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
-    mock_redis_client.return_value.setex.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:{ANY}",
-        300,
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        ANY,
         token_data.email,
+        300,
     )
 
 
@@ -1046,11 +1094,11 @@ def test_request_disable_2fa_redis_error(mock_get_user_by_ukey,
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
 
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_user.mfa_enabled = True  # MFA enabled
     mock_get_user_by_ukey.return_value = mock_user
 
-    mock_redis_client.return_value.setex.side_effect = Exception(
+    mock_redis_client.return_value.evalsha.side_effect = Exception(
         "Redis error")  # Simulate Redis error
 
     response = client.post(
@@ -1062,10 +1110,13 @@ def test_request_disable_2fa_redis_error(mock_get_user_by_ukey,
     assert response.status_code == 500
     assert "Internal Server Error" in response.text
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
-    mock_redis_client.return_value.setex.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:{ANY}",
-        300,
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        ANY,
         token_data.email,
+        300,
     )
 
 
@@ -1100,7 +1151,7 @@ def test_disable_2fa_invalid_mfa_code(mock_get_user_by_ukey, mock_redis_client):
     mock_user.mfa_enabled = True  # MFA enabled
     mock_get_user_by_ukey.return_value = mock_user
 
-    mock_redis_client.return_value.get.return_value = None  # Invalid or expired MFA code
+    mock_redis_client.return_value.evalsha.return_value = [0]  # Invalid or expired MFA code
 
     response = client.patch(
         "/api/v1/users/me/disable_2fa",
@@ -1129,7 +1180,7 @@ def test_disable_2fa_ukey_none(mock_get_user_by_ukey, mock_redis_client):
     assert response.status_code == 400
     assert response.json()["detail"] == "Bad request"
     mock_get_user_by_ukey.assert_not_called()
-    mock_redis_client.return_value.get.assert_not_called()
+    mock_redis_client.return_value.evalsha.assert_not_called()
 
 
 # Test Case: Redis error when retrieving MFA code
@@ -1144,7 +1195,7 @@ def test_disable_2fa_redis_error(mock_get_user_by_ukey, mock_redis_client):
     mock_get_user_by_ukey.return_value = mock_user
 
     # Simulate Redis error (e.g., connection failure)
-    mock_redis_client.return_value.get.side_effect = Exception("Redis error")
+    mock_redis_client.return_value.evalsha.side_effect = Exception("Redis error")
 
     response = client.patch(
         "/api/v1/users/me/disable_2fa",
@@ -1155,8 +1206,12 @@ def test_disable_2fa_redis_error(mock_get_user_by_ukey, mock_redis_client):
     assert response.status_code == 500
     assert "Internal Server Error" in response.text
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
-    mock_redis_client.return_value.get.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:mfa_code"
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        "mfa_code",
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
 
 
@@ -1174,7 +1229,7 @@ def test_disable_2fa_success(mock_update_user, mock_get_user_by_ukey,
     mock_get_user_by_ukey.return_value = mock_user
 
     # Simulate Redis returning a valid MFA code
-    mock_redis_client.return_value.get.return_value = b"test_email"
+    mock_redis_client.return_value.evalsha.return_value = [1, b"test_email"]
 
     response = client.patch(
         "/api/v1/users/me/disable_2fa",
@@ -1185,8 +1240,12 @@ def test_disable_2fa_success(mock_update_user, mock_get_user_by_ukey,
     assert response.status_code == 200
     assert response.json()["mfa_enabled"] is False
     mock_get_user_by_ukey.assert_called_once_with(ANY, token_data.ukey)
-    mock_redis_client.return_value.get.assert_called_once_with(
-        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}:mfa_code"
+    mock_redis_client.return_value.evalsha.assert_called_once_with(
+        ANY,
+        1,
+        f"{SETUP_2FA_REQUEST_PREFIX}:{token_data.ukey}",
+        "mfa_code",
+        DEFAULT_MAX_CODE_ATTEMPTS,
     )
     mock_update_user.assert_called_once_with(ANY, mock_user)
 
@@ -1235,7 +1294,7 @@ def test_send_code_for_temp_conversion_redis_error(
     mock_get_user_by_email.return_value = mock_user
 
     # Simulate Redis error (e.g., connection failure)
-    mock_redis_client.return_value.set.side_effect = Exception("Redis error")
+    mock_redis_client.return_value.evalsha.side_effect = Exception("Redis error")
 
     user_model = {"email": "testuser@example.com"}
     response = client.post(
@@ -1259,7 +1318,7 @@ def test_send_code_for_temp_conversion_success(
     mock_user.email = "testuser@example.com"
     mock_get_user_by_email.return_value = mock_user
 
-    mock_redis_client.return_value.set.return_value = None  # Mock Redis set
+    mock_redis_client.return_value.evalsha.return_value = None  # Mock code script
     mock_email_sender.return_value.send_message.return_value = None  # Mock email send
 
     user_model = {"email": "testuser@example.com"}
@@ -1269,7 +1328,7 @@ def test_send_code_for_temp_conversion_success(
     )
 
     assert response.status_code == 200
-    mock_redis_client.return_value.set.assert_called_once()
+    mock_redis_client.return_value.evalsha.assert_called_once()
     mock_email_sender.return_value.send_message.assert_called_once_with(
         subject="Your registration verification code",
         text=ANY,  # Any string containing the code
@@ -1298,9 +1357,9 @@ def test_get_user_orders_no_orders(mock_get_user_by_ukey,
                                    mock_get_orders_by_user_id):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_get_user_by_ukey.return_value = mock_user
-    mock_get_orders_by_user_id.return_value = []  # No orders
+    mock_get_orders_by_user_id.return_value = ([], None)  # No orders
 
     response = client.get(
         "/api/v1/users/me/orders",
@@ -1316,11 +1375,11 @@ def test_get_user_orders_with_orders(mock_get_user_by_ukey,
                                      mock_get_orders_by_user_id):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_get_user_by_ukey.return_value = mock_user
 
     mock_order = MagicMock(spec=OrderResponseModel)
-    mock_get_orders_by_user_id.return_value = [mock_order]  # User has orders
+    mock_get_orders_by_user_id.return_value = ([mock_order], None)  # User has orders
 
     response = client.get(
         "/api/v1/users/me/orders",
@@ -1350,7 +1409,7 @@ def test_get_user_orders_db_error(mock_get_orders_by_user_id,
                                   mock_get_user_by_ukey):
     token_data = MagicMock(spec=TokenData)
     token_data.ukey = "test_ukey"
-    mock_user = MagicMock(spec=User)
+    mock_user = make_user()
     mock_get_user_by_ukey.return_value = mock_user
 
     # Simulate a database error
@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from app.business_logic.catalog_cache import (CATALOG_VERSION_KEY,
+                                              bump_catalog_version,
+                                              generate_catalog_count_key,
+                                              generate_catalog_page_key,
+                                              get_cached_catalog_count,
+                                              get_cached_catalog_page,
+                                              get_catalog_version)
+
+
+@pytest.fixture
+def redis_client():
+    return AsyncMock()
+
+
+# Test for key generation
+def test_generate_catalog_keys():
+    assert generate_catalog_page_key(3, 2, 20) == "catalog_page:3:2:20"
+    assert generate_catalog_count_key(3) == "catalog_count:3"
+
+
+# Test for get_catalog_version when the version was never bumped
+@pytest.mark.asyncio
+async def test_get_catalog_version_default(redis_client):
+    redis_client.get.return_value = None
+
+    assert await get_catalog_version(redis_client) == 0
+    redis_client.get.assert_called_once_with(CATALOG_VERSION_KEY)
+
+
+# Test for bump_catalog_version
+@pytest.mark.asyncio
+async def test_bump_catalog_version(redis_client):
+    redis_client.incr.return_value = 5
+
+    assert await bump_catalog_version(redis_client) == 5
+    redis_client.incr.assert_called_once_with(CATALOG_VERSION_KEY)
+
+
+# Test for get_cached_catalog_page - cache hit skips the loader
+@pytest.mark.asyncio
+async def test_get_cached_catalog_page_hit(redis_client):
+    redis_client.get.side_effect = [b"4", b"[]"]
+    loader = AsyncMock()
+
+    result = await get_cached_catalog_page(redis_client, 1, 10, loader)
+
+    assert result == b"[]"
+    loader.assert_not_called()
+    redis_client.get.assert_called_with("catalog_page:4:1:10")
+
+
+# Test for get_cached_catalog_page - cache miss loads and stores the page
+@pytest.mark.asyncio
+async def test_get_cached_catalog_page_miss(redis_client):
+    redis_client.get.side_effect = [b"4", None]
+    loader = AsyncMock(return_value=b'[{"id": 1}]')
+
+    result = await get_cached_catalog_page(redis_client, 1, 10, loader)
+
+    assert result == b'[{"id": 1}]'
+    loader.assert_awaited_once()
+    redis_client.set.assert_called_once_with(
+        "catalog_page:4:1:10", b'[{"id": 1}]', ex=3600
+    )
+
+
+# Test for get_cached_catalog_count
+@pytest.mark.asyncio
+async def test_get_cached_catalog_count_miss(redis_client):
+    redis_client.get.side_effect = [None, None]
+    loader = AsyncMock(return_value=b"42")
+
+    result = await get_cached_catalog_count(redis_client, loader)
+
+    assert result == b"42"
+    redis_client.set.assert_called_once_with("catalog_count:0", b"42", ex=3600)
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.business_logic.catalog_snapshot import (CatalogSnapshot,
+                                                 catalog_snapshot,
+                                                 poll_catalog_snapshot,
+                                                 refresh_catalog_snapshot)
+
+
+@pytest.fixture
+def snapshot():
+    catalog = CatalogSnapshot()
+    catalog.load([b'{"id":3}', b'{"id":2}', b'{"id":1}'], version=4)
+    return catalog
+
+
+# Test for CatalogSnapshot pages
+def test_snapshot_page(snapshot):
+    assert snapshot.page(1, 2) == b'[{"id":3},{"id":2}]'
+    assert snapshot.page(2, 2) == b'[{"id":1}]'
+    assert snapshot.page(3, 2) == b"[]"
+
+
+# Test for CatalogSnapshot count
+def test_snapshot_count(snapshot):
+    assert snapshot.count() == b'{"count":3}'
+
+
+# Test for reload dropping memoized pages
+def test_snapshot_reload(snapshot):
+    snapshot.page(1, 2)
+    snapshot.load([b'{"id":9}'], version=5)
+
+    assert snapshot.page(1, 2) == b'[{"id":9}]'
+    assert snapshot.version == 5
+
+
+# Test for the digest following the content, not the version
+def test_snapshot_digest(snapshot):
+    digest = snapshot.digest
+    snapshot.load([b'{"id":3}', b'{"id":2}', b'{"id":1}'], version=0)
+    assert snapshot.digest == digest
+
+    snapshot.load([b'{"id":3}', b'{"id":2}'], version=4)
+    assert snapshot.digest != digest
+
+
+def mock_session_factory():
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = MagicMock()
+    return session_factory
+
+
+# Test for refresh_catalog_snapshot only reloading on a new version
+@pytest.mark.asyncio
+async def test_refresh_catalog_snapshot():
+    catalog_snapshot.load([], version=1)
+    redis_client = AsyncMock()
+    redis_client.get.return_value = b"1"
+
+    with patch(
+        "app.business_logic.catalog_snapshot.load_catalog_snapshot", AsyncMock()
+    ) as mock_load:
+        assert not await refresh_catalog_snapshot(redis_client, mock_session_factory())
+        redis_client.get.return_value = b"2"
+        assert await refresh_catalog_snapshot(redis_client, mock_session_factory())
+
+    mock_load.assert_awaited_once()
+    assert mock_load.call_args[0][1] == 2
+
+
+# Test for poll_catalog_snapshot surviving refresh errors
+@pytest.mark.asyncio
+async def test_poll_catalog_snapshot_survives_errors():
+    mock_refresh = AsyncMock(side_effect=[Exception("redis down"), True])
+
+    with patch(
+        "app.business_logic.catalog_snapshot.refresh_catalog_snapshot", mock_refresh
+    ):
+        poller = asyncio.create_task(
+            poll_catalog_snapshot(AsyncMock(), MagicMock(), interval=0)
+        )
+        while mock_refresh.await_count < 2:
+            await asyncio.sleep(0)
+        poller.cancel()
+
+    assert mock_refresh.await_count == 2
@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from redis.exceptions import ResponseError
+
+from app.business_logic.email_outbox import (EMAIL_OUTBOX_GROUP, MAX_DELIVERIES,
+                                             SEND_ATTEMPTS, SmtpConnectionPool,
+                                             create_outbox_group,
+                                             process_email_outbox,
+                                             reclaim_stale_entries, send_email)
+from app.email_sender import EMAIL_OUTBOX_KEY
+
+MESSAGE = {"subject": "Subject", "text": "Text", "to": ["user@example.com"]}
+
+
+def mock_redis():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, 1])
+    pipe_context = MagicMock()
+    pipe_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipe_context.__aexit__ = AsyncMock(return_value=None)
+
+    redis_client = AsyncMock()
+    redis_client.pipeline = MagicMock(return_value=pipe_context)
+    redis_client.xpending_range.return_value = []
+    return redis_client, pipe
+
+
+# Test for a message sent over a pooled connection that stays open
+@pytest.mark.asyncio
+async def test_send_email():
+    sender = AsyncMock()
+    pool = SmtpConnectionPool(1, factory=lambda: sender)
+
+    assert await send_email(pool, MESSAGE)
+    assert await send_email(pool, MESSAGE)
+
+    assert sender.send_message.await_count == 2
+    sender.close.assert_not_called()
+
+
+# Test for a failed connection being closed and the message retried
+@pytest.mark.asyncio
+async def test_send_email_retries():
+    sender = AsyncMock()
+    sender.send_message.side_effect = [ConnectionError(), None]
+    pool = SmtpConnectionPool(1, factory=lambda: sender)
+
+    with patch("app.business_logic.email_outbox.asyncio.sleep") as mock_sleep:
+        assert await send_email(pool, MESSAGE)
+
+    sender.close.assert_awaited_once()
+    mock_sleep.assert_awaited_once()
+    assert sender.send_message.await_count == 2
+
+
+# Test for giving up after the last attempt
+@pytest.mark.asyncio
+async def test_send_email_fails():
+    sender = AsyncMock()
+    sender.send_message.side_effect = ConnectionError()
+    pool = SmtpConnectionPool(1, factory=lambda: sender)
+
+    with patch("app.business_logic.email_outbox.asyncio.sleep"):
+        assert not await send_email(pool, MESSAGE)
+
+    assert sender.send_message.await_count == SEND_ATTEMPTS
+
+
+# Test for sent messages being acknowledged and removed from the stream
+@pytest.mark.asyncio
+async def test_process_email_outbox():
+    redis_client, pipe = mock_redis()
+    redis_client.xreadgroup.return_value = [
+        [EMAIL_OUTBOX_KEY.encode(), [(b"1-0", {b"message": json.dumps(MESSAGE)})]]
+    ]
+    sender = AsyncMock()
+    pool = SmtpConnectionPool(1, factory=lambda: sender)
+
+    assert await process_email_outbox(redis_client, pool, "worker") == 1
+
+    sender.send_message.assert_awaited_once_with(**MESSAGE)
+    pipe.xack.assert_called_once_with(EMAIL_OUTBOX_KEY, EMAIL_OUTBOX_GROUP, b"1-0")
+    pipe.xdel.assert_called_once_with(EMAIL_OUTBOX_KEY, b"1-0")
+
+
+# Test for a message that could not be sent staying pending
+@pytest.mark.asyncio
+async def test_process_email_outbox_send_failed():
+    redis_client, pipe = mock_redis()
+    redis_client.xreadgroup.return_value = [
+        [EMAIL_OUTBOX_KEY.encode(), [(b"1-0", {b"message": json.dumps(MESSAGE)})]]
+    ]
+    sender = AsyncMock()
+    sender.send_message.side_effect = ConnectionError()
+    pool = SmtpConnectionPool(1, factory=lambda: sender)
+
+    with patch("app.business_logic.email_outbox.asyncio.sleep"):
+        await process_email_outbox(redis_client, pool, "worker")
+
+    pipe.xack.assert_not_called()
+
+
+# Test for stale messages claimed again and exhausted ones dropped
+@pytest.mark.asyncio
+async def test_reclaim_stale_entries():
+    redis_client, pipe = mock_redis()
+    redis_client.xpending_range.return_value = [
+        {"message_id": b"1-0", "times_delivered": MAX_DELIVERIES},
+        {"message_id": b"2-0", "times_delivered": 1},
+    ]
+    redis_client.xclaim.return_value = [(b"2-0", {b"message": b"{}"})]
+
+    entries = await reclaim_stale_entries(redis_client, "worker")
+
+    assert entries == [(b"2-0", {b"message": b"{}"})]
+    pipe.xack.assert_called_once_with(EMAIL_OUTBOX_KEY, EMAIL_OUTBOX_GROUP, b"1-0")
+    assert redis_client.xclaim.call_args.args[-1] == [b"2-0"]
+
+
+# Test for the consumer group being created only once
+@pytest.mark.asyncio
+async def test_create_outbox_group_exists():
+    redis_client = AsyncMock()
+    redis_client.xgroup_create.side_effect = ResponseError(
+        "BUSYGROUP Consumer Group name already exists"
+    )
+
+    await create_outbox_group(redis_client)
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock
+
+from redis.exceptions import ConnectionError
+
+from app.business_logic.identity_cache import (generate_user_snapshot_key,
+                                               get_user_snapshot,
+                                               invalidate_user_snapshot)
+from app.db.models import User
+from app.dto_schemas.auth import Roles
+from app.dto_schemas.user import UserSnapshot
+
+user = User(id=1, ukey="ASDVASD12", email="user@example.com", role=Roles.USER,
+            mfa_enabled=False, temporary=False, hashed_password="hashed")
+
+
+def make_request():
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+# Test for a miss loading the user and caching the snapshot without the hash
+@pytest.mark.asyncio
+async def test_get_user_snapshot_miss():
+    redis_client = AsyncMock()
+    redis_client.get.return_value = None
+    loader = AsyncMock(return_value=user)
+
+    snapshot = await get_user_snapshot(make_request(), redis_client, user.ukey, loader)
+
+    assert snapshot.id == 1 and snapshot.email == user.email
+    loader.assert_awaited_once()
+    key, payload = redis_client.set.call_args.args
+    assert key == generate_user_snapshot_key(user.ukey)
+    assert "hashed" not in payload
+
+
+# Test for a Redis hit skipping the database
+@pytest.mark.asyncio
+async def test_get_user_snapshot_redis_hit():
+    redis_client = AsyncMock()
+    redis_client.get.return_value = UserSnapshot.model_validate(user).model_dump_json()
+    loader = AsyncMock()
+
+    snapshot = await get_user_snapshot(make_request(), redis_client, user.ukey, loader)
+
+    assert snapshot.ukey == user.ukey
+    loader.assert_not_called()
+
+
+# Test for repeated lookups within one request being memoized
+@pytest.mark.asyncio
+async def test_get_user_snapshot_request_memo():
+    redis_client = AsyncMock()
+    redis_client.get.return_value = None
+    loader = AsyncMock(return_value=user)
+    request = make_request()
+
+    first = await get_user_snapshot(request, redis_client, user.ukey, loader)
+    second = await get_user_snapshot(request, redis_client, user.ukey, loader)
+
+    assert first is second
+    redis_client.get.assert_awaited_once()
+    loader.assert_awaited_once()
+
+
+# Test for Redis outages falling back to the database
+@pytest.mark.asyncio
+async def test_get_user_snapshot_redis_down():
+    redis_client = AsyncMock()
+    redis_client.get.side_effect = ConnectionError()
+    redis_client.set.side_effect = ConnectionError()
+    loader = AsyncMock(return_value=user)
+
+    snapshot = await get_user_snapshot(make_request(), redis_client, user.ukey, loader)
+
+    assert snapshot.ukey == user.ukey
+
+
+# Test for an unknown user
+@pytest.mark.asyncio
+async def test_get_user_snapshot_not_found():
+    redis_client = AsyncMock()
+    redis_client.get.return_value = None
+
+    snapshot = await get_user_snapshot(
+        make_request(), redis_client, "missing", AsyncMock(return_value=None)
+    )
+
+    assert snapshot is None
+    redis_client.set.assert_not_called()
+
+
+# Test for invalidation dropping the snapshot
+@pytest.mark.asyncio
+async def test_invalidate_user_snapshot():
+    redis_client = AsyncMock()
+
+    await invalidate_user_snapshot(redis_client, user.ukey)
+
+    redis_client.delete.assert_awaited_once_with(
+        generate_user_snapshot_key(user.ukey)
+    )
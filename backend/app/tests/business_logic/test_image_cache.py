@@ -0,0 +1,135 @@
+import os
+import time
+
+import pytest
+
+from app.business_logic.image_cache import (PARTIAL_MAX_AGE, DiskImageCache,
+                                            image_media_type,
+                                            is_valid_image_key)
+
+
+async def byte_stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def fill(cache, key, *chunks):
+    return b"".join([chunk async for chunk in cache.fill(key, byte_stream(*chunks))])
+
+
+# Test for key validation keeping lookups inside the cache directory
+def test_is_valid_image_key():
+    assert is_valid_image_key("abc.png_card.webp")
+    assert not is_valid_image_key("../secrets.yml")
+    assert not is_valid_image_key(".hidden")
+    assert not is_valid_image_key("abc.png.123.part")
+
+
+# Test for media types picked from the key extension
+def test_image_media_type():
+    assert image_media_type("abc.jpg") == "image/jpeg"
+    assert image_media_type("abc.png_card.webp") == "image/webp"
+
+
+def cached_files(directory):
+    return sorted(path.name for path in directory.iterdir()
+                  if not path.name.startswith("."))
+
+
+# Test for a miss filling the cache while passing the bytes through
+@pytest.mark.asyncio
+async def test_fill_and_get(tmp_path):
+    cache = DiskImageCache(str(tmp_path), max_size=100)
+
+    assert cache.get("a.png") is None
+    assert await fill(cache, "a.png", b"ab", b"cd") == b"abcd"
+
+    path = cache.get("a.png")
+    assert path == tmp_path / "a.png"
+    assert path.read_bytes() == b"abcd"
+    assert cache.size == 4
+    assert cached_files(tmp_path) == ["a.png"]
+
+
+# Test for workers sharing the files and the size limit
+@pytest.mark.asyncio
+async def test_shared_between_workers(tmp_path):
+    worker_1 = DiskImageCache(str(tmp_path), max_size=10)
+    worker_2 = DiskImageCache(str(tmp_path), max_size=10)
+    await fill(worker_1, "a.png", b"x" * 4)
+    await fill(worker_2, "b.png", b"x" * 4)
+
+    assert worker_2.get("a.png") == tmp_path / "a.png"
+    assert worker_1.size == worker_2.size == 8
+
+
+# Test for least recently served files being evicted first
+@pytest.mark.asyncio
+async def test_eviction(tmp_path):
+    cache = DiskImageCache(str(tmp_path), max_size=10)
+    await fill(cache, "a.png", b"x" * 4)
+    await fill(cache, "b.png", b"x" * 4)
+    old = time.time() - 60
+    os.utime(tmp_path / "a.png", (old, old))
+    os.utime(tmp_path / "b.png", (old + 1, old + 1))
+    cache.get("a.png")
+    await fill(cache, "c.png", b"x" * 4)
+
+    assert cache.get("b.png") is None
+    assert cached_files(tmp_path) == ["a.png", "c.png"]
+    assert cache.size == 8
+
+
+# Test for an interrupted download leaving nothing behind
+@pytest.mark.asyncio
+async def test_fill_interrupted(tmp_path):
+    async def broken_stream():
+        yield b"ab"
+        raise ConnectionError()
+
+    cache = DiskImageCache(str(tmp_path), max_size=100)
+    with pytest.raises(ConnectionError):
+        async for _ in cache.fill("a.png", broken_stream()):
+            pass
+
+    assert cache.get("a.png") is None
+    assert cached_files(tmp_path) == []
+
+
+# Test for a file evicted by another worker being treated as a miss
+@pytest.mark.asyncio
+async def test_get_missing_file(tmp_path):
+    cache = DiskImageCache(str(tmp_path), max_size=100)
+    await fill(cache, "a.png", b"abcd")
+    (tmp_path / "a.png").unlink()
+
+    assert cache.get("a.png") is None
+
+
+# Test for the size recounted at startup and only abandoned downloads removed
+def test_load(tmp_path):
+    (tmp_path / "a.png").write_bytes(b"abc")
+    (tmp_path / "b.png.123.part").write_bytes(b"abc")
+    (tmp_path / "c.png.456.part").write_bytes(b"abc")
+    stale = time.time() - 2 * PARTIAL_MAX_AGE
+    os.utime(tmp_path / "b.png.123.part", (stale, stale))
+    cache = DiskImageCache(str(tmp_path), max_size=100)
+
+    cache.load()
+
+    assert cache.size == 3
+    assert cache.get("a.png") is not None
+    assert cached_files(tmp_path) == ["a.png", "c.png.456.part"]
+
+
+# Test for load trimming a directory that is over the limit
+def test_load_evicts(tmp_path):
+    for i, name in enumerate(["a.png", "b.png", "c.png"]):
+        (tmp_path / name).write_bytes(b"x" * 4)
+        os.utime(tmp_path / name, (1000 + i, 1000 + i))
+    cache = DiskImageCache(str(tmp_path), max_size=10)
+
+    cache.load()
+
+    assert cached_files(tmp_path) == ["b.png", "c.png"]
+    assert cache.size == 8
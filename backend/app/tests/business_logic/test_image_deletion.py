@@ -0,0 +1,179 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.business_logic.image_deletion import (
+    DELETION_CLAIM_LEASE, IMAGE_DELETION_PROCESSING_KEY, IMAGE_DELETION_QUEUE_KEY,
+    IMAGE_UPLOADS_KEY, MAX_DELETE_BATCH, UPLOAD_GRACE_PERIOD,
+    claim_deletion_batch_script, delete_batch, enqueue_image_deletion,
+    process_image_deletions, record_image_upload)
+from app.business_logic.images import image_url, variant_keys
+
+
+def mock_redis(claimed):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    pipe_context = MagicMock()
+    pipe_context.__aenter__ = AsyncMock(return_value=pipe)
+    pipe_context.__aexit__ = AsyncMock(return_value=None)
+
+    redis_client = AsyncMock()
+    redis_client.pipeline = MagicMock(return_value=pipe_context)
+    redis_client.evalsha.return_value = claimed
+    redis_client.zmscore.side_effect = lambda _, keys: [None] * len(keys)
+    return redis_client, pipe
+
+
+def mock_session_factory():
+    session_context = MagicMock()
+    session_context.__aenter__ = AsyncMock(return_value=MagicMock())
+    session_context.__aexit__ = AsyncMock(return_value=None)
+    return MagicMock(return_value=session_context)
+
+
+@pytest.fixture(autouse=True)
+def referenced_image_urls():
+    with patch("app.business_logic.image_deletion.get_referenced_image_urls",
+               AsyncMock(return_value=set())) as mock_referenced:
+        yield mock_referenced
+
+
+# Test for enqueueing an image together with its variants
+@pytest.mark.asyncio
+async def test_enqueue_image_deletion():
+    redis_client = AsyncMock()
+
+    await enqueue_image_deletion(redis_client, "abc.png")
+
+    redis_client.rpush.assert_awaited_once_with(
+        IMAGE_DELETION_QUEUE_KEY, "abc.png", *variant_keys("abc.png")
+    )
+
+
+# Test for a batch claimed atomically and deleted in one call
+@pytest.mark.asyncio
+async def test_process_image_deletions():
+    redis_client, pipe = mock_redis([b"a.png", b"b.png"])
+    s3_client = AsyncMock()
+    s3_client.delete_objects.return_value = {}
+
+    with patch("app.business_logic.image_deletion.time.time", return_value=1000):
+        processed = await process_image_deletions(
+            redis_client, s3_client, mock_session_factory()
+        )
+
+    assert processed == 2
+    redis_client.evalsha.assert_awaited_once_with(
+        claim_deletion_batch_script.sha,
+        2,
+        IMAGE_DELETION_QUEUE_KEY,
+        IMAGE_DELETION_PROCESSING_KEY,
+        1000,
+        DELETION_CLAIM_LEASE,
+        MAX_DELETE_BATCH,
+    )
+    objects = s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"]
+    assert objects == [{"Key": "a.png"}, {"Key": "b.png"}]
+    # released from the processing set only once S3 confirmed the deletion
+    pipe.zrem.assert_called_once_with(
+        IMAGE_DELETION_PROCESSING_KEY, "a.png", "b.png"
+    )
+    pipe.rpush.assert_not_called()
+
+
+# Test for an empty queue not touching S3
+@pytest.mark.asyncio
+async def test_process_image_deletions_empty():
+    redis_client, _ = mock_redis([])
+    s3_client = AsyncMock()
+
+    assert await process_image_deletions(
+        redis_client, s3_client, mock_session_factory()
+    ) == 0
+    s3_client.delete_objects.assert_not_called()
+
+
+# Test for retrying only the keys S3 reported as failed
+@pytest.mark.asyncio
+async def test_delete_batch_retries_failed_keys():
+    s3_client = AsyncMock()
+    s3_client.delete_objects.side_effect = [
+        {"Errors": [{"Key": "b.png", "Code": "InternalError"}]},
+        {},
+    ]
+
+    with patch("app.business_logic.image_deletion.asyncio.sleep", AsyncMock()):
+        failed = await delete_batch(s3_client, ["a.png", "b.png"])
+
+    assert failed == []
+    retried = s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"]
+    assert retried == [{"Key": "b.png"}]
+
+
+# Test for keys pushed back after retries are exhausted
+@pytest.mark.asyncio
+async def test_process_image_deletions_requeues_on_failure():
+    redis_client, pipe = mock_redis([b"a.png"])
+    s3_client = AsyncMock()
+    s3_client.delete_objects.side_effect = Exception("S3 unavailable")
+
+    with patch("app.business_logic.image_deletion.asyncio.sleep", AsyncMock()):
+        await process_image_deletions(
+            redis_client, s3_client, mock_session_factory()
+        )
+
+    pipe.rpush.assert_called_once_with(IMAGE_DELETION_QUEUE_KEY, "a.png")
+    pipe.zrem.assert_called_once_with(IMAGE_DELETION_PROCESSING_KEY, "a.png")
+
+
+# Test for a queued image a game still uses being kept
+@pytest.mark.asyncio
+async def test_process_image_deletions_skips_referenced(referenced_image_urls):
+    redis_client, pipe = mock_redis([b"a.png", b"a.png_card.webp", b"b.png"])
+    referenced_image_urls.return_value = {image_url("a.png")}
+    s3_client = AsyncMock()
+    s3_client.delete_objects.return_value = {}
+
+    assert await process_image_deletions(
+        redis_client, s3_client, mock_session_factory()
+    ) == 3
+
+    objects = s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"]
+    assert objects == [{"Key": "b.png"}]
+    # kept images leave the processing set as well
+    pipe.zrem.assert_called_once_with(
+        IMAGE_DELETION_PROCESSING_KEY, "a.png", "a.png_card.webp", "b.png"
+    )
+
+
+# Test for an image uploaded again within the grace period being kept
+@pytest.mark.asyncio
+async def test_process_image_deletions_skips_recent_uploads():
+    redis_client, _ = mock_redis([b"a.png", b"b.png"])
+    uploads = {"a.png": 1000 - 60, "b.png": 1000 - 2 * 86400}
+    redis_client.zmscore.side_effect = lambda _, keys: [
+        uploads.get(key) for key in keys
+    ]
+    s3_client = AsyncMock()
+    s3_client.delete_objects.return_value = {}
+
+    with patch("app.business_logic.image_deletion.time.time", return_value=1000):
+        await process_image_deletions(
+            redis_client, s3_client, mock_session_factory()
+        )
+
+    objects = s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"]
+    assert objects == [{"Key": "b.png"}]
+
+
+# Test for uploads recorded with entries past the grace period trimmed
+@pytest.mark.asyncio
+async def test_record_image_upload():
+    redis_client, pipe = mock_redis([])
+
+    with patch("app.business_logic.image_deletion.time.time", return_value=1000):
+        await record_image_upload(redis_client, "a.png")
+
+    pipe.zadd.assert_called_once_with(IMAGE_UPLOADS_KEY, {"a.png": 1000})
+    pipe.zremrangebyscore.assert_called_once_with(
+        IMAGE_UPLOADS_KEY, "-inf", 1000 - UPLOAD_GRACE_PERIOD.total_seconds()
+    )
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.business_logic.image_gc import collect_orphaned_images
+
+OLD = datetime.now(timezone.utc) - timedelta(days=7)
+NEW = datetime.now(timezone.utc)
+
+
+def mock_s3_client(pages):
+    async def paginate(**_):
+        for page in pages:
+            yield page
+
+    paginator = MagicMock()
+    paginator.paginate = paginate
+    s3_client = AsyncMock()
+    s3_client.get_paginator = MagicMock(return_value=paginator)
+    return s3_client
+
+
+def mock_redis_client(uploads=None):
+    uploads = uploads or {}
+    redis_client = AsyncMock()
+    redis_client.zmscore.side_effect = lambda _, keys: [
+        uploads.get(key) for key in keys
+    ]
+    return redis_client
+
+
+def blob(key, size=10, last_modified=OLD):
+    return {"Key": key, "Size": size, "LastModified": last_modified}
+
+
+# Test for orphans being deleted while live images, their variants and
+# recent uploads are kept
+@pytest.mark.asyncio
+async def test_collect_orphaned_images():
+    s3_client = mock_s3_client([
+        {"Contents": [blob("live.png"), blob("live.png_card.webp")]},
+        {"Contents": [blob("orphan.png", 100), blob("orphan.png_full.webp", 50)]},
+        {"Contents": [blob("fresh.png", last_modified=NEW)]},
+    ])
+    delete_batch = AsyncMock(return_value=[])
+
+    with patch("app.business_logic.image_gc.delete_batch", delete_batch):
+        report = await collect_orphaned_images(
+            s3_client, mock_redis_client(), {"live.png"}
+        )
+
+    delete_batch.assert_awaited_once_with(
+        s3_client, ["orphan.png", "orphan.png_full.webp"]
+    )
+    assert report == {"scanned": 5, "deleted": 2, "failed": 0, "reclaimed_bytes": 150}
+
+
+# Test for deletions flushed in batches of MAX_DELETE_BATCH
+@pytest.mark.asyncio
+async def test_collect_orphaned_images_batches():
+    s3_client = mock_s3_client([{"Contents": [blob(f"{i}.png") for i in range(5)]}])
+    # only the batch that holds 4.png reports it as failed
+    delete_batch = AsyncMock(
+        side_effect=lambda _, keys: [key for key in keys if key == "4.png"]
+    )
+
+    with patch("app.business_logic.image_gc.delete_batch", delete_batch), \
+            patch("app.business_logic.image_gc.MAX_DELETE_BATCH", 2):
+        report = await collect_orphaned_images(s3_client, mock_redis_client(), set())
+
+    assert delete_batch.await_count == 3
+    assert report["deleted"] == 4
+    assert report["failed"] == 1
+    assert report["reclaimed_bytes"] == 40
+
+
+# Test for dry run not deleting anything
+@pytest.mark.asyncio
+async def test_collect_orphaned_images_dry_run():
+    s3_client = mock_s3_client([{"Contents": [blob("orphan.png")]}])
+    delete_batch = AsyncMock()
+
+    with patch("app.business_logic.image_gc.delete_batch", delete_batch):
+        report = await collect_orphaned_images(
+            s3_client, mock_redis_client(), set(), dry_run=True
+        )
+
+    delete_batch.assert_not_called()
+    assert report["deleted"] == 1
+
+
+# Test for an old blob reused by a recent deduplicated upload surviving the GC
+@pytest.mark.asyncio
+async def test_collect_orphaned_images_keeps_recent_uploads():
+    s3_client = mock_s3_client([
+        {"Contents": [blob("reused.png"), blob("reused.png_card.webp"),
+                      blob("orphan.png")]},
+    ])
+    delete_batch = AsyncMock(return_value=[])
+
+    with patch("app.business_logic.image_gc.delete_batch", delete_batch):
+        report = await collect_orphaned_images(
+            s3_client,
+            mock_redis_client({
+                "reused.png": NEW.timestamp(),
+                "orphan.png": OLD.timestamp(),
+            }),
+            set(),
+        )
+
+    delete_batch.assert_awaited_once_with(s3_client, ["orphan.png"])
+    assert report["deleted"] == 1
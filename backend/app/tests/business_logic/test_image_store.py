@@ -0,0 +1,114 @@
+import hashlib
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from botocore.exceptions import ClientError
+
+from app.business_logic.exceptions import ImageTooLarge, InvalidImage
+from app.business_logic.image_deletion import IMAGE_DELETION_QUEUE_KEY
+from app.business_logic.image_store import (content_key, read_image,
+                                            release_image, store_image)
+from app.business_logic.images import variant_keys
+
+
+async def byte_stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def missing_blob():
+    return ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+
+# Test for hashing while reading the stream
+@pytest.mark.asyncio
+async def test_read_image():
+    data, digest = await read_image(byte_stream(b"ab", b"cd"))
+
+    assert data == b"abcd"
+    assert digest == hashlib.sha256(b"abcd").hexdigest()
+
+
+# Test for reading a stream over the size limit
+@pytest.mark.asyncio
+async def test_read_image_too_large():
+    with patch("app.business_logic.image_store.settings") as mock_settings:
+        mock_settings.aws.max_image_size = 3
+        with pytest.raises(ImageTooLarge):
+            await read_image(byte_stream(b"ab", b"cd"))
+
+
+# Test for a released image queued with its variants
+@pytest.mark.asyncio
+async def test_release_image():
+    redis_client = AsyncMock()
+
+    await release_image(redis_client, "abc.png")
+
+    redis_client.rpush.assert_awaited_once_with(
+        IMAGE_DELETION_QUEUE_KEY, "abc.png", *variant_keys("abc.png")
+    )
+
+
+# Test for a new image being written once under its content hash
+@pytest.mark.asyncio
+async def test_store_image_new():
+    s3_client = AsyncMock()
+    s3_client.head_object.side_effect = missing_blob()
+    redis_client = AsyncMock()
+    key = content_key(hashlib.sha256(b"image").hexdigest(), "image/png")
+
+    with patch("app.business_logic.image_store.ensure_valid_image", AsyncMock()), \
+            patch("app.business_logic.image_store.upload_image_variants",
+                  AsyncMock()) as mock_variants, \
+            patch("app.business_logic.image_store.record_image_upload",
+                  AsyncMock()) as mock_record:
+        stored = await store_image(
+            s3_client, redis_client, byte_stream(b"image"), "image/png"
+        )
+
+    assert stored["key"] == key
+    mock_record.assert_awaited_once_with(redis_client, key)
+    assert not stored["deduplicated"]
+    assert s3_client.put_object.call_args.kwargs["Key"] == key
+    mock_variants.assert_awaited_once_with(s3_client, key, b"image")
+
+
+# Test for a repeated upload skipping the PUT but still being recorded
+@pytest.mark.asyncio
+async def test_store_image_deduplicated():
+    s3_client = AsyncMock()
+    redis_client = AsyncMock()
+
+    with patch("app.business_logic.image_store.ensure_valid_image", AsyncMock()), \
+            patch("app.business_logic.image_store.upload_image_variants",
+                  AsyncMock()) as mock_variants, \
+            patch("app.business_logic.image_store.record_image_upload",
+                  AsyncMock()) as mock_record:
+        stored = await store_image(
+            s3_client, redis_client, byte_stream(b"image"), "image/png"
+        )
+
+    assert stored["deduplicated"]
+    mock_record.assert_awaited_once()
+    s3_client.put_object.assert_not_called()
+    mock_variants.assert_not_called()
+
+
+# Test for a body Pillow cannot read never reaching the bucket
+@pytest.mark.asyncio
+async def test_store_image_invalid():
+    s3_client = AsyncMock()
+    redis_client = AsyncMock()
+
+    with patch("app.business_logic.image_store.ensure_valid_image",
+               AsyncMock(side_effect=InvalidImage())), \
+            pytest.raises(InvalidImage):
+        await store_image(
+            s3_client, redis_client, byte_stream(b"not an image"), "image/png"
+        )
+
+    s3_client.head_object.assert_not_called()
+    s3_client.put_object.assert_not_called()
+    redis_client.pipeline.assert_not_called()
@@ -0,0 +1,143 @@
+import io
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from botocore.exceptions import ClientError
+from PIL import Image
+
+from app.business_logic.exceptions import ImageNotUploaded
+from app.business_logic.images import (IMAGE_VARIANTS,
+                                       create_presigned_image_upload,
+                                       delete_image, ensure_image_uploaded,
+                                       generate_variants, image_content_type,
+                                       image_key_from_url, source_key,
+                                       upload_image_variants, variant_key,
+                                       variant_urls)
+
+
+def make_png(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color=(200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# Test for key and url helpers
+def test_variant_urls():
+    with patch("app.business_logic.images.settings") as mock_settings:
+        mock_settings.aws.bucket_name = "games"
+        urls = variant_urls("/games/abc.png")
+
+    assert image_key_from_url("/games/abc.png") == "abc.png"
+    assert variant_key("abc.png", "card") == "abc.png_card.webp"
+    assert urls["thumbnail"] == "/games/abc.png_thumbnail.webp"
+    assert set(urls) == set(IMAGE_VARIANTS)
+
+
+# Test for mapping variant keys back to the source image
+def test_source_key():
+    assert source_key("abc.png_card.webp") == "abc.png"
+    assert source_key("abc.png") == "abc.png"
+    assert source_key("abc.webp") == "abc.webp"
+
+
+# Test for uploads checked against the declared content type
+def test_image_content_type():
+    png = make_png(10, 10)
+
+    assert image_content_type(png) == "image/png"
+    assert image_content_type(b"not an image") is None
+    assert image_content_type(png[:40]) is None
+
+
+# Test for generate_variants resizing every variant from one decode
+def test_generate_variants():
+    variants = generate_variants(make_png(3000, 1500))
+
+    for variant, size in IMAGE_VARIANTS.items():
+        with Image.open(io.BytesIO(variants[variant])) as image:
+            assert image.format == "WEBP"
+            assert image.size == (size, size // 2)
+
+
+# Test for generate_variants never upscaling small sources
+def test_generate_variants_small_source():
+    variants = generate_variants(make_png(100, 100))
+
+    with Image.open(io.BytesIO(variants["full"])) as image:
+        assert image.size == (100, 100)
+
+
+# Test for upload_image_variants
+@pytest.mark.asyncio
+async def test_upload_image_variants():
+    s3_client = AsyncMock()
+
+    with patch("app.business_logic.images.get_image_pool", return_value=None), \
+            patch("app.business_logic.images.settings") as mock_settings:
+        mock_settings.aws.bucket_name = "games"
+        urls = await upload_image_variants(s3_client, "abc.png", make_png(800, 600))
+
+    assert s3_client.put_object.await_count == len(IMAGE_VARIANTS)
+    assert urls["card"] == "/games/abc.png_card.webp"
+
+
+# Test for delete_image removing the original with its variants
+@pytest.mark.asyncio
+async def test_delete_image():
+    s3_client = AsyncMock()
+
+    await delete_image(s3_client, "abc.png")
+
+    objects = s3_client.delete_objects.call_args.kwargs["Delete"]["Objects"]
+    assert [obj["Key"] for obj in objects] == [
+        "abc.png", *(variant_key("abc.png", v) for v in IMAGE_VARIANTS)
+    ]
+
+
+# Test for create_presigned_image_upload constraints
+@pytest.mark.asyncio
+async def test_create_presigned_image_upload():
+    s3_client = AsyncMock()
+    s3_client.generate_presigned_post.return_value = {
+        "url": "http://localstack:4566/games", "fields": {}
+    }
+
+    with patch("app.business_logic.images.settings") as mock_settings:
+        mock_settings.aws.bucket_name = "games"
+        mock_settings.aws.max_image_size = 2048
+        mock_settings.aws.presigned_upload_expire = 300
+        result = await create_presigned_image_upload(s3_client, "image/png", 1024)
+
+    kwargs = s3_client.generate_presigned_post.call_args.kwargs
+    assert result["key"].endswith(".png")
+    assert result["game_img_url"] == f"/games/{result['key']}"
+    assert ["content-length-range", 1, 1024] in kwargs["Conditions"]
+    assert {"Content-Type": "image/png"} in kwargs["Conditions"]
+
+
+# Test for ensure_image_uploaded with a missing object
+@pytest.mark.asyncio
+async def test_ensure_image_uploaded_missing():
+    s3_client = AsyncMock()
+    s3_client.head_object.side_effect = ClientError(
+        {"Error": {"Code": "404"}}, "HeadObject"
+    )
+
+    with pytest.raises(ImageNotUploaded):
+        await ensure_image_uploaded(s3_client, "abc.png")
+
+
+# Test for ensure_image_uploaded with a valid object
+@pytest.mark.asyncio
+async def test_ensure_image_uploaded():
+    s3_client = AsyncMock()
+    s3_client.head_object.return_value = {
+        "ContentLength": 1024, "ContentType": "image/png"
+    }
+
+    with patch("app.business_logic.images.settings") as mock_settings:
+        mock_settings.aws.max_image_size = 2048
+        head = await ensure_image_uploaded(s3_client, "abc.png")
+
+    assert head["ContentLength"] == 1024
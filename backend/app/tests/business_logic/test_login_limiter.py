@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from redis.exceptions import ConnectionError
+
+from app.business_logic.exceptions import LoginRateLimited
+from app.business_logic.login_limiter import (admit_login, admit_login_script,
+                                              admitted_logins,
+                                              generate_login_attempts_keys,
+                                              rejected_logins)
+from app.settings import settings
+
+
+# Test for all windows being checked with a single script call
+@pytest.mark.asyncio
+async def test_admit_login():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [0, 0]
+    admitted = admitted_logins.value
+
+    with patch("app.business_logic.login_limiter.time.time", return_value=100.0):
+        await admit_login(redis_client, "10.0.0.1", "User@Example.com")
+
+    assert admitted_logins.value == admitted + 1
+    redis_client.evalsha.assert_awaited_once()
+    args = redis_client.evalsha.await_args.args
+    assert args[0] == admit_login_script.sha
+    assert args[1:5] == (
+        3,
+        "login_attempts:ip:10.0.0.1",
+        "login_attempts:email:user@example.com",
+        "login_attempts:global",
+    )
+    assert args[5:7] == (100000, settings.auth.login_window * 1000)
+    assert args[8:] == (
+        settings.auth.login_ip_limit,
+        settings.auth.login_email_limit,
+        settings.auth.login_global_limit,
+    )
+
+
+# Test for a full window rejecting the attempt with the time until a free slot
+@pytest.mark.asyncio
+async def test_admit_login_rejected():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [2, 1500]
+    rejected = rejected_logins["email"].value
+
+    with pytest.raises(LoginRateLimited) as exc:
+        await admit_login(redis_client, "10.0.0.1", "user@example.com")
+
+    assert exc.value.args[0] == 2
+    assert rejected_logins["email"].value == rejected + 1
+
+
+# Test for logins staying available while Redis is down
+@pytest.mark.asyncio
+async def test_admit_login_redis_error():
+    redis_client = AsyncMock()
+    redis_client.evalsha.side_effect = ConnectionError()
+
+    await admit_login(redis_client, "10.0.0.1", "user@example.com")
+
+
+# Test for emails sharing a window regardless of case
+def test_generate_login_attempts_keys():
+    assert generate_login_attempts_keys("10.0.0.1", "User@Example.com")[1] == \
+        generate_login_attempts_keys("10.0.0.2", "user@example.com")[1]
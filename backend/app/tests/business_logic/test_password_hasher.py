@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.business_logic.exceptions import PasswordHasherSaturated
+from app.business_logic.password_hasher import (PASSWORD_HASH_COST_KEY,
+                                                PasswordHasher, hash_cost,
+                                                hash_latency, hash_with_cost,
+                                                load_password_hash_cost,
+                                                pick_cost,
+                                                upgrade_password_hash)
+
+
+@pytest.fixture
+def hasher():
+    password_hasher = PasswordHasher(workers=1, max_pending=2, cost=4)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+# Test for hashing and verifying in the process pool
+@pytest.mark.asyncio
+async def test_hash_and_verify(hasher):
+    hashed_password = await hasher.hash("securePassword123")
+
+    assert hashed_password != "securePassword123"
+    assert await hasher.verify("securePassword123", hashed_password)
+    assert not await hasher.verify("wrongPassword123", hashed_password)
+    assert hasher.pending == 0
+
+
+# Test for calls rejected once the queue is full
+@pytest.mark.asyncio
+async def test_saturated(hasher):
+    hasher.pending = hasher.max_pending
+    timed = hash_latency.count
+
+    with pytest.raises(PasswordHasherSaturated):
+        await hasher.hash("securePassword123")
+
+    # a rejected call never reached the pool, it is not timed
+    assert hash_latency.count == timed
+
+
+# Test for the pending counter released after a failed call
+@pytest.mark.asyncio
+async def test_pending_released_on_error(hasher):
+    with patch("app.business_logic.auth.verify_password",
+               side_effect=ValueError("Invalid salt")), \
+            patch.object(hasher, "_get_pool", return_value=ThreadPoolExecutor(1)):
+        with pytest.raises(ValueError):
+            await hasher.verify("securePassword123", "not-a-hash")
+
+    assert hasher.pending == 0
+
+
+# Test for reading the cost back from a bcrypt hash
+def test_hash_cost():
+    assert hash_cost(hash_with_cost("securePassword123", 5)) == 5
+    assert hash_cost("not-a-hash") is None
+
+
+# Test for the cost estimate doubling the work per step
+def test_pick_cost():
+    assert pick_cost(0.01, 10, 0.05, 16) == 12
+    assert pick_cost(0.01, 10, 10.0, 16) == 16
+    # the minimum cost is kept even when it is over the budget
+    assert pick_cost(0.5, 10, 0.05, 16) == 10
+
+
+# Test for calibration backing off when the picked cost is over budget
+@pytest.mark.asyncio
+async def test_calibrate(hasher):
+    with patch.object(hasher, "_time_cost",
+                      AsyncMock(side_effect=[0.01, 0.08])) as time_cost:
+        assert await hasher.calibrate(0.05, 10, 16) == 11
+
+    assert hasher.cost == 11
+    assert [call.args for call in time_cost.await_args_list] == [(10,), (12,)]
+
+
+# Test for hashes made with a lower cost being upgraded
+@pytest.mark.asyncio
+async def test_upgrade_password_hash(hasher):
+    hasher.cost = 5
+    hashed_password = hash_with_cost("securePassword123", 4)
+
+    with patch("app.business_logic.password_hasher.password_hasher", hasher):
+        new_hashed_password = await upgrade_password_hash(
+            "securePassword123", hashed_password
+        )
+        assert hash_cost(new_hashed_password) == hasher.cost
+        assert await hasher.verify("securePassword123", new_hashed_password)
+
+        assert await upgrade_password_hash(
+            "securePassword123", new_hashed_password
+        ) is None
+
+
+# Test for hashes made with a higher cost being kept
+def test_needs_rehash_upward_only(hasher):
+    assert hasher.needs_rehash(hash_with_cost("securePassword123", 4)) is False
+    assert hasher.needs_rehash(hash_with_cost("securePassword123", 5)) is False
+    hasher.cost = 5
+    assert hasher.needs_rehash(hash_with_cost("securePassword123", 4)) is True
+
+
+# Test for the upgrade being skipped while the pool is saturated
+@pytest.mark.asyncio
+async def test_upgrade_password_hash_saturated(hasher):
+    hasher.cost = 5
+    hasher.pending = hasher.max_pending
+    hashed_password = hash_with_cost("securePassword123", 4)
+
+    with patch("app.business_logic.password_hasher.password_hasher", hasher):
+        assert await upgrade_password_hash(
+            "securePassword123", hashed_password
+        ) is None
+
+
+# Test for workers taking the cost another worker already calibrated
+@pytest.mark.asyncio
+async def test_load_password_hash_cost_stored(hasher):
+    redis_client = AsyncMock()
+    redis_client.get.return_value = b"13"
+
+    with patch("app.business_logic.password_hasher.password_hasher", hasher), \
+            patch.object(hasher, "calibrate", AsyncMock()) as calibrate:
+        assert await load_password_hash_cost(redis_client, 0.25, 12, 16) == 13
+
+    assert hasher.cost == 13
+    calibrate.assert_not_called()
+
+
+# Test for the first worker calibrating once and sharing the cost
+@pytest.mark.asyncio
+async def test_load_password_hash_cost_calibrates(hasher):
+    redis_client = AsyncMock()
+    redis_client.get.return_value = None
+    redis_client.set.return_value = True
+
+    with patch("app.business_logic.password_hasher.password_hasher", hasher), \
+            patch.object(hasher, "calibrate",
+                         AsyncMock(return_value=14)) as calibrate:
+        assert await load_password_hash_cost(redis_client, 0.25, 12, 16) == 14
+
+    calibrate.assert_awaited_once_with(0.25, 12, 16)
+    redis_client.set.assert_awaited_with(PASSWORD_HASH_COST_KEY, 14)
+    redis_client.delete.assert_awaited_once()
+
+
+# Test for the configured cost kept while Redis is down
+@pytest.mark.asyncio
+async def test_load_password_hash_cost_redis_error(hasher):
+    redis_client = AsyncMock()
+    redis_client.get.side_effect = ConnectionError()
+
+    with patch("app.business_logic.password_hasher.password_hasher", hasher), \
+            patch.object(hasher, "calibrate", AsyncMock()) as calibrate:
+        assert await load_password_hash_cost(redis_client, 0.25, 12, 16) == 4
+
+    calibrate.assert_not_called()
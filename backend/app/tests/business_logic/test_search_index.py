@@ -0,0 +1,172 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.business_logic.search_index import (GameSearchIndex, GameSuggester,
+                                             apply_game_change,
+                                             ensure_fresh_game_search_index,
+                                             game_search_index)
+from app.db.models import Game
+
+
+@pytest.fixture
+def index():
+    search_index = GameSearchIndex()
+    search_index.build(
+        [
+            (1, "The Witcher 3: Wild Hunt", "RPG"),
+            (2, "Witchfire", "Shooter"),
+            (3, "Hollow Knight", "Metroidvania"),
+            (4, "Dark Souls III", "RPG"),
+        ],
+        version=1,
+    )
+    return search_index
+
+
+# Test for word prefix search
+def test_search_prefix(index):
+    assert index.search("witch") == [1, 2]
+    assert index.search("WILD hu") == [1]
+
+
+# Test for substring search through trigrams
+def test_search_substring(index):
+    assert index.search("ollow") == [3]
+    assert index.search("zzz") == []
+
+
+# Test for genre matches
+def test_search_genre(index):
+    assert index.search("rpg") == [4, 1]
+
+
+# Test for search limit
+def test_search_limit(index):
+    assert index.search("witch", limit=1) == [1]
+
+
+# Test for updating an indexed game
+def test_add_replaces_previous_title(index):
+    index.add(3, "Hollow Knight: Silksong", "Metroidvania")
+
+    assert index.search("silk") == [3]
+    assert len(index) == 4
+
+
+# Test for removing a game
+def test_remove(index):
+    index.remove(2)
+
+    assert index.search("witch") == [1]
+    assert index.search("fire") == []
+
+
+# Test for apply_game_change keeping the version when nothing else changed
+def test_apply_game_change():
+    game_search_index.build([], version=1)
+
+    apply_game_change(Game(id=5, title="Celeste", genre=None), version=2)
+
+    assert game_search_index.search("cel") == [5]
+    assert game_search_index.version == 2
+
+
+# Test for ensure_fresh_game_search_index rebuilding on a newer version
+@pytest.mark.asyncio
+async def test_ensure_fresh_game_search_index():
+    game_search_index.build([], version=1)
+    redis_client = AsyncMock()
+    redis_client.get.return_value = b"3"
+
+    with patch(
+        "app.business_logic.search_index.get_game_search_rows",
+        AsyncMock(return_value=[(7, "Hades", "Roguelike")]),
+    ), patch(
+        "app.business_logic.search_index.get_game_popularity",
+        AsyncMock(return_value={7: 1}),
+    ):
+        await ensure_fresh_game_search_index(redis_client, MagicMock())
+
+    assert game_search_index.version == 3
+    assert game_search_index.search("had") == [7]
+
+
+# Test for concurrent requests sharing a single rebuild
+@pytest.mark.asyncio
+async def test_ensure_fresh_game_search_index_single_rebuild():
+    game_search_index.build([], version=1)
+    redis_client = AsyncMock()
+    redis_client.get.return_value = b"4"
+    get_game_search_rows = AsyncMock(return_value=[(7, "Hades", "Roguelike")])
+
+    with patch(
+        "app.business_logic.search_index.get_game_search_rows",
+        get_game_search_rows,
+    ), patch(
+        "app.business_logic.search_index.get_game_popularity",
+        AsyncMock(return_value={}),
+    ):
+        await asyncio.gather(
+            *(ensure_fresh_game_search_index(redis_client, MagicMock())
+              for _ in range(5))
+        )
+
+    get_game_search_rows.assert_awaited_once()
+    assert game_search_index.version == 4
+
+
+@pytest.fixture
+def suggester():
+    game_suggester = GameSuggester()
+    game_suggester.build(
+        [
+            (1, "The Witcher 3: Wild Hunt", "RPG"),
+            (2, "Witchfire", "Shooter"),
+            (3, "Hollow Knight", "Metroidvania"),
+        ],
+        popularity={2: 10, 1: 3},
+    )
+    return game_suggester
+
+
+# Test for GameSuggester ranking by popularity
+def test_suggest_by_popularity(suggester):
+    assert suggester.suggest("wit") == [
+        {"id": 2, "title": "Witchfire"},
+        {"id": 1, "title": "The Witcher 3: Wild Hunt"},
+    ]
+    assert suggester.suggest("wit", k=1) == [{"id": 2, "title": "Witchfire"}]
+
+
+# Test for GameSuggester with unknown prefix and empty input
+def test_suggest_no_matches(suggester):
+    assert suggester.suggest("zelda") == []
+    assert suggester.suggest("  ") == []
+
+
+# Test for GameSuggester add and remove
+def test_suggest_add_remove(suggester):
+    suggester.add(4, "Hollow Knight: Silksong")
+    suggester.remove(3)
+
+    assert suggester.suggest("holl") == [
+        {"id": 4, "title": "Hollow Knight: Silksong"}
+    ]
+
+
+# Test for GameSuggester fallback ranking every match, not the first page
+def test_suggest_fallback_ranks_all_matches():
+    games = [(i, f"Quest Saga {i:02}", None) for i in range(30)]
+    index = GameSearchIndex()
+    index.build(games)
+    game_suggester = GameSuggester()
+    game_suggester.build(games, popularity={29: 5, 25: 2})
+
+    with patch("app.business_logic.search_index.game_search_index", index):
+        suggestions = game_suggester.suggest("quest saga", k=2)
+
+    assert suggestions == [
+        {"id": 29, "title": "Quest Saga 29"},
+        {"id": 25, "title": "Quest Saga 25"},
+    ]
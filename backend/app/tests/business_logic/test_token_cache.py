@@ -0,0 +1,59 @@
+import time
+
+from jose import jwt
+
+from app.business_logic.token_cache import VerifiedTokenCache
+from app.dto_schemas.auth import Roles, TokenData
+
+token_data = TokenData(ukey="user-123", email="user@example.com", role=Roles.USER)
+
+
+def make_token(exp: float | None) -> str:
+    claims = {"ukey": "user-123"} if exp is None else {"ukey": "user-123", "exp": exp}
+    return jwt.encode(claims, "secret", algorithm="HS256")
+
+
+# Test for a verified token served from the cache
+def test_put_and_get():
+    cache = VerifiedTokenCache(maxsize=10)
+    token = make_token(time.time() + 3600)
+
+    assert cache.get(token) is None
+    cache.put(token, token_data)
+
+    assert cache.get(token) == token_data
+    assert cache.stats()["size"] == 1
+
+
+# Test for entries expiring together with the token
+def test_expired_token():
+    now = [time.time()]
+    cache = VerifiedTokenCache(maxsize=10, timer=lambda: now[0])
+    token = make_token(now[0] + 3600)
+    cache.put(token, token_data)
+    assert cache.get(token) == token_data
+
+    now[0] += 3601
+
+    assert cache.get(token) is None
+
+
+# Test for tokens without a usable exp never being cached
+def test_uncacheable_tokens():
+    cache = VerifiedTokenCache(maxsize=10)
+    cache.put(make_token(None), token_data)
+    cache.put(make_token(time.time() - 1), token_data)
+    cache.put("not-a-jwt", token_data)
+
+    assert cache.stats()["size"] == 0
+
+
+# Test for the least recently used token evicted first
+def test_bounded_size():
+    cache = VerifiedTokenCache(maxsize=2)
+    tokens = [make_token(time.time() + 3600 + i) for i in range(3)]
+    for token in tokens:
+        cache.put(token, token_data)
+
+    assert cache.get(tokens[0]) is None
+    assert cache.get(tokens[2]) == token_data
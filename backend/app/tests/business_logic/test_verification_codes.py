@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from redis.exceptions import NoScriptError
+
+from app.business_logic.exceptions import (VerificationCodeMismatch,
+                                           VerificationCodeNotFound)
+from app.business_logic.verification_codes import (DEFAULT_MAX_CODE_ATTEMPTS,
+                                                   ISSUE_CODE_SCRIPT,
+                                                   consume_token, issue_code,
+                                                   issue_code_script,
+                                                   verify_code,
+                                                   verify_code_script)
+
+
+# Test for a code stored together with its payload and lifetime
+@pytest.mark.asyncio
+async def test_issue_code():
+    redis_client = AsyncMock()
+
+    await issue_code(redis_client, "prefix:ukey", "123456", 300, "payload")
+
+    redis_client.evalsha.assert_awaited_once_with(
+        issue_code_script.sha, 1, "prefix:ukey", "123456", "payload", 300
+    )
+
+
+# Test for the script source being sent when Redis does not know it yet
+@pytest.mark.asyncio
+async def test_issue_code_loads_unknown_script():
+    redis_client = AsyncMock()
+    redis_client.evalsha.side_effect = NoScriptError()
+
+    await issue_code(redis_client, "prefix:ukey", "123456", 300)
+
+    redis_client.eval.assert_awaited_once_with(
+        ISSUE_CODE_SCRIPT, 1, "prefix:ukey", "123456", "", 300
+    )
+
+
+# Test for a matching code returning its payload
+@pytest.mark.asyncio
+async def test_verify_code_match():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [1, b"user@example.com"]
+
+    payload = await verify_code(redis_client, "prefix:ukey", "123456")
+
+    assert payload == "user@example.com"
+    redis_client.evalsha.assert_awaited_once_with(
+        verify_code_script.sha,
+        1,
+        "prefix:ukey",
+        "123456",
+        DEFAULT_MAX_CODE_ATTEMPTS,
+    )
+
+
+# Test for a wrong code
+@pytest.mark.asyncio
+async def test_verify_code_mismatch():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [-1]
+
+    with pytest.raises(VerificationCodeMismatch):
+        await verify_code(redis_client, "prefix:ukey", "000000")
+
+
+# Test for a code that expired or was already used
+@pytest.mark.asyncio
+async def test_verify_code_not_found():
+    redis_client = AsyncMock()
+    redis_client.evalsha.return_value = [0]
+
+    with pytest.raises(VerificationCodeNotFound):
+        await verify_code(redis_client, "prefix:ukey", "123456")
+
+
+# Test for tokens being read and deleted in one command
+@pytest.mark.asyncio
+async def test_consume_token():
+    redis_client = AsyncMock()
+    redis_client.getdel.return_value = b"user@example.com"
+
+    assert await consume_token(redis_client, "prefix:token") == "user@example.com"
+    redis_client.getdel.assert_awaited_once_with("prefix:token")
+
+    redis_client.getdel.return_value = None
+    assert await consume_token(redis_client, "prefix:token") is None
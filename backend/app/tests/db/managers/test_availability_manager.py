@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import mysql
+
+from app.db.managers.availability_manager import (
+    adjust_availability, get_availability, link_account_games,
+    set_account_game_availability)
+from app.db.models import GameAccountGame
+
+
+@pytest.fixture
+def mock_db_session():
+    db_session = MagicMock()
+    db_session.execute = AsyncMock()
+    return db_session
+
+
+# Test for adjust_availability - a single upsert
+@pytest.mark.asyncio
+async def test_adjust_availability(mock_db_session):
+    await adjust_availability(mock_db_session, 3, -1)
+
+    stmt = mock_db_session.execute.call_args[0][0]
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assert "INSERT INTO game_availability" in sql
+    assert "ON DUPLICATE KEY UPDATE" in sql
+
+
+# Test for link_account_games
+@pytest.mark.asyncio
+async def test_link_account_games(mock_db_session):
+    with patch(
+        "app.db.managers.availability_manager.adjust_availability", AsyncMock()
+    ) as mock_adjust:
+        account_games = await link_account_games(mock_db_session, 42, [1, 2])
+
+    assert [account_game.game_id for account_game in account_games] == [1, 2]
+    mock_db_session.add_all.assert_called_once_with(account_games)
+    assert mock_adjust.await_count == 2
+
+
+# Test for set_account_game_availability only counting real transitions
+@pytest.mark.asyncio
+async def test_set_account_game_availability(mock_db_session):
+    account_game = GameAccountGame(account_id=42, game_id=1, available_status=True)
+    # the second, concurrent allocation finds the status already changed
+    mock_db_session.execute.side_effect = [MagicMock(rowcount=1),
+                                           MagicMock(rowcount=0)]
+
+    with patch(
+        "app.db.managers.availability_manager.adjust_availability", AsyncMock()
+    ) as mock_adjust:
+        assert await set_account_game_availability(
+            mock_db_session, account_game, False
+        )
+        assert not await set_account_game_availability(
+            mock_db_session, account_game, False
+        )
+
+    assert account_game.available_status is False
+    mock_adjust.assert_awaited_once_with(mock_db_session, 1, -1)
+    stmt = mock_db_session.execute.call_args_list[0][0][0]
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assert "UPDATE game_account_games" in sql
+    assert "available_status !=" in sql
+
+
+# Test for a lost allocation leaving the loaded row untouched
+@pytest.mark.asyncio
+async def test_set_account_game_availability_lost(mock_db_session):
+    account_game = GameAccountGame(account_id=42, game_id=1, available_status=True)
+    mock_db_session.execute.return_value = MagicMock(rowcount=0)
+
+    with patch(
+        "app.db.managers.availability_manager.adjust_availability", AsyncMock()
+    ) as mock_adjust:
+        assert not await set_account_game_availability(
+            mock_db_session, account_game, False
+        )
+
+    assert account_game.available_status is True
+    mock_adjust.assert_not_called()
+
+
+# Test for get_availability defaulting unknown games to zero
+@pytest.mark.asyncio
+async def test_get_availability(mock_db_session):
+    mock_db_session.execute.return_value = [(1, 3)]
+
+    assert await get_availability(mock_db_session, [1, 2]) == {1: 3, 2: 0}
@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import mysql
+
+from app.db.managers.catalog_manager import (FullTextSearchMode,
+                                             get_referenced_image_urls,
+                                             search_games_fulltext,
+                                             to_boolean_query)
+
+
+@pytest.fixture
+def mock_db_session():
+    db_session = MagicMock()
+    db_session.scalars = AsyncMock(
+        return_value=MagicMock(all=MagicMock(return_value=[]))
+    )
+    return db_session
+
+
+def compiled_sql(db_session) -> str:
+    stmt = db_session.scalars.call_args[0][0]
+    return str(stmt.compile(dialect=mysql.dialect()))
+
+
+# Test for to_boolean_query stripping boolean operators
+def test_to_boolean_query():
+    assert to_boolean_query('dark "souls" -III') == "+dark* +souls* +III*"
+    assert to_boolean_query("+-<>()~*@") == ""
+
+
+# Test for natural language search
+@pytest.mark.asyncio
+async def test_search_games_fulltext_natural_language(mock_db_session):
+    await search_games_fulltext(mock_db_session, "witcher", limit=5)
+
+    sql = compiled_sql(mock_db_session)
+    assert "MATCH (games.title, games.description) AGAINST" in sql
+    assert "IN NATURAL LANGUAGE MODE" in sql
+    assert "ORDER BY MATCH" in sql
+
+
+# Test for boolean mode search
+@pytest.mark.asyncio
+async def test_search_games_fulltext_boolean(mock_db_session):
+    await search_games_fulltext(
+        mock_db_session, "witch", mode=FullTextSearchMode.BOOLEAN
+    )
+
+    assert "IN BOOLEAN MODE" in compiled_sql(mock_db_session)
+
+
+# Test for boolean mode with nothing searchable left
+@pytest.mark.asyncio
+async def test_search_games_fulltext_empty_boolean_query(mock_db_session):
+    result = await search_games_fulltext(
+        mock_db_session, "***", mode=FullTextSearchMode.BOOLEAN
+    )
+
+    assert result == []
+    mock_db_session.scalars.assert_not_called()
+
+
+# Test for image references looked up in games and pending change requests
+@pytest.mark.asyncio
+async def test_get_referenced_image_urls():
+    db_session = MagicMock()
+    db_session.scalars = AsyncMock(side_effect=[
+        MagicMock(all=MagicMock(return_value=["/bucket/a.png"])),
+        MagicMock(all=MagicMock(return_value=["/bucket/b.png"])),
+    ])
+
+    urls = await get_referenced_image_urls(
+        db_session, ["/bucket/a.png", "/bucket/b.png", "/bucket/c.png"]
+    )
+
+    assert urls == {"/bucket/a.png", "/bucket/b.png"}
+    pending_stmt = db_session.scalars.call_args_list[1][0][0]
+    sql = str(pending_stmt.compile(dialect=mysql.dialect()))
+    assert "JSON_EXTRACT" in sql
@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import select
+
+from app.db.managers.exceptions import InvalidCursor
+from app.db.managers.pagination import (apply_keyset, decode_cursor,
+                                        encode_cursor, paginate)
+from app.db.models import Order
+
+
+# Test for encode_cursor and decode_cursor round trip
+def test_cursor_round_trip():
+    order_date = datetime(2024, 11, 27, 12, 30)
+
+    assert decode_cursor(encode_cursor(order_date, 7)) == (order_date, 7)
+    assert decode_cursor(encode_cursor("title", 3)) == ("title", 3)
+
+
+# Test for decode_cursor with garbage input
+def test_decode_cursor_invalid():
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+# Test for decode_cursor with a sort value of the wrong type for the column
+def test_decode_cursor_wrong_sort_type():
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("title", 3), datetime)
+
+
+# Test for apply_keyset rejecting a cursor minted for another column
+def test_apply_keyset_wrong_sort_type():
+    cursor = encode_cursor("title", 7)
+
+    with pytest.raises(InvalidCursor):
+        apply_keyset(select(Order), Order.order_date, Order.id, cursor, 10)
+
+
+# Test for apply_keyset - the cursor turns into a range predicate, not an OFFSET
+def test_apply_keyset_with_cursor():
+    cursor = encode_cursor(datetime(2024, 11, 27), 7)
+
+    stmt = apply_keyset(select(Order), Order.order_date, Order.id, cursor, 10)
+    sql = str(stmt.compile())
+
+    assert "OFFSET" not in sql.upper()
+    assert "orders.order_date <" in sql
+    assert "orders.id <" in sql
+    assert stmt._limit_clause.value == 11
+
+
+# Test for paginate - next cursor is built from the last returned row
+@pytest.mark.asyncio
+async def test_paginate_returns_next_cursor():
+    rows = [
+        Order(id=i, order_date=datetime(2024, 11, 27 - i)) for i in range(1, 4)
+    ]
+    db_session = MagicMock()
+    db_session.scalars = AsyncMock(
+        return_value=MagicMock(all=MagicMock(return_value=rows))
+    )
+
+    items, next_cursor = await paginate(
+        db_session, select(Order), Order.order_date, Order.id, limit=2
+    )
+
+    assert items == rows[:2]
+    assert decode_cursor(next_cursor) == (rows[1].order_date, rows[1].id)
+
+
+# Test for paginate on the last page
+@pytest.mark.asyncio
+async def test_paginate_last_page():
+    rows = [Order(id=1, order_date=datetime(2024, 11, 27))]
+    db_session = MagicMock()
+    db_session.scalars = AsyncMock(
+        return_value=MagicMock(all=MagicMock(return_value=rows))
+    )
+
+    items, next_cursor = await paginate(
+        db_session, select(Order), Order.order_date, Order.id, limit=2
+    )
+
+    assert items == rows
+    assert next_cursor is None
@@ -0,0 +1,88 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import mysql
+
+from app.db.managers.exceptions import RatingValueError
+from app.db.managers.rating_manager import (add_feedback, apply_rating,
+                                           rebuild_rating_stats)
+from app.db.models import Feedback
+from app.dto_schemas.feedback import RatingStatsResponseModel
+
+
+@pytest.fixture
+def mock_db_session():
+    db_session = MagicMock()
+    db_session.execute = AsyncMock()
+    db_session.commit = AsyncMock()
+    return db_session
+
+
+def compiled_sql(stmt) -> str:
+    return str(stmt.compile(dialect=mysql.dialect()))
+
+
+# Test for apply_rating - one upsert touching the matching star bucket
+@pytest.mark.asyncio
+async def test_apply_rating(mock_db_session):
+    await apply_rating(mock_db_session, 3, 4)
+
+    sql = compiled_sql(mock_db_session.execute.call_args[0][0])
+    assert "INSERT INTO game_rating_stats" in sql
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert "rating_4 = (game_rating_stats.rating_4 +" in sql
+    assert "rating_5 =" not in sql
+
+
+# Test for add_feedback - stats are updated before the single commit
+@pytest.mark.asyncio
+async def test_add_feedback(mock_db_session):
+    feedback = Feedback(user_id=1, username="user", game_id=3, text="ok", rating=5)
+
+    result = await add_feedback(mock_db_session, feedback)
+
+    assert result is feedback
+    mock_db_session.add.assert_called_once_with(feedback)
+    mock_db_session.execute.assert_awaited_once()
+    mock_db_session.commit.assert_awaited_once()
+
+
+# Test for add_feedback with an out of range rating
+@pytest.mark.asyncio
+async def test_add_feedback_invalid_rating(mock_db_session):
+    feedback = Feedback(user_id=1, username="user", game_id=3, text="ok", rating=6)
+
+    with pytest.raises(RatingValueError):
+        await add_feedback(mock_db_session, feedback)
+
+    mock_db_session.add.assert_not_called()
+
+
+# Test for rebuild_rating_stats
+@pytest.mark.asyncio
+async def test_rebuild_rating_stats(mock_db_session):
+    mock_db_session.execute.return_value = MagicMock(rowcount=2)
+
+    assert await rebuild_rating_stats(mock_db_session) == 2
+
+    delete_sql, insert_sql = (
+        compiled_sql(call.args[0]) for call in mock_db_session.execute.call_args_list
+    )
+    assert delete_sql.startswith("DELETE FROM game_rating_stats")
+    assert "GROUP BY feedback.game_id" in insert_sql
+    mock_db_session.commit.assert_awaited_once()
+
+
+# Test for RatingStatsResponseModel average
+def test_rating_stats_average():
+    stats = RatingStatsResponseModel(
+        ratings_count=3, ratings_sum=11, rating_1=0, rating_2=0, rating_3=1,
+        rating_4=1, rating_5=1,
+    )
+    empty = RatingStatsResponseModel(
+        ratings_count=0, ratings_sum=0, rating_1=0, rating_2=0, rating_3=0,
+        rating_4=0, rating_5=0,
+    )
+
+    assert stats.average_rating == 3.67
+    assert empty.average_rating is None
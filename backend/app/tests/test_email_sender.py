@@ -1,6 +1,9 @@
+import json
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from app.email_sender import GmailEmailSender, MockEmailSender, get_email_sender
+from unittest.mock import AsyncMock, patch
+from app.email_sender import EMAIL_OUTBOX_KEY, GmailEmailSender, MockEmailSender, \
+    OutboxEmailSender, create_email_sender, get_email_sender
 
 
 @pytest.mark.asyncio
@@ -94,20 +97,17 @@ async def test_mock_email_sender_send_message():
         mock_print.assert_called_once_with(text)
 
 
-@pytest.mark.asyncio
-async def test_get_email_sender():
+def test_create_email_sender():
     # Mock the settings to provide user credentials
-    mock_settings = MagicMock()
-    mock_settings.email_sender.user = "testuser"
-    mock_settings.email_sender.host = "smtp.gmail.com"
-    mock_settings.email_sender.port = 587
-    mock_settings.email_sender.password = "testpassword"
+    with patch("app.email_sender.settings") as mock_settings:
+        mock_settings.email_sender.user = "testuser"
+        mock_settings.email_sender.host = "smtp.gmail.com"
+        mock_settings.email_sender.port = 587
+        mock_settings.email_sender.password = "testpassword"
 
-    with patch("app.settings.settings", mock_settings):
         # Patch the GmailEmailSender initialization
         with patch("app.email_sender.GmailEmailSender") as mock_gmail_sender:
-            mock_gmail_sender.return_value = MagicMock()
-            email_sender = await get_email_sender()
+            email_sender = create_email_sender()
 
             # Check that the GmailEmailSender was initialized
             mock_gmail_sender.assert_called_once_with(
@@ -117,3 +117,41 @@ async def test_get_email_sender():
                 password="testpassword",
             )
             assert email_sender is mock_gmail_sender.return_value
+
+
+def test_create_email_sender_without_credentials():
+    with patch("app.email_sender.settings") as mock_settings:
+        mock_settings.email_sender.user = ""
+
+        assert isinstance(create_email_sender(), MockEmailSender)
+
+
+@pytest.mark.asyncio
+async def test_outbox_email_sender_send_message():
+    redis_client = AsyncMock()
+    email_sender = OutboxEmailSender(redis_client)
+
+    await email_sender.send_message("Test Subject", "Test Email Content",
+                                    ["recipient@example.com"])
+
+    # Ensure the message is queued instead of sent
+    redis_client.xadd.assert_awaited_once()
+    key, fields = redis_client.xadd.call_args[0]
+    assert key == EMAIL_OUTBOX_KEY
+    assert json.loads(fields["message"]) == {
+        "subject": "Test Subject",
+        "text": "Test Email Content",
+        "to": ["recipient@example.com"],
+        "cc": None,
+        "text_type": "plain",
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_email_sender():
+    with patch("app.email_sender.get_redis") as mock_get_redis:
+        email_senders = get_email_sender()
+        email_sender = await anext(email_senders)
+
+        assert isinstance(email_sender, OutboxEmailSender)
+        assert email_sender.redis_client is mock_get_redis.return_value
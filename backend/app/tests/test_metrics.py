@@ -0,0 +1,38 @@
+from app.metrics import Histogram, counter, histogram, register_gauge, snapshot
+
+
+# Test for counters being shared by name
+def test_counter():
+    counter("test_requests").inc()
+    counter("test_requests").inc(2)
+
+    assert snapshot()["counters"]["test_requests"] == 3
+
+
+# Test for histogram buckets
+def test_histogram_observe():
+    latency = Histogram(buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3.0)
+
+    assert latency.to_dict() == {
+        "count": 3,
+        "sum": 3.55,
+        "buckets": {"0.1": 1, "1.0": 1, "+Inf": 1},
+    }
+
+
+# Test for histogram timer
+def test_histogram_time():
+    with histogram("test_latency").time():
+        pass
+
+    assert snapshot()["histograms"]["test_latency"]["count"] == 1
+
+
+# Test for gauges collected at snapshot time
+def test_register_gauge():
+    register_gauge("test_pool", lambda: {"in_use": 2})
+
+    assert snapshot()["gauges"]["test_pool"] == {"in_use": 2}
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from botocore.hooks import HierarchicalEmitter
+
+from app.metrics import snapshot
+from app.s3 import S3ClientManager, stream_upload
+
+
+async def byte_stream(chunks_count: int, chunk_size: int):
+    for i in range(chunks_count):
+        yield bytes([i % 256]) * chunk_size
+
+
+@pytest.fixture
+def s3_client():
+    client = AsyncMock()
+    client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+    return client
+
+
+@pytest.fixture(autouse=True)
+def mock_settings():
+    with patch("app.s3.settings") as settings:
+        settings.aws.bucket_name = "games"
+        settings.aws.upload_part_size = 8 * 1024 * 1024
+        settings.aws.upload_concurrency = 4
+        settings.aws.max_pool_connections = 50
+        yield settings
+
+
+# Test for stream_upload with an object smaller than one part
+@pytest.mark.asyncio
+async def test_stream_upload_small_object(s3_client):
+    size = await stream_upload(s3_client, "key", byte_stream(3, 2), part_size=10)
+
+    assert size == 6
+    s3_client.put_object.assert_awaited_once()
+    s3_client.create_multipart_upload.assert_not_called()
+
+
+# Test for stream_upload splitting the stream into fixed-size parts
+@pytest.mark.asyncio
+async def test_stream_upload_multipart(s3_client):
+    size = await stream_upload(
+        s3_client, "key", byte_stream(17, 3), part_size=10, concurrency=2
+    )
+
+    assert size == 51
+    part_sizes = [
+        len(call.kwargs["Body"]) for call in s3_client.upload_part.call_args_list
+    ]
+    assert part_sizes == [10, 10, 10, 10, 10, 1]
+    parts = s3_client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]
+    assert [part["PartNumber"] for part in parts["Parts"]] == [1, 2, 3, 4, 5, 6]
+
+
+# Test for stream_upload never exceeding the configured concurrency
+@pytest.mark.asyncio
+async def test_stream_upload_bounded_concurrency(s3_client):
+    in_flight = max_in_flight = 0
+
+    async def slow_upload_part(**kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"ETag": "etag"}
+
+    s3_client.upload_part.side_effect = slow_upload_part
+
+    await stream_upload(
+        s3_client, "key", byte_stream(20, 10), part_size=10, concurrency=3
+    )
+
+    assert max_in_flight == 3
+
+
+# Test for stream_upload aborting the multipart upload on failure
+@pytest.mark.asyncio
+async def test_stream_upload_aborts_on_error(s3_client):
+    async def broken_stream():
+        yield b"x" * 25
+        raise ConnectionError("client went away")
+
+    with pytest.raises(ConnectionError):
+        await stream_upload(
+            s3_client, "key", broken_stream(), part_size=10, concurrency=2
+        )
+
+    s3_client.abort_multipart_upload.assert_awaited_once()
+    s3_client.complete_multipart_upload.assert_not_called()
+
+
+# Test for S3ClientManager opening a single client and closing it
+@pytest.mark.asyncio
+async def test_s3_client_manager_start_close():
+    client = AsyncMock()
+    client.meta = MagicMock()
+    client_context = MagicMock()
+    client_context.__aenter__ = AsyncMock(return_value=client)
+    client_context.__aexit__ = AsyncMock(return_value=None)
+
+    with patch("app.s3.session.client", return_value=client_context) as mock_client:
+        manager = S3ClientManager()
+        assert await manager.start() is client
+        assert await manager.start() is client
+        assert manager.pool_stats()["started"]
+        await manager.close()
+
+    mock_client.assert_called_once()
+    assert mock_client.call_args.kwargs["config"].max_pool_connections
+    client_context.__aexit__.assert_awaited_once()
+    assert manager.client is None
+
+
+# Test for calls counted in flight and timed per operation
+def test_s3_client_manager_call_metrics():
+    client = MagicMock()
+    client.meta.events = HierarchicalEmitter()
+    manager = S3ClientManager()
+    manager.register_metrics(client)
+    first, second = {}, {}
+
+    client.meta.events.emit("before-call.s3.PutObject", context=first)
+    client.meta.events.emit("before-call.s3.HeadObject", context=second)
+    assert manager.pool_stats()["in_flight"] == 2
+
+    client.meta.events.emit(
+        "after-call.s3.PutObject", http_response=MagicMock(status_code=200),
+        parsed={}, model=MagicMock(), context=first,
+    )
+    client.meta.events.emit(
+        "after-call-error.s3.HeadObject", exception=TimeoutError(), context=second
+    )
+
+    stats = manager.pool_stats()
+    assert stats["in_flight"] == 0
+    assert stats["max_in_flight"] == 2
+    metrics = snapshot()
+    assert metrics["histograms"]["s3_put_object_seconds"]["count"] >= 1
+    assert metrics["counters"]["s3_head_object_errors"] >= 1
@@ -1,6 +1,6 @@
 import pytest
-from unittest.mock import MagicMock, AsyncMock
-from app.utils import generate_ukey, generate_string, generate_random_mfa_code, async_islice
+from unittest.mock import MagicMock, AsyncMock, patch
+from app.utils import generate_ukey, generate_string, generate_random_mfa_code, async_islice, cpu_share
 
 
 # Test for generate_ukey
@@ -51,3 +51,12 @@ async def test_async_islice():
     # Ensure the generator is fully exhausted
     async for item in async_islice(async_gen(), 0):
         assert False, "Iterator should be exhausted"
+
+
+# Test for cpu_share splitting the host CPUs between worker processes
+def test_cpu_share():
+    with patch("app.utils.os.cpu_count", return_value=8):
+        assert cpu_share(1) == 8
+        assert cpu_share(4) == 2
+        # never below one process, even with more workers than CPUs
+        assert cpu_share(16) == 1
@@ -1,3 +1,4 @@
+import os
 import random
 import string
 from typing import AsyncIterator
@@ -17,6 +18,12 @@ def generate_random_mfa_code() -> str:
     return "".join(random.choices(string.digits, k=6))
 
 
+def cpu_share(processes: int) -> int:
+    # CPUs of this host left to each of ``processes`` worker processes, so
+    # per-worker process pools together never oversubscribe the host
+    return max(1, (os.cpu_count() or 1) // processes)
+
+
 async def async_islice(iterable: AsyncIterator, n: int):  # bo mogu, i 4o>????
     count = 0
     async for item in iterable:
@@ -0,0 +1,56 @@
+"""
+Compares the in-process game search index against a ``%term%`` scan.
+
+Run from the backend directory: ``python -m benchmarks.bench_search_index``.
+"""
+import random
+import string
+import time
+
+from app.business_logic.search_index import GameSearchIndex, normalize
+
+CATALOG_SIZE = 100_000
+QUERIES = ["wit", "dark so", "knight", "ollo", "zzzz", "legend of", "star"]
+WORDS = [
+    "dark", "souls", "knight", "hollow", "witcher", "legend", "star", "wars",
+    "battle", "field", "craft", "world", "city", "call", "duty", "quest",
+]
+GENRES = ["RPG", "Shooter", "Strategy", "Indie", None]
+
+
+def synthetic_catalog(size: int):
+    for game_id in range(1, size + 1):
+        words = random.choices(WORDS, k=random.randint(1, 4))
+        suffix = "".join(random.choices(string.ascii_lowercase, k=5))
+        yield game_id, " ".join(words + [suffix]).title(), random.choice(GENRES)
+
+
+def timed(fn, repeat: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    random.seed(42)
+    catalog = list(synthetic_catalog(CATALOG_SIZE))
+
+    start = time.perf_counter()
+    index = GameSearchIndex()
+    index.build(catalog)
+    print(f"build: {time.perf_counter() - start:.2f}s for {len(index)} titles")
+
+    documents = [(game_id, normalize(title)) for game_id, title, _ in catalog]
+    for query in QUERIES:
+        term = normalize(query)
+        index_us = timed(lambda: index.search(query))
+        scan_us = timed(
+            lambda: [game_id for game_id, doc in documents if term in doc][:20],
+            repeat=5,
+        )
+        print(f"{query!r:>12}: index {index_us:9.1f}us  scan {scan_us:9.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-item cost of the default list serialization path against dump_list.
+
+Run from the backend directory: ``python -m benchmarks.bench_serialization``.
+"""
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.api.responses import dump_list
+
+SIZES = [10, 100, 1000]
+REPEAT = 200
+
+
+class OrderLike(BaseModel):
+    id: int
+    game_id: int
+    account_id: int
+    total_price: Decimal
+    order_date: datetime
+    receipt_url: str
+
+    class Config:
+        from_attributes = True
+
+
+def make_rows(size: int):
+    return [
+        SimpleNamespace(
+            id=i,
+            game_id=i % 50,
+            account_id=76561198000000000 + i,
+            total_price=Decimal("19.99"),
+            order_date=datetime(2024, 11, 27, 12, 0),
+            receipt_url=f"https://pay.stripe.com/receipts/{i}",
+        )
+        for i in range(size)
+    ]
+
+
+def default_path(rows) -> bytes:
+    # from_orm per item, then FastAPI's jsonable_encoder + json.dumps
+    models = [OrderLike.model_validate(row) for row in rows]
+    return json.dumps(jsonable_encoder(models)).encode()
+
+
+def per_item_us(fn, rows) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(rows)
+    return (time.perf_counter() - start) / REPEAT / len(rows) * 1e6
+
+
+def main():
+    for size in SIZES:
+        rows = make_rows(size)
+        before = per_item_us(default_path, rows)
+        after = per_item_us(lambda items: dump_list(OrderLike, items), rows)
+        print(
+            f"{size:>5} items: default {before:6.2f}us/item  "
+            f"dump_list {after:6.2f}us/item  ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Auth overhead per request: a full JWT verification against a verified-token
+cache hit followed by the role check.
+
+Run from the backend directory: ``python -m benchmarks.bench_token_cache``.
+"""
+import time
+
+from app.business_logic.auth import (create_access_token, resolve_role_access,
+                                     verify_token_access)
+from app.business_logic.token_cache import VerifiedTokenCache
+from app.dto_schemas.auth import Roles
+
+REPEAT = 20000
+
+
+def per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main():
+    token = create_access_token("user-123", "user@example.com", Roles.USER)
+    cache = VerifiedTokenCache(maxsize=10000)
+    cache.put(token, verify_token_access(token, role=Roles.USER))
+
+    def cached():
+        resolve_role_access(cache.get(token).role, Roles.USER)
+
+    before = per_call_us(lambda: verify_token_access(token, role=Roles.USER))
+    after = per_call_us(cached)
+    print(
+        f"verify_token_access {before:6.2f}us/request  "
+        f"cache hit {after:6.2f}us/request  ({before / after:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Add keyset pagination indexes
+
+Revision ID: 3f1c9a7d2b4e
+Revises: e65d833cf336
+Create Date: 2026-10-16 10:12:41.301822
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b4e'
+down_revision: Union[str, None] = 'e65d833cf336'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_games_date_created_id', 'games', ['date_created', 'id'])
+    op.create_index(
+        'ix_orders_user_id_order_date_id', 'orders', ['user_id', 'order_date', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_user_id_order_date_id', table_name='orders')
+    op.drop_index('ix_games_date_created_id', table_name='games')
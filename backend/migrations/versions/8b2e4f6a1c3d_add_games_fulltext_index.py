@@ -0,0 +1,30 @@
+"""Add games fulltext index
+
+Revision ID: 8b2e4f6a1c3d
+Revises: 3f1c9a7d2b4e
+Create Date: 2026-10-16 11:03:17.540219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a1c3d'
+down_revision: Union[str, None] = '3f1c9a7d2b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ft_games_title_description',
+        'games',
+        ['title', 'description'],
+        mysql_prefix='FULLTEXT',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ft_games_title_description', table_name='games')
@@ -0,0 +1,41 @@
+"""Add game rating stats
+
+Revision ID: c4d7e2a9f0b1
+Revises: 8b2e4f6a1c3d
+Create Date: 2026-10-16 11:48:05.117402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e2a9f0b1'
+down_revision: Union[str, None] = '8b2e4f6a1c3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'game_rating_stats',
+        sa.Column('game_id', sa.Integer(), nullable=False),
+        sa.Column('ratings_count', sa.Integer(), nullable=False),
+        sa.Column('ratings_sum', sa.Integer(), nullable=False),
+        sa.Column('rating_1', sa.Integer(), nullable=False),
+        sa.Column('rating_2', sa.Integer(), nullable=False),
+        sa.Column('rating_3', sa.Integer(), nullable=False),
+        sa.Column('rating_4', sa.Integer(), nullable=False),
+        sa.Column('rating_5', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['game_id'],
+            ['games.id'],
+        ),
+        sa.PrimaryKeyConstraint('game_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('game_rating_stats')
@@ -0,0 +1,41 @@
+"""Add game availability
+
+Revision ID: d9a3b5c7e1f2
+Revises: c4d7e2a9f0b1
+Create Date: 2026-10-16 12:20:44.902311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b5c7e1f2'
+down_revision: Union[str, None] = 'c4d7e2a9f0b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'game_availability',
+        sa.Column('game_id', sa.Integer(), nullable=False),
+        sa.Column('available_accounts', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['game_id'],
+            ['games.id'],
+        ),
+        sa.PrimaryKeyConstraint('game_id'),
+    )
+    # backfill from the current account links
+    op.execute(
+        'INSERT INTO game_availability (game_id, available_accounts) '
+        'SELECT game_id, COUNT(*) FROM game_account_games '
+        'WHERE available_status = 1 GROUP BY game_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('game_availability')
@@ -0,0 +1,29 @@
+"""Add feedback keyset pagination index
+
+Revision ID: f2a6c8e0b4d1
+Revises: d9a3b5c7e1f2
+Create Date: 2026-10-17 00:20:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c8e0b4d1'
+down_revision: Union[str, None] = 'd9a3b5c7e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_feedback_game_id_date_created_id',
+        'feedback',
+        ['game_id', 'date_created', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_feedback_game_id_date_created_id', table_name='feedback')